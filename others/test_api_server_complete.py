@@ -21,8 +21,10 @@ API-Server Version 完整测试脚本 - 重写版
 import sys
 import os
 import asyncio
+import dataclasses
 import logging
 import time
+from types import SimpleNamespace
 from typing import List, Dict, Any
 
 # 添加项目根目录到Python路径
@@ -123,26 +125,81 @@ os.environ['PYTHONWARNINGS'] = 'ignore::ResourceWarning,ignore::UserWarning,igno
 
 logger = logging.getLogger(__name__)
 
+# 回调热路径的日志格式，配合%s惰性格式化，日志级别过滤时不产生格式化开销
+_AUTH_OK_FMT = "✅ 认证通过: %s"
+_AUTH_FAIL_FMT = "❌ 认证失败: 无效的API Key %s"
+_EXTRACT_OUTGOING_FMT = "🔍 提取用户ID(消息发送): %s -> %s (目标平台: %s)"
+_EXTRACT_CONNECT_FMT = "👤 用户映射(连接建立): %s -> %s (连接平台: %s)"
+
 
 class APIServerCompleteTester:
     """API-Server Version完整测试类"""
 
+    # 测试器是所有回调的绑定对象，固定属性布局以加快属性访问
+    __slots__ = (
+        "server",
+        "clients",
+        "multi_client",
+        "test_results",
+        "_t0",
+        "_format_info",
+        "_group_infos",
+        "_broadcast_template",
+        "_client_labels",
+    )
+
+    # 单连接客户端固定测试数据: (平台, API Key, 测试消息)
+    _CLIENT_TEST_TRIPLES = (
+        ("wechat", "test_user_001", "这是来自微信客户端的测试消息 📱"),
+        ("qq", "test_user_002", "这是来自QQ客户端的测试消息 🐧"),
+    )
+
     def __init__(self):
         self.server = None
         self.clients = []
         self.multi_client = None
-        self.test_results = {
-            "auth_attempts": 0,
-            "auth_successes": 0,
-            "messages_received": 0,
-            "custom_messages_received": 0,
-            "messages_sent": 0,
-            "stats_updates": 0,
-            "errors": 0,
-            "start_time": time.time(),
-            "connected_users": set(),
-            "connection_events": [],
-        }
+        # 计数器使用属性访问，回调中自增无需字典哈希查找
+        self.test_results = SimpleNamespace(
+            auth_attempts=0,
+            auth_successes=0,
+            messages_received=0,
+            custom_messages_received=0,
+            messages_sent=0,
+            stats_updates=0,
+            errors=0,
+            start_time=time.time(),
+            connected_users=set(),
+            connection_events=[],
+        )
+        # 耗时统计使用单调时钟，不受系统时间调整影响
+        self._t0 = time.monotonic()
+        # 消息中不变的部分只构建一次，asdict序列化时会深拷贝，可安全复用
+        self._format_info = FormatInfo(
+            content_format=["text", "emoji"],
+            accept_format=["text", "image", "emoji"],
+        )
+        self._group_infos: Dict[str, GroupInfo] = {}
+        self._client_labels: List[str] = []
+        # 广播消息模板，每次只替换消息ID/时间与内容
+        self._broadcast_template = APIMessageBase(
+            message_info=BaseMessageInfo(
+                platform="server", message_id="", time=0.0, format_info=self._format_info
+            ),
+            message_segment=Seg(type="text", data=""),
+            message_dim=MessageDim(api_key="server", platform="server"),
+        )
+
+    def _get_group_info(self, platform: str) -> GroupInfo:
+        """获取平台对应的缓存群组信息"""
+        group_info = self._group_infos.get(platform)
+        if group_info is None:
+            group_info = GroupInfo(
+                group_id="test_group_001",
+                group_name="API-Server测试群组",
+                platform=platform,
+            )
+            self._group_infos[platform] = group_info
+        return group_info
 
     async def create_server(self):
         """创建API-Server Version服务器"""
@@ -153,6 +210,7 @@ class APIServerCompleteTester:
             host="localhost",
             port=18080,
             path="/ws",
+            compression=None,  # 测试消息很小，禁用压缩
             enable_stats=True,
             stats_callback=self._stats_callback,
         )
@@ -173,7 +231,7 @@ class APIServerCompleteTester:
 
     async def _authenticate(self, metadata: Dict[str, Any]) -> bool:
         """认证回调 - 测试API Key验证"""
-        self.test_results["auth_attempts"] += 1
+        self.test_results.auth_attempts += 1
         api_key = metadata.get("api_key", "")
 
         # 允许的API Key列表
@@ -185,11 +243,11 @@ class APIServerCompleteTester:
         ]
 
         if api_key in valid_keys:
-            self.test_results["auth_successes"] += 1
-            logger.info(f"✅ 认证通过: {api_key}")
+            self.test_results.auth_successes += 1
+            logger.info(_AUTH_OK_FMT, api_key)
             return True
         else:
-            logger.warning(f"❌ 认证失败: 无效的API Key {api_key}")
+            logger.warning(_AUTH_FAIL_FMT, api_key)
             return False
 
     async def _extract_user(self, metadata: Dict[str, Any]) -> str:
@@ -210,12 +268,12 @@ class APIServerCompleteTester:
 
         # 根据调用场景记录不同的信息
         if message_type == "outgoing":
-            logger.info(f"🔍 提取用户ID(消息发送): {api_key} -> {user_id} (目标平台: {platform})")
+            logger.info(_EXTRACT_OUTGOING_FMT, api_key, user_id, platform)
         else:
             # 连接建立时的日志
-            logger.info(f"👤 用户映射(连接建立): {api_key} -> {user_id} (连接平台: {platform})")
+            logger.info(_EXTRACT_CONNECT_FMT, api_key, user_id, platform)
 
-        self.test_results["connected_users"].add(user_id)
+        self.test_results.connected_users.add(user_id)
         return user_id
 
     async def _handle_server_message(
@@ -223,22 +281,26 @@ class APIServerCompleteTester:
     ) -> None:
         """服务器消息处理回调"""
         try:
-            self.test_results["messages_received"] += 1
+            self.test_results.messages_received += 1
             content = message.message_segment.data
             api_key = message.get_api_key()
             platform = message.get_platform()
 
-            logger.info(f"📨 收到消息 [{platform}] {api_key}: {content}")
+            logger.info("📨 收到消息 [%s] %s: %s", platform, api_key, content)
 
             # 解析消息内容中的结构化信息
-            if hasattr(message, "message_info") and message.message_info:
-                logger.info(f"   消息ID: {message.message_info.message_id}")
-                logger.info(f"   时间戳: {time.ctime(message.message_info.time)}")
+            if (
+                logger.isEnabledFor(logging.INFO)
+                and hasattr(message, "message_info")
+                and message.message_info
+            ):
+                logger.info("   消息ID: %s", message.message_info.message_id)
+                logger.info("   时间戳: %s", time.ctime(message.message_info.time))
 
             return True
         except Exception as e:
             logger.error(f"❌ 消息处理错误: {e}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
             return False
 
     async def _handle_ping(
@@ -246,8 +308,8 @@ class APIServerCompleteTester:
     ) -> None:
         """PING消息处理器 - 测试自定义消息"""
         try:
-            self.test_results["custom_messages_received"] += 1
-            logger.info(f"🏓 收到PING: {message_data}")
+            self.test_results.custom_messages_received += 1
+            logger.info("🏓 收到PING: %s", message_data)
 
             # 发送PONG响应
             pong_response = {
@@ -264,22 +326,22 @@ class APIServerCompleteTester:
                 await self.server.send_custom_message(
                     "pong_response", pong_response, target_user=user_id
                 )
-                logger.info(f"📤 发送PONG给用户 {user_id}")
+                logger.info("📤 发送PONG给用户 %s", user_id)
 
         except Exception as e:
             logger.error(f"❌ PING处理错误: {e}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
 
     async def _handle_weather_query(
         self, message_data: Dict[str, Any], metadata: Dict[str, Any]
     ) -> None:
         """天气查询处理器"""
         try:
-            self.test_results["custom_messages_received"] += 1
+            self.test_results.custom_messages_received += 1
             city = message_data.get("city", "未知城市")
             user_id = metadata.get("user_id", "unknown")
 
-            logger.info(f"🌤 收到天气查询: {city} (用户: {user_id})")
+            logger.info("🌤 收到天气查询: %s (用户: %s)", city, user_id)
 
             # 模拟天气数据
             weather_data = {
@@ -297,28 +359,29 @@ class APIServerCompleteTester:
 
         except Exception as e:
             logger.error(f"❌ 天气查询处理错误: {e}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
 
     async def _handle_user_stats(
         self, message_data: Dict[str, Any], metadata: Dict[str, Any]
     ) -> None:
         """用户统计处理器"""
         try:
-            self.test_results["custom_messages_received"] += 1
+            self.test_results.custom_messages_received += 1
             user_id = metadata.get("user_id", "unknown")
 
-            logger.info(f"📊 收到用户统计请求: {user_id}")
+            logger.info("📊 收到用户统计请求: %s", user_id)
 
             # 获取用户统计信息
             stats = self.server.get_stats()
             user_connections = self.server.get_user_connections(user_id)
 
+            now = time.time()
             stats_response = {
                 "user_id": user_id,
                 "connection_count": len(user_connections),
                 "total_messages": stats.get("messages_processed", 0),
-                "server_uptime": time.time() - self.test_results["start_time"],
-                "timestamp": time.time(),
+                "server_uptime": time.monotonic() - self._t0,
+                "timestamp": now,
             }
 
             await self.server.send_custom_message(
@@ -327,24 +390,23 @@ class APIServerCompleteTester:
 
         except Exception as e:
             logger.error(f"❌ 用户统计处理错误: {e}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
 
     def _stats_callback(self, stats: Dict[str, Any]) -> None:
         """统计信息回调 - 测试统计功能"""
         try:
-            self.test_results["stats_updates"] += 1
-            logger.info(f"📈 统计更新: {stats}")
+            self.test_results.stats_updates += 1
+            logger.info("📈 统计更新: %s", stats)
 
             # 记录关键统计信息
-            current_time = time.time()
-            uptime = current_time - self.test_results["start_time"]
-            logger.info(f"   运行时间: {uptime:.2f}s")
-            logger.info(f"   当前用户数: {len(self.test_results['connected_users'])}")
-            logger.info(f"   处理消息数: {stats.get('messages_processed', 0)}")
+            uptime = time.monotonic() - self._t0
+            logger.info("   运行时间: %.2fs", uptime)
+            logger.info("   当前用户数: %s", len(self.test_results.connected_users))
+            logger.info("   处理消息数: %s", stats.get('messages_processed', 0))
 
         except Exception as e:
             logger.error(f"❌ 统计回调错误: {e}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
 
     async def create_clients(self) -> List[WebSocketClient]:
         """创建单连接客户端"""
@@ -352,15 +414,11 @@ class APIServerCompleteTester:
 
         client_configs = [
             {
-                "api_key": "test_user_001",
-                "platform": "wechat",
-                "on_message": self._client_message_handler,
-            },
-            {
-                "api_key": "test_user_002",
-                "platform": "qq",
+                "api_key": api_key,
+                "platform": platform,
                 "on_message": self._client_message_handler,
-            },
+            }
+            for platform, api_key, _ in self._CLIENT_TEST_TRIPLES
         ]
 
         clients = []
@@ -371,6 +429,8 @@ class APIServerCompleteTester:
                 api_key=config["api_key"],
                 platform=config["platform"],
                 on_message=config["on_message"],
+                compression=None,  # 测试消息很小，禁用压缩
+                binary_frames=True,
             )
 
             # 注册自定义处理器
@@ -385,6 +445,8 @@ class APIServerCompleteTester:
             client = WebSocketClient(client_config)
             clients.append(client)
 
+        # 预先生成日志用的客户端标签
+        self._client_labels = [f"客户端{i}" for i in range(1, len(clients) + 1)]
         return clients
 
     async def create_multi_client(self) -> WebSocketMultiClient:
@@ -398,6 +460,8 @@ class APIServerCompleteTester:
                     "url": "ws://localhost:18080/ws",
                     "api_key": "test_user_003",
                     "platform": "telegram",
+                    "compression": None,
+                    "binary_frames": True,
                 }
             },
             auto_connect_on_start=True,
@@ -421,21 +485,25 @@ class APIServerCompleteTester:
             content = message.message_segment.data
             platform = message.get_platform()
 
-            logger.info(f"📤 客户端收到消息 [{platform}]: {content}")
+            logger.info("📤 客户端收到消息 [%s]: %s", platform, content)
 
             # 解析完整的消息结构
-            if hasattr(message, "message_info") and message.message_info:
-                logger.info(f"   发送者: {message.get_api_key()}")
-                logger.info(f"   消息ID: {message.message_info.message_id}")
+            if (
+                logger.isEnabledFor(logging.INFO)
+                and hasattr(message, "message_info")
+                and message.message_info
+            ):
+                logger.info("   发送者: %s", message.get_api_key())
+                logger.info("   消息ID: %s", message.message_info.message_id)
 
             # 自动回复简单的确认消息
             if "测试" in content:
                 await asyncio.sleep(0.1)  # 小延迟避免立即回复
-                self.test_results["messages_sent"] += 1
+                self.test_results.messages_sent += 1
 
         except Exception as e:
             logger.error(f"❌ 客户端消息处理错误: {e}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
 
     async def _multi_client_message_handler(
         self, message: APIMessageBase, metadata: Dict[str, Any]
@@ -445,60 +513,55 @@ class APIServerCompleteTester:
             content = message.message_segment.data
             platform = message.get_platform()
 
-            logger.info(f"📤 多连接客户端收到消息 [{platform}]: {content}")
-            self.test_results["messages_received"] += 1
+            logger.info("📤 多连接客户端收到消息 [%s]: %s", platform, content)
+            self.test_results.messages_received += 1
 
         except Exception as e:
             logger.error(f"❌ 多连接客户端消息处理错误: {e}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
 
     async def _client_handle_pong(self, message_data: Dict[str, Any]) -> None:
         """客户端处理PONG响应"""
-        logger.info(f"📤 客户端收到PONG: {message_data.get('original_message')}")
+        logger.info("📤 客户端收到PONG: %s", message_data.get('original_message'))
 
     async def _client_handle_weather(self, message_data: Dict[str, Any]) -> None:
         """客户端处理天气响应"""
         city = message_data.get("city", "未知")
         temperature = message_data.get("temperature", 0)
-        logger.info(f"📤 客户端收到天气数据: {city} - {temperature}°C")
+        logger.info("📤 客户端收到天气数据: %s - %s°C", city, temperature)
 
     async def _multi_client_handle_pong(self, message_data: Dict[str, Any]) -> None:
         """多连接客户端处理PONG响应"""
-        logger.info(f"📤 多连接客户端收到PONG: {message_data.get('original_message')}")
+        logger.info("📤 多连接客户端收到PONG: %s", message_data.get('original_message'))
 
     async def _multi_client_handle_weather(self, message_data: Dict[str, Any]) -> None:
         """多连接客户端处理天气响应"""
         city = message_data.get("city", "未知")
         temperature = message_data.get("temperature", 0)
-        logger.info(f"📤 多连接客户端收到天气数据: {city} - {temperature}°C")
+        logger.info("📤 多连接客户端收到天气数据: %s - %s°C", city, temperature)
 
     def create_complete_message(
         self, platform: str, api_key: str, content: str, include_group_info: bool = True
     ) -> APIMessageBase:
         """创建完整的APIMessageBase消息"""
+        now = time.time()
+        key_suffix = api_key.rpartition("_")[2]
         message_info = BaseMessageInfo(
             platform=platform,
-            message_id=f"{platform}_{int(time.time() * 1000)}",
-            time=time.time(),
+            message_id=f"{platform}_{int(now * 1000)}",
+            time=now,
             sender_info=SenderInfo(
                 user_info=UserInfo(
                     platform=platform,
                     user_id=api_key,
-                    user_nickname=f"测试用户_{api_key.split('_')[-1]}",
-                    user_cardname=f"测试卡片_{api_key.split('_')[-1]}",
+                    user_nickname=f"测试用户_{key_suffix}",
+                    user_cardname=f"测试卡片_{key_suffix}",
                 ),
-                group_info=GroupInfo(
-                    group_id="test_group_001",
-                    group_name="API-Server测试群组",
-                    platform=platform,
-                )
+                group_info=self._get_group_info(platform)
                 if include_group_info
                 else None,
             ),
-            format_info=FormatInfo(
-                content_format=["text", "emoji"],
-                accept_format=["text", "image", "emoji"],
-            ),
+            format_info=self._format_info,
         )
 
         return APIMessageBase(
@@ -507,34 +570,46 @@ class APIServerCompleteTester:
             message_dim=MessageDim(api_key=api_key, platform=platform),
         )
 
+    def create_broadcast_message(self, content: str) -> APIMessageBase:
+        """基于模板创建广播消息"""
+        now = time.time()
+        template = self._broadcast_template
+        return dataclasses.replace(
+            template,
+            message_info=dataclasses.replace(
+                template.message_info,
+                message_id=f"server_{int(now * 1000)}",
+                time=now,
+            ),
+            message_segment=Seg(type="text", data=content),
+        )
+
     async def test_client_to_server_messaging(self):
         """测试客户端到服务器的消息发送"""
         logger.info("📤 测试客户端到服务器消息发送...")
 
-        platforms = ["wechat", "qq"]
-        messages = [
-            "这是来自微信客户端的测试消息 📱",
-            "这是来自QQ客户端的测试消息 🐧",
-        ]
+        triples = self._CLIENT_TEST_TRIPLES
 
-        for client, platform, message_content in zip(self.clients, platforms, messages):
-            # 创建完整消息
-            message = self.create_complete_message(
-                platform=platform,
-                api_key=client.config.api_key,
-                content=message_content,
-            )
+        # 各客户端并发发送，单连接内的帧顺序不受影响
+        results = await asyncio.gather(
+            *(
+                client.send_message(
+                    self.create_complete_message(
+                        platform=platform, api_key=api_key, content=content
+                    )
+                )
+                for client, (platform, api_key, content) in zip(self.clients, triples)
+            ),
+            return_exceptions=True,
+        )
 
-            # 发送消息
-            success = await client.send_message(message)
-            if success:
-                self.test_results["messages_sent"] += 1
+        for (platform, _, _), success in zip(triples, results):
+            if success is True:
+                self.test_results.messages_sent += 1
                 logger.info(f"✅ {platform}客户端发送成功")
             else:
                 logger.error(f"❌ {platform}客户端发送失败")
 
-            await asyncio.sleep(0.5)  # 间隔发送
-
     async def test_multi_client_messaging(self):
         """测试多连接客户端消息发送"""
         logger.info("📤 测试多连接客户端消息发送...")
@@ -552,7 +627,7 @@ class APIServerCompleteTester:
 
         success = await self.multi_client.send_message("telegram", message)
         if success:
-            self.test_results["messages_sent"] += 1
+            self.test_results.messages_sent += 1
             logger.info("✅ Telegram多连接客户端发送成功")
 
     async def test_server_to_client_messaging(self):
@@ -565,77 +640,110 @@ class APIServerCompleteTester:
             ("test_user_003", "telegram", "管理员通知：系统运行正常 🎯"),
         ]
 
-        for api_key, platform, content in test_messages:
-            # 创建服务器消息
-            message = self.create_complete_message(
+        # 先构建全部消息，再并发下发并统一收集各平台的发送结果
+        messages = [
+            self.create_complete_message(
                 platform=platform,
                 api_key=api_key,
                 content=content,
                 include_group_info=False,
             )
+            for api_key, platform, content in test_messages
+        ]
+        all_results = await asyncio.gather(
+            *(self.server.send_message(message) for message in messages),
+            return_exceptions=True,
+        )
 
-            # 发送消息
-            results = await self.server.send_message(message)
-            success_count = sum(results.values())
+        for (_, platform, _), results in zip(test_messages, all_results):
+            if isinstance(results, Exception):
+                logger.error(f"❌ 服务器向 {platform} 平台发送异常: {results}")
+                self.test_results.errors += 1
+                continue
 
+            success_count = sum(results.values())
             if success_count > 0:
-                self.test_results["messages_sent"] += 1
+                self.test_results.messages_sent += 1
                 logger.info(
                     f"✅ 服务器向 {platform} 平台用户发送成功: {success_count}个连接"
                 )
             else:
                 logger.warning(f"⚠️ {platform} 平台用户没有活跃连接")
 
-            await asyncio.sleep(0.3)
+        # 广播到所有已认证连接，直接返回 (成功数, 总数)
+        broadcast = await self.server.broadcast_message(
+            self.create_broadcast_message("服务器广播：全体连接状态检查 📢")
+        )
+        if broadcast.success_count > 0:
+            self.test_results.messages_sent += 1
+            logger.info(
+                f"✅ 服务器广播成功: {broadcast.success_count}/{broadcast.total}个连接"
+            )
+        else:
+            logger.warning("⚠️ 服务器广播没有成功送达的连接")
 
     async def test_custom_messaging(self):
         """测试自定义消息发送和处理器"""
         logger.info("🔧 测试自定义消息...")
 
         # 测试PING消息
-        for i, client in enumerate(self.clients, 1):
-            ping_message = {
-                "message": f"这是第{i}个客户端的PING消息",
-                "timestamp": time.time(),
-                "sequence": i,
-            }
-
-            success = await client.send_custom_message("ping", ping_message)
-            if success:
-                logger.info(f"✅ 客户端{i} PING发送成功")
-                self.test_results["messages_sent"] += 1
+        ping_results = await asyncio.gather(
+            *(
+                client.send_custom_message(
+                    "ping",
+                    {
+                        "message": f"这是第{i}个客户端的PING消息",
+                        "timestamp": time.time(),
+                        "sequence": i,
+                    },
+                )
+                for i, client in enumerate(self.clients, 1)
+            ),
+            return_exceptions=True,
+        )
+        for label, success in zip(self._client_labels, ping_results):
+            if success is True:
+                logger.info("✅ %s PING发送成功", label)
+                self.test_results.messages_sent += 1
 
         # 测试天气查询
         weather_cities = ["北京", "上海", "广州"]
-        for i, client in enumerate(self.clients, 1):
-            if i <= len(weather_cities):
-                city = weather_cities[i - 1]
-                weather_query = {
-                    "city": city,
-                    "request_id": f"query_{int(time.time() * 1000)}",
-                    "timestamp": time.time(),
-                }
-
-                success = await client.send_custom_message(
-                    "weather_query", weather_query
+        now = time.time()
+        weather_results = await asyncio.gather(
+            *(
+                client.send_custom_message(
+                    "weather_query",
+                    {
+                        "city": city,
+                        "request_id": f"query_{int(now * 1000)}_{city}",
+                        "timestamp": now,
+                    },
                 )
-                if success:
-                    logger.info(f"✅ 客户端{i} 天气查询发送成功: {city}")
-                    self.test_results["messages_sent"] += 1
+                for client, city in zip(self.clients, weather_cities)
+            ),
+            return_exceptions=True,
+        )
+        for label, city, success in zip(
+            self._client_labels, weather_cities, weather_results
+        ):
+            if success is True:
+                logger.info("✅ %s 天气查询发送成功: %s", label, city)
+                self.test_results.messages_sent += 1
 
         await asyncio.sleep(2)  # 等待处理器响应
 
         # 测试用户统计查询
         for client in self.clients:
+            now = time.time()
             stats_query = {
-                "request_id": f"stats_{int(time.time() * 1000)}",
-                "timestamp": time.time(),
+                "request_id": f"stats_{int(now * 1000)}",
+                "timestamp": now,
             }
 
             success = await client.send_custom_message("user_stats", stats_query)
             if success:
                 logger.info("✅ 用户统计查询发送成功")
-                self.test_results["messages_sent"] += 1
+                self.test_results.messages_sent += 1
 
         await asyncio.sleep(1)  # 等待响应
 
@@ -648,11 +756,11 @@ class APIServerCompleteTester:
             )
             if success:
                 logger.info("✅ 多连接客户端PING发送成功")
-                self.test_results["messages_sent"] += 1
+                self.test_results.messages_sent += 1
 
     def print_test_results(self):
         """打印完整的测试结果"""
-        elapsed_time = time.time() - self.test_results["start_time"]
+        elapsed_time = time.monotonic() - self._t0
 
         logger.info("=" * 60)
         logger.info("🎉 API-Server Version 完整测试完成!")
@@ -660,25 +768,25 @@ class APIServerCompleteTester:
         logger.info(f"⏱️  总运行时间: {elapsed_time:.2f} 秒")
 
         logger.info("🔐 认证统计:")
-        logger.info(f"   认证尝试: {self.test_results['auth_attempts']}")
-        logger.info(f"   认证成功: {self.test_results['auth_successes']}")
+        logger.info(f"   认证尝试: {self.test_results.auth_attempts}")
+        logger.info(f"   认证成功: {self.test_results.auth_successes}")
         logger.info(
-            f"   认证失败: {self.test_results['auth_attempts'] - self.test_results['auth_successes']}"
+            f"   认证失败: {self.test_results.auth_attempts - self.test_results.auth_successes}"
         )
-        logger.info(f"   连接用户数: {len(self.test_results['connected_users'])}")
+        logger.info(f"   连接用户数: {len(self.test_results.connected_users)}")
 
         logger.info("📊 消息统计:")
-        logger.info(f"   收到消息数: {self.test_results['messages_received']}")
-        logger.info(f"   发送消息数: {self.test_results['messages_sent']}")
+        logger.info(f"   收到消息数: {self.test_results.messages_received}")
+        logger.info(f"   发送消息数: {self.test_results.messages_sent}")
         logger.info(
-            f"   收到自定义消息: {self.test_results['custom_messages_received']}"
+            f"   收到自定义消息: {self.test_results.custom_messages_received}"
         )
-        logger.info(f"   统计更新次数: {self.test_results['stats_updates']}")
+        logger.info(f"   统计更新次数: {self.test_results.stats_updates}")
 
         logger.info("🔧 错误统计:")
-        logger.info(f"   总错误数: {self.test_results['errors']}")
+        logger.info(f"   总错误数: {self.test_results.errors}")
         logger.info(
-            f"   错误率: {(self.test_results['errors'] / max(1, elapsed_time)) * 100:.2f}%"
+            f"   错误率: {(self.test_results.errors / max(1, elapsed_time)) * 100:.2f}%"
         )
 
         logger.info("🔗 连接统计:")
@@ -688,23 +796,23 @@ class APIServerCompleteTester:
         logger.info("=" * 60)
 
         # 判断测试结果
-        total_errors = self.test_results["errors"]
+        total_errors = self.test_results.errors
         expected_auth_success = len(
             ["test_user_001", "test_user_002", "test_user_003"]  # 实际测试的用户数量
         )
 
         if (
             total_errors == 0
-            and self.test_results["auth_successes"] == expected_auth_success
+            and self.test_results.auth_successes == expected_auth_success
         ):
             logger.info("✅ 所有测试通过，API-Server Version 运行正常!")
         else:
             logger.warning(f"⚠️  发现问题:")
             if total_errors > 0:
                 logger.warning(f"   - {total_errors} 个错误")
-            if self.test_results["auth_successes"] < expected_auth_success:
+            if self.test_results.auth_successes < expected_auth_success:
                 logger.warning(
-                    f"   - 认证成功率低: {self.test_results['auth_successes']}/{expected_auth_success}"
+                    f"   - 认证成功率低: {self.test_results.auth_successes}/{expected_auth_success}"
                 )
 
     async def run_complete_test(self):
@@ -725,29 +833,37 @@ class APIServerCompleteTester:
             self.clients = await self.create_clients()
             self.multi_client = await self.create_multi_client()
 
-            # 启动客户端
-            for client in self.clients:
-                await client.start()
-
+            # 并发启动客户端
+            starters = [client.start() for client in self.clients]
             if self.multi_client:
-                await self.multi_client.start()
+                starters.append(self.multi_client.start())
+            await asyncio.gather(*starters)
 
-            # 连接客户端
+            # 并发连接客户端，握手互相重叠
             logger.info("🔗 连接客户端...")
-            for client in self.clients:
-                connected = await client.connect()
-                logger.info(f"   客户端连接: {'成功' if connected else '失败'}")
+            connect_results = await asyncio.gather(
+                *(client.connect() for client in self.clients),
+                return_exceptions=True,
+            )
+            for connected in connect_results:
+                logger.info(f"   客户端连接: {'成功' if connected is True else '失败'}")
 
             await asyncio.sleep(2)  # 等待连接完成
 
-            # 运行测试序列
-            await self.test_client_to_server_messaging()
-            await asyncio.sleep(2)
-
-            await self.test_server_to_client_messaging()
-            await asyncio.sleep(2)
+            # 运行测试序列，每个阶段独立超时，单阶段卡住不影响后续阶段
+            phases = [
+                ("客户端到服务器", self.test_client_to_server_messaging, 5.0),
+                ("服务器到客户端", self.test_server_to_client_messaging, 5.0),
+                ("自定义消息", self.test_custom_messaging, 10.0),
+            ]
+            for phase_name, phase, phase_timeout in phases:
+                try:
+                    await asyncio.wait_for(phase(), timeout=phase_timeout)
+                except asyncio.TimeoutError:
+                    logger.error(f"⏰ 测试阶段超时: {phase_name} ({phase_timeout}s)")
+                    self.test_results.errors += 1
+                await asyncio.sleep(0)  # 让出事件循环，处理已到达的消息
 
-            await self.test_custom_messaging()
             await asyncio.sleep(3)  # 等待所有异步处理完成
 
         except Exception as e:
@@ -755,7 +871,7 @@ class APIServerCompleteTester:
             import traceback
 
             logger.error(f"   错误详情: {traceback.format_exc()}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
 
         finally:
             # 清理资源
@@ -766,9 +882,9 @@ class APIServerCompleteTester:
         logger.info("🧹 开始标准清理资源...")
 
         # 使用标准的stop()方法清理
-        for i, client in enumerate(self.clients, 1):
+        for label, client in zip(self._client_labels, self.clients):
             try:
-                logger.info(f"🔄 停止客户端 {i}...")
+                logger.info(f"🔄 停止{label}...")
                 await client.stop()
 
                 # 验证协程清理状态
@@ -776,7 +892,7 @@ class APIServerCompleteTester:
                     try:
                         status = client.get_coroutine_status()
                         if status is None:
-                            logger.info(f"✅ 客户端 {i} 已停止（状态检查返回None）")
+                            logger.info(f"✅ {label} 已停止（状态检查返回None）")
                         else:
                             client_running = status.get('client_running', 'unknown')
                             dispatcher_task = status.get('dispatcher_task')
@@ -784,25 +900,25 @@ class APIServerCompleteTester:
                             if dispatcher_task and isinstance(dispatcher_task, dict):
                                 dispatcher_done = dispatcher_task.get('done', 'N/A')
 
-                            logger.info(f"✅ 客户端 {i} 状态检查: running={client_running}, dispatcher_done={dispatcher_done}")
+                            logger.info(f"✅ {label} 状态检查: running={client_running}, dispatcher_done={dispatcher_done}")
 
                             # 验证所有协程都已清理
                             if client_running == False:
                                 if dispatcher_task and isinstance(dispatcher_task, dict) and not dispatcher_task.get('done', True):
-                                    logger.warning(f"⚠️ 客户端 {i} 分发器协程可能未完全清理")
+                                    logger.warning(f"⚠️ {label} 分发器协程可能未完全清理")
                                 else:
-                                    logger.info(f"✅ 客户端 {i} 所有协程已清理")
+                                    logger.info(f"✅ {label} 所有协程已清理")
                             elif client_running == 'unknown':
-                                logger.info(f"✅ 客户端 {i} 状态未知，但已停止")
+                                logger.info(f"✅ {label} 状态未知，但已停止")
                     except Exception as status_error:
-                        logger.warning(f"⚠️ 客户端 {i} 状态检查失败: {type(status_error).__name__}: {str(status_error)}")
-                        logger.info(f"✅ 客户端 {i} 已停止（状态检查异常）")
+                        logger.warning(f"⚠️ {label} 状态检查失败: {type(status_error).__name__}: {str(status_error)}")
+                        logger.info(f"✅ {label} 已停止（状态检查异常）")
                 else:
-                    logger.info(f"✅ 客户端 {i} 已停止（无状态检查接口）")
+                    logger.info(f"✅ {label} 已停止（无状态检查接口）")
 
             except Exception as e:
-                logger.error(f"❌ 客户端 {i} 停止失败: {e}")
-                self.test_results["errors"] += 1
+                logger.error(f"❌ {label} 停止失败: {e}")
+                self.test_results.errors += 1
 
         # 停止多连接客户端
         if self.multi_client:
@@ -825,7 +941,7 @@ class APIServerCompleteTester:
 
             except Exception as e:
                 logger.error(f"❌ 多连接客户端停止失败: {e}")
-                self.test_results["errors"] += 1
+                self.test_results.errors += 1
 
         # 停止服务器
         logger.info("🔄 停止服务器...")
@@ -848,7 +964,7 @@ class APIServerCompleteTester:
 
         except Exception as e:
             logger.error(f"❌ 服务器停止失败: {e}")
-            self.test_results["errors"] += 1
+            self.test_results.errors += 1
 
         logger.info("🎉 所有资源清理完成")
 
@@ -883,12 +999,21 @@ async def main():
 if __name__ == "__main__":
     print("🚀 开始API-Server Version完整测试...")
 
+    # 优先使用uvloop事件循环（未安装时回退到默认事件循环）
+    try:
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        print("⚡ 使用uvloop事件循环")
+    except ImportError:
+        pass
+
     # 运行测试
     try:
         test_results = asyncio.run(main())
 
         # 返回退出码（0表示成功，非0表示有错误）
-        exit_code = 0 if test_results and test_results["errors"] == 0 else 1
+        exit_code = 0 if test_results and test_results.errors == 0 else 1
 
         print(f"\n🏁 测试程序退出，退出码: {exit_code}")
 
@@ -0,0 +1,61 @@
+"""消息确认（sys_ack）构造 - 服务端与客户端网络驱动器共用"""
+
+import itertools
+import uuid
+from typing import Any, Dict
+
+from . import json_utils
+
+# 仅用于_send_raw_message的日志；不含msg_id，连接断开时ACK不会被缓存重发
+ACK_STUB: Dict[str, Any] = {"type": "sys_ack"}
+
+
+class AckBuilder:
+    """按驱动器生成ACK消息，msg_id由固定随机前缀加递增序号组成
+
+    JSON连接的ACK结构固定，预先构造字节模板，发送时只填充可变字段，
+    无需构造dict再序列化；uuid与acked_msg_id以JSON编码后填入（含引号）。
+    """
+
+    __slots__ = ("_prefix", "_prefix_bytes", "_ids", "_timestamp_key", "_template")
+
+    def __init__(self, timestamp_key: str):
+        """
+        Args:
+            timestamp_key: payload中确认时间戳的字段名
+                （server_timestamp或client_timestamp）
+        """
+        self._prefix = f"ack_{uuid.uuid4().hex[:12]}_"
+        self._prefix_bytes = self._prefix.encode("ascii")
+        self._ids = itertools.count(1)
+        self._timestamp_key = timestamp_key
+        self._template = (
+            b'{"ver":1,"msg_id":"%s%d","type":"sys_ack","meta":{"uuid":%s,'
+            b'"acked_msg_id":%s,"timestamp":%.6f},'
+            b'"payload":{"status":"received","' + timestamp_key.encode("ascii") + b'":%.6f}}'
+        )
+
+    def build(self, connection_uuid: str, acked_msg_id: str, now: float) -> Dict[str, Any]:
+        """构造ACK消息dict（用于msgpack连接）"""
+        return {
+            "ver": 1,
+            "msg_id": f"{self._prefix}{next(self._ids)}",
+            "type": "sys_ack",
+            "meta": {
+                "uuid": connection_uuid,
+                "acked_msg_id": acked_msg_id,
+                "timestamp": now,
+            },
+            "payload": {"status": "received", self._timestamp_key: now},
+        }
+
+    def encode_json(self, connection_uuid: str, acked_msg_id: str, now: float) -> bytes:
+        """按模板直接拼出JSON编码的ACK帧载荷"""
+        return self._template % (
+            self._prefix_bytes,
+            next(self._ids),
+            json_utils.dumps_bytes(connection_uuid),
+            json_utils.dumps_bytes(acked_msg_id),
+            now,
+            now,
+        )
@@ -2,7 +2,7 @@ from dataclasses import dataclass, asdict, field
 from typing import List, Optional, Union, Dict, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Seg:
     """消息片段类，用于表示消息的不同部分
 
@@ -36,7 +36,7 @@ class Seg:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupInfo:
     """群组信息类"""
 
@@ -70,7 +70,7 @@ class GroupInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class UserInfo:
     """用户信息类"""
 
@@ -108,7 +108,7 @@ class UserInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class InfoBase:
     """信息基类，包含群组和用户信息"""
 
@@ -145,21 +145,21 @@ class InfoBase:
         return cls(group_info=group_info, user_info=user_info)
 
 
-@dataclass
+@dataclass(slots=True)
 class SenderInfo(InfoBase):
     """发送者信息类"""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ReceiverInfo(InfoBase):
     """接收者信息类"""
 
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class FormatInfo:
     """格式信息类"""
 
@@ -189,7 +189,7 @@ class FormatInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TemplateInfo:
     """模板信息类"""
 
@@ -216,7 +216,7 @@ class TemplateInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageDim:
     """消息维度信息类，包含API密钥和平台标识"""
 
@@ -251,7 +251,7 @@ class MessageDim:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseMessageInfo:
     """消息信息类"""
 
@@ -326,7 +326,7 @@ class BaseMessageInfo:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class APIMessageBase:
     """API-Server Version消息类，基于双事件循环架构优化"""
 
@@ -5,10 +5,55 @@ from __future__ import annotations
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 
-from .client_ws_connection import ClientNetworkDriver, EventType, NetworkEvent
-from .ws_config import ClientConfig
+from .client_ws_connection import (
+    ClientNetworkDriver,
+    EventRing,
+    EventType,
+    NetworkEvent,
+)
+from .ws_config import ClientConfig, normalize_custom_type
+from .log_utils import is_debug_enabled
+
+# 每轮分发最多批量取出的事件数
+_DISPATCH_BATCH_SIZE = 64
+
+
+class ClientStats:
+    """客户端统计计数器 - 使用__slots__属性代替dict字符串键，热路径自增更快
+
+    子类可追加__slots__字段并覆写reset()设置默认值，to_dict()按需生成字典视图。
+    """
+
+    __slots__ = (
+        "connect_attempts",
+        "successful_connects",
+        "failed_connects",
+        "messages_received",
+        "messages_sent",
+        "custom_messages_processed",
+        "reconnect_attempts",
+        "active_handler_tasks",
+    )
+
+    _fields: tuple = __slots__
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls.__mro__[1]._fields + tuple(cls.__dict__.get("__slots__", ()))
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """重置所有计数器"""
+        for name in ClientStats.__slots__:
+            setattr(self, name, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """生成统计信息字典"""
+        return {name: getattr(self, name) for name in self._fields}
 
 
 class WebSocketClientBase(ABC):
@@ -17,6 +62,8 @@ class WebSocketClientBase(ABC):
     所有客户端都应该继承这个基类，实现特定的连接和发送逻辑。
     """
 
+    stats_class = ClientStats
+
     def __init__(self, default_config: Optional[ClientConfig] = None):
         self.default_config = default_config
 
@@ -26,53 +73,71 @@ class WebSocketClientBase(ABC):
                 custom_logger if custom_logger else logging.getLogger(__name__)
             )
 
-        self.network_driver = ClientNetworkDriver(custom_logger=custom_logger)
+        self.network_driver = ClientNetworkDriver(
+            custom_logger=custom_logger,
+            use_worker_thread=(
+                default_config.use_worker_thread if default_config else True
+            ),
+        )
 
-        self.event_queue: asyncio.Queue = asyncio.Queue()
+        self.event_queue: EventRing = EventRing(
+            maxsize=(
+                default_config.event_queue_max_size
+                if default_config
+                else ClientConfig.event_queue_max_size
+            )
+        )
         self.running = False
         self.dispatcher_task: Optional[asyncio.Task] = None
 
         self._connected_count = 0
 
-        self.custom_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
-        if default_config:
-            self.custom_handlers = default_config.custom_handlers.copy()
-
-        self.stats = {
-            "connect_attempts": 0,
-            "successful_connects": 0,
-            "failed_connects": 0,
-            "messages_received": 0,
-            "messages_sent": 0,
-            "custom_messages_processed": 0,
-            "reconnect_attempts": 0,
-            "active_handler_tasks": 0,
-        }
+        # 与配置对象共享同一个dict，注册/注销无需再同步
+        self.custom_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = (
+            default_config.custom_handlers if default_config else {}
+        )
+
+        self.stats = self.stats_class()
 
         self.active_handler_tasks: Set[asyncio.Task] = set()
         self.task_counter = 0
 
+        # 事件类型 -> 处理方法，初始化时绑定一次，避免分发时的if/elif链
+        self._event_handlers: Dict[EventType, Callable[[NetworkEvent], Any]] = {
+            EventType.CONNECT: self._handle_connect_event,
+            EventType.DISCONNECT: self._handle_disconnect_event,
+            EventType.MESSAGE: self._handle_message_event,
+        }
+        # 消息类型 -> 处理方法（custom_*前缀消息单独路由到自定义处理器）
+        self._message_type_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "sys_std": self._handle_standard_message,
+        }
+
     def register_custom_handler(
         self, message_type: str, handler: Callable[[Dict[str, Any]], None]
     ) -> None:
         """注册自定义消息处理器"""
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
         self.custom_handlers[message_type] = handler
         self.logger.info(f"注册自定义处理器: {message_type}")
 
     def unregister_custom_handler(self, message_type: str) -> None:
         """注销自定义消息处理器"""
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
         self.custom_handlers.pop(message_type, None)
         self.logger.info(f"注销自定义处理器: {message_type}")
 
+    def get_custom_handler(
+        self, message_type: str
+    ) -> Optional[Callable[[Dict[str, Any]], Any]]:
+        """按完整消息类型查找自定义处理器（一次字典查找，无需遍历处理器表）"""
+        return self.custom_handlers.get(message_type)
+
     async def _cleanup_completed_tasks(self) -> None:
         """清理已完成的handler任务"""
         completed_tasks = {task for task in self.active_handler_tasks if task.done()}
         self.active_handler_tasks -= completed_tasks
-        self.stats["active_handler_tasks"] = len(self.active_handler_tasks)
+        self.stats.active_handler_tasks = len(self.active_handler_tasks)
 
         # 获取任务结果并记录异常
         for task in completed_tasks:
@@ -82,7 +147,10 @@ class WebSocketClientBase(ABC):
                 self.logger.error(f"Handler task异常: {e}")
 
     async def _create_handler_task(self, coro, description: str = "handler") -> None:
-        """创建并管理handler任务"""
+        """创建并管理handler任务（同步回调在调用时已执行完毕，直接返回）"""
+        if not asyncio.iscoroutine(coro):
+            return
+
         self.task_counter += 1
         task_id = self.task_counter
 
@@ -90,9 +158,10 @@ class WebSocketClientBase(ABC):
         async def task_wrapper():
             try:
                 await coro
-                self.logger.debug(
-                    f"✅ Client handler task {task_id} ({description}) 完成"
-                )
+                if is_debug_enabled(self.logger):
+                    self.logger.debug(
+                        f"✅ Client handler task {task_id} ({description}) 完成"
+                    )
             except Exception as e:
                 self.logger.error(
                     f"❌ Client handler task {task_id} ({description}) 异常: {e}"
@@ -104,41 +173,42 @@ class WebSocketClientBase(ABC):
                 # 任务完成后自动清理
                 if task in self.active_handler_tasks:
                     self.active_handler_tasks.remove(task)
-                self.stats["active_handler_tasks"] = len(self.active_handler_tasks)
+                self.stats.active_handler_tasks = len(self.active_handler_tasks)
 
         task = asyncio.create_task(task_wrapper())
         self.active_handler_tasks.add(task)
-        self.stats["active_handler_tasks"] = len(self.active_handler_tasks)
+        self.stats.active_handler_tasks = len(self.active_handler_tasks)
 
-        self.logger.debug(
-            f"🚀 Client handler task {task_id} ({description}) 已创建，当前活跃任务数: {len(self.active_handler_tasks)}"
-        )
+        if is_debug_enabled(self.logger):
+            self.logger.debug(
+                f"🚀 Client handler task {task_id} ({description}) 已创建，当前活跃任务数: {len(self.active_handler_tasks)}"
+            )
 
     async def _handle_message_event(self, event: NetworkEvent) -> None:
         """处理消息事件 - 子类可以重写此方法"""
         try:
             payload = event.payload
-            self.stats["messages_received"] += 1
+            self.stats.messages_received += 1
+            message_type = payload.get("type", "")
 
-            # 处理标准消息
-            if payload.get("type") == "sys_std":
-                if self.default_config and self.default_config.on_message:
-                    try:
-                        # 子类可以重写这个方法来处理标准消息
-                        await self._handle_standard_message(payload)
-                    except Exception as e:
-                        self.logger.error(f"处理标准消息时出错: {e}")
+            # 处理标准消息（子类可以重写_handle_standard_message）
+            type_handler = self._message_type_handlers.get(message_type)
+            if type_handler is not None:
+                try:
+                    await type_handler(payload)
+                except Exception as e:
+                    self.logger.error(f"处理标准消息时出错: {e}")
 
-            # 处理自定义消息
-            elif payload.get("type", "").startswith("custom_"):
-                message_type = payload.get("type")
+            # 处理自定义消息，其余类型（如sys_ack）忽略
+            elif message_type[:7] == "custom_":
                 message_data = payload.get("payload", {})
-                self.stats["custom_messages_processed"] += 1
+                self.stats.custom_messages_processed += 1
 
-                if message_type in self.custom_handlers:
+                handler = self.custom_handlers.get(message_type)
+                if handler is not None:
                     try:
                         await self._create_handler_task(
-                            self.custom_handlers[message_type](message_data),
+                            handler(message_data),
                             f"客户端自定义消息处理器-{message_type}",
                         )
                     except Exception as e:
@@ -164,26 +234,45 @@ class WebSocketClientBase(ABC):
                     "客户端标准消息处理器",
                 )
 
+    async def _dispatch_batch(
+        self,
+        batch: List[NetworkEvent],
+        event_handlers: Dict[EventType, Callable[[NetworkEvent], Any]],
+    ) -> None:
+        """按到达顺序逐个分发一批事件
+
+        异步回调由_handle_message_event创建处理任务，不会阻塞后续事件；
+        同步等待回调的子类（如多连接客户端）仍按消息到达顺序处理。
+        """
+        for event in batch:
+            handler = event_handlers.get(event.event_type)
+            if handler is None:
+                continue
+            try:
+                await handler(event)
+            except Exception as e:
+                self.logger.error(f"Dispatcher error: {e}")
+
     async def _event_dispatcher(self) -> None:
         """事件分发器"""
         self.logger.info(f"{self.__class__.__name__} event dispatcher started")
+        event_queue = self.event_queue
+        event_handlers = self._event_handlers
+        reported_dropped = event_queue.dropped
         try:
             while self.running:
                 try:
-                    event = await asyncio.wait_for(self.event_queue.get(), timeout=1.0)
+                    # 批量取出已就绪的事件，为空时挂起等待；stop()通过取消任务立即唤醒
+                    batch = await event_queue.get_batch(_DISPATCH_BATCH_SIZE)
 
-                    # 子类处理连接事件
-                    if event.event_type == EventType.CONNECT:
-                        await self._handle_connect_event(event)
-                    elif event.event_type == EventType.DISCONNECT:
-                        await self._handle_disconnect_event(event)
-                    elif event.event_type == EventType.MESSAGE:
-                        await self._handle_message_event(event)
+                    if event_queue.dropped != reported_dropped:
+                        self.logger.warning(
+                            f"⚠️ 事件队列已满，累计拒收 {event_queue.dropped} 个消息事件（未确认，等待对端重发）"
+                        )
+                        reported_dropped = event_queue.dropped
+
+                    await self._dispatch_batch(batch, event_handlers)
 
-                except asyncio.TimeoutError:
-                    # 清理已完成的任务并继续循环
-                    await self._cleanup_completed_tasks()
-                    continue
                 except Exception as e:
                     self.logger.error(f"Dispatcher error: {e}")
 
@@ -278,7 +367,7 @@ class WebSocketClientBase(ABC):
                     self.logger.warning("部分客户端handler任务清理超时")
 
             self.active_handler_tasks.clear()
-            self.stats["active_handler_tasks"] = 0
+            self.stats.active_handler_tasks = 0
 
         # 5. 清空事件队列
         while not self.event_queue.empty():
@@ -288,13 +377,7 @@ class WebSocketClientBase(ABC):
                 break
 
         # 5. 重置统计信息
-        self.stats = {
-            "messages_sent": 0,
-            "messages_received": 0,
-            "connection_errors": 0,
-            "reconnections": 0,
-            "custom_messages_processed": 0,
-        }
+        self.stats.reset()
 
         self.logger.info(f"{self.__class__.__name__} stopped completely")
 
@@ -302,7 +385,7 @@ class WebSocketClientBase(ABC):
         """获取统计信息"""
         network_stats = self.network_driver.get_stats()
         return {
-            **self.stats,
+            **self.stats.to_dict(),
             "network": network_stats,
         }
 
@@ -8,10 +8,22 @@ import time
 import uuid
 from typing import Any, Callable, Dict, Optional
 
-from .client_base import WebSocketClientBase
+from . import json_utils
+from .client_base import ClientStats, WebSocketClientBase
 from .client_ws_connection import EventType, NetworkEvent, ConnectionConfig
 from .message import APIMessageBase
-from .ws_config import ClientConfig
+from .ws_config import ClientConfig, config_field_names, normalize_custom_type
+
+
+class WebSocketClientStats(ClientStats):
+    """单连接客户端统计，额外记录当前连接信息"""
+
+    __slots__ = ("connection_uuid", "cached_connection")
+
+    def reset(self) -> None:
+        super().reset()
+        self.connection_uuid = None
+        self.cached_connection = {}
 
 
 class WebSocketClient(WebSocketClientBase):
@@ -24,12 +36,16 @@ class WebSocketClient(WebSocketClientBase):
     - 内部自动缓存连接参数用于路由
     """
 
+    stats_class = WebSocketClientStats
+
     def __init__(self, config: ClientConfig):
         # 验证和初始化配置
         if not config.validate():
             raise ValueError("客户端配置验证失败")
         config.ensure_defaults()
         self.config = config
+        # 可更新的配置项集合，update_config时直接做集合查找
+        self._config_keys = config_field_names(config)
 
         # 使用配置中的自定义logger（如果提供）
         self.logger = config.get_logger()
@@ -40,26 +56,23 @@ class WebSocketClient(WebSocketClientBase):
         # 连接状态
         self.connected = False
         self.last_error: Optional[str] = None
+        # 连接确认（或客户端停止）时置位，connect()据此等待而非轮询
+        self._connected_event = asyncio.Event()
 
         # 缓存连接参数（用于内部路由）
         self._cached_url = config.url
         self._cached_api_key = config.api_key
         self._cached_platform = config.platform
         self._connection_uuid: Optional[str] = None
-
-        # 继承基类的统计信息，添加连接相关统计
-        self.stats.update(
-            {
-                "connection_uuid": None,
-                "cached_connection": {},
-            }
-        )
+        self._refresh_sender_meta()
 
     def update_config(self, **kwargs) -> None:
         """更新配置"""
+        changed = False
         for key, value in kwargs.items():
-            if hasattr(self.config, key):
+            if key in self._config_keys:
                 setattr(self.config, key, value)
+                changed = True
                 self.logger.info(f"客户端配置更新: {key} = {value}")
                 # 更新缓存的连接参数
                 if key == "url":
@@ -71,36 +84,49 @@ class WebSocketClient(WebSocketClientBase):
             else:
                 self.logger.warning(f"无效的配置项: {key}")
 
+        if not changed:
+            return
+        self._refresh_sender_meta()
+
         # 重新验证配置
         if not self.config.validate():
             raise ValueError("更新后的配置验证失败")
         self.config.ensure_defaults()
 
+    def _refresh_sender_meta(self) -> None:
+        """刷新消息包中固定不变的发送者元数据"""
+        self._sender_meta = {
+            "sender_user": self._cached_api_key,
+            "platform": self._cached_platform,
+        }
+
     def register_custom_handler(
         self, message_type: str, handler: Callable[[Dict[str, Any]], None]
     ) -> None:
         """注册自定义消息处理器"""
         self.config.register_custom_handler(message_type, handler)
-        # 同时更新基类的处理器
-        super().register_custom_handler(message_type, handler)
+        # 基类与配置通常共享同一个dict，仅在配置的dict被替换后才需要再更新基类
+        if self.custom_handlers is not self.config.custom_handlers:
+            super().register_custom_handler(message_type, handler)
 
     def unregister_custom_handler(self, message_type: str) -> None:
         """注销自定义消息处理器"""
         self.config.unregister_custom_handler(message_type)
-        # 同时更新基类的处理器
-        super().unregister_custom_handler(message_type)
+        if self.custom_handlers is not self.config.custom_handlers:
+            super().unregister_custom_handler(message_type)
 
     async def _handle_connect_event(self, event: NetworkEvent) -> None:
         """处理连接事件"""
         self._connection_uuid = event.connection_uuid
         self.connected = True
+        self._connected_event.set()
         self.last_error = None
         self._connected_count += 1
-        self.stats["successful_connects"] += 1
+        self.stats.successful_connects += 1
 
         # 更新缓存
-        self.stats["connection_uuid"] = self._connection_uuid
-        self.stats["cached_connection"] = {
+        self.stats.connection_uuid = self._connection_uuid
+        self.stats.cached_connection = {
             "url": self._cached_url,
             "api_key": self._cached_api_key,
             "platform": self._cached_platform,
@@ -113,14 +139,15 @@ class WebSocketClient(WebSocketClientBase):
         """处理断连事件"""
         connection_uuid = event.connection_uuid
         self.connected = False
+        self._connected_event.clear()
         self.last_error = event.error
         self._connected_count -= 0  # 单连接只能减到0
         if self._connected_count < 0:
             self._connected_count = 0
 
         # 清理缓存
-        self.stats["connection_uuid"] = None
-        self.stats["cached_connection"] = {}
+        self.stats.connection_uuid = None
+        self.stats.cached_connection = {}
 
         self.logger.info(f"与服务器断开连接 ({connection_uuid})")
 
@@ -135,10 +162,10 @@ class WebSocketClient(WebSocketClientBase):
             self.logger.error("Client not started")
             return False
 
+        self.stats.connect_attempts += 1
         if not self._connection_uuid:
             # 生成连接UUID
             self._connection_uuid = f"single_{uuid.uuid4().hex}"
-            self.stats["connect_attempts"] += 1
 
         # 创建连接配置
         connection_config = ConnectionConfig(
@@ -151,6 +178,11 @@ class WebSocketClient(WebSocketClientBase):
             ping_timeout=self.config.ping_timeout,
             close_timeout=self.config.close_timeout,
             max_size=self.config.max_size,
+            max_queue=self.config.max_queue,
+            write_limit=self.config.write_limit,
+            compression=self.config.compression,
+            binary_frames=self.config.binary_frames,
+            wire_format=self.config.wire_format,
             max_reconnect_attempts=self.config.max_reconnect_attempts,
             reconnect_delay=self.config.reconnect_delay,
             # SSL配置
@@ -165,24 +197,31 @@ class WebSocketClient(WebSocketClientBase):
         # 添加连接
         success = await self.network_driver.add_connection(connection_config)
         if success:
+            # 清除上次stop()遗留的唤醒信号
+            if not self.connected:
+                self._connected_event.clear()
+
             # 启动连接
             await self.network_driver.connect(self._connection_uuid)
 
-            # 等待连接建立（最多等待10秒）
+            # 等待连接建立（最多等待10秒），连接事件到达时立即唤醒
             self.logger.info("⏳ 等待连接建立...")
-            for i in range(100):  # 等待最多10秒
-                await asyncio.sleep(0.1)
-                if self.connected:
-                    self.logger.info(f"✅ 连接已建立 ({i * 0.1:.1f}s)")
-                    return True
-                if not self.running:  # 如果客户端停止了，停止等待
-                    break
+            start_time = time.monotonic()
+            try:
+                await asyncio.wait_for(self._connected_event.wait(), timeout=10.0)
+            except asyncio.TimeoutError:
+                pass
+            if self.connected:
+                self.logger.info(
+                    f"✅ 连接已建立 ({time.monotonic() - start_time:.1f}s)"
+                )
+                return True
 
             self.logger.warning("⚠️ 连接超时，未收到连接确认")
-            self.stats["failed_connects"] += 1
+            self.stats.failed_connects += 1
             return False
 
-        self.stats["failed_connects"] += 1
+        self.stats.failed_connects += 1
         return False
 
     async def disconnect(self) -> bool:
@@ -207,23 +246,22 @@ class WebSocketClient(WebSocketClientBase):
         if not self._connection_uuid:
             return False
 
+        now = time.time()
         message_package = {
             "ver": 1,
-            "msg_id": f"msg_{uuid.uuid4().hex[:12]}_{int(time.time())}",
+            "msg_id": f"msg_{uuid.uuid4().hex[:12]}_{int(now)}",
             "type": "sys_std",
-            "meta": {
-                "sender_user": self._cached_api_key,
-                "platform": self._cached_platform,
-                "timestamp": time.time(),
-            },
+            "meta": {**self._sender_meta, "timestamp": now},
             "payload": message.to_dict(),
         }
 
         success = await self.network_driver.send_message(
-            self._connection_uuid, message_package
+            self._connection_uuid,
+            message_package,
+            json_utils.dumps_for_wire(self.config.wire_format, message_package),
         )
         if success:
-            self.stats["messages_sent"] += 1
+            self.stats.messages_sent += 1
 
         return success
 
@@ -246,26 +284,24 @@ class WebSocketClient(WebSocketClientBase):
         if not self._connection_uuid:
             return False
 
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
 
+        now = time.time()
         message_package = {
             "ver": 1,
-            "msg_id": f"custom_{uuid.uuid4().hex[:12]}_{int(time.time())}",
+            "msg_id": f"custom_{uuid.uuid4().hex[:12]}_{int(now)}",
             "type": message_type,
-            "meta": {
-                "sender_user": self._cached_api_key,
-                "platform": self._cached_platform,
-                "timestamp": time.time(),
-            },
+            "meta": {**self._sender_meta, "timestamp": now},
             "payload": payload,
         }
 
         success = await self.network_driver.send_message(
-            self._connection_uuid, message_package
+            self._connection_uuid,
+            message_package,
+            json_utils.dumps_for_wire(self.config.wire_format, message_package),
         )
         if success:
-            self.stats["messages_sent"] += 1
+            self.stats.messages_sent += 1
 
         return success
 
@@ -297,6 +333,9 @@ class WebSocketClient(WebSocketClientBase):
 
         self.logger.info("Stopping single WebSocket client...")
 
+        # 唤醒仍在等待连接确认的connect()
+        self._connected_event.set()
+
         # 断开连接
         await self.disconnect()
 
@@ -308,7 +347,7 @@ class WebSocketClient(WebSocketClientBase):
         """获取统计信息"""
         network_stats = self.network_driver.get_stats()
         return {
-            **self.stats,
+            **self.stats.to_dict(),
             "network": network_stats,
             "connected": self.connected,
             "last_error": self.last_error,
@@ -3,25 +3,70 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
+import inspect
 import logging
 import queue
+import socket
+import ssl
 import threading
 import time
 import uuid
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, Set
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AbstractSet, Any, Dict, List, Optional, Set, Tuple, Union
 from enum import Enum
 
 import websockets
-from websockets.exceptions import ConnectionClosed, ConnectionClosedError
+from websockets.exceptions import (
+    ConnectionClosed,
+    ConnectionClosedError,
+    ConnectionClosedOK,
+)
 
 from .message_cache import MessageCache
+from . import json_utils
+from .ack_utils import ACK_STUB, AckBuilder
 from .log_queue import LoggerProxy, LogQueueProcessor, LogMessage, create_log_queue
 
 logger = logging.getLogger(__name__)
 
 
+class DriverStats:
+    """网络驱动器统计计数器 - __slots__属性自增代替dict字符串键查找"""
+
+    __slots__ = (
+        "total_connections",
+        "current_connections",
+        "messages_received",
+        "messages_sent",
+        "bytes_received",
+        "bytes_sent",
+        "reconnect_attempts",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """重置所有计数器"""
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """生成统计信息字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """兼容旧的dict形式读取"""
+        return getattr(self, name, default) if name in self.__slots__ else default
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+
 class EventType(Enum):
     """事件类型"""
 
@@ -30,6 +75,39 @@ class EventType(Enum):
     MESSAGE = "message"
 
 
+@functools.lru_cache(maxsize=32)
+def _build_ssl_context(
+    ssl_verify: bool,
+    ssl_ca_certs: Optional[str],
+    ssl_certfile: Optional[str],
+    ssl_keyfile: Optional[str],
+    ssl_check_hostname: bool,
+) -> ssl.SSLContext:
+    """按SSL配置构建SSLContext并缓存，相同配置的连接及其重连共享同一个上下文"""
+    ssl_context = ssl.create_default_context()
+
+    if not ssl_verify:
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+
+    if ssl_ca_certs:
+        ssl_context.load_verify_locations(ssl_ca_certs)
+
+    if ssl_certfile and ssl_keyfile:
+        ssl_context.load_cert_chain(ssl_certfile, keyfile=ssl_keyfile)
+
+    if not ssl_check_hostname:
+        ssl_context.check_hostname = False
+
+    return ssl_context
+
+
+# 影响get_headers()结果的字段
+_HEADER_FIELDS = frozenset(
+    {"headers", "connection_uuid", "api_key", "platform", "wire_format"}
+)
+
+
 @dataclass
 class ConnectionConfig:
     """连接配置"""
@@ -43,6 +121,14 @@ class ConnectionConfig:
     ping_timeout: int = 10
     close_timeout: int = 10
     max_size: int = 104_857_600
+    # 接收帧缓冲队列长度与发送缓冲高水位（字节），None使用websockets默认值；
+    # 连接数多且消息小时调低可减少每个连接的内存占用
+    max_queue: Optional[int] = None
+    write_limit: Optional[int] = None
+    compression: Optional[str] = "deflate"
+    binary_frames: bool = False
+    # 线格式："msgpack"需双方安装msgpack，握手协商失败时回退为JSON
+    wire_format: str = "json"
     max_reconnect_attempts: int = 5
     reconnect_delay: float = 2.0
     max_reconnect_delay: float = 10.0
@@ -55,24 +141,47 @@ class ConnectionConfig:
     ssl_keyfile: Optional[str] = None
     ssl_check_hostname: bool = True
 
+    # get_headers()结果缓存，相关字段被重新赋值时失效
+    _headers_cache: Optional[Dict[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def __post_init__(self) -> None:
         if self.connection_uuid is None:
             self.connection_uuid = str(uuid.uuid4())
         if self.headers is None:
             self.headers = {}
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in _HEADER_FIELDS:
+            object.__setattr__(self, "_headers_cache", None)
+
     def get_headers(self) -> Dict[str, str]:
-        """获取连接用的headers"""
-        headers = self.headers.copy()
-        headers.update(
-            {
+        """获取连接用的headers（缓存结果，调用方不应修改返回的dict）"""
+        headers = self._headers_cache
+        if headers is None:
+            headers = {
+                **self.headers,
                 "x-uuid": self.connection_uuid,
                 "x-apikey": self.api_key,
                 "x-platform": self.platform,
             }
-        )
+            if self.wire_format == "msgpack":
+                headers[json_utils.WIRE_FORMAT_HEADER] = "msgpack"
+            self._headers_cache = headers
         return headers
 
+    def get_ssl_context(self) -> ssl.SSLContext:
+        """获取SSL上下文（按SSL配置缓存，证书文件在首次加载后不会重新读取）"""
+        return _build_ssl_context(
+            self.ssl_verify,
+            self.ssl_ca_certs,
+            self.ssl_certfile,
+            self.ssl_keyfile,
+            self.ssl_check_hostname,
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
         return {
@@ -85,13 +194,19 @@ class ConnectionConfig:
             "ping_timeout": self.ping_timeout,
             "close_timeout": self.close_timeout,
             "max_size": self.max_size,
+            "max_queue": self.max_queue,
+            "write_limit": self.write_limit,
+            "compression": self.compression,
+            "binary_frames": self.binary_frames,
+            "wire_format": self.wire_format,
             "max_reconnect_attempts": self.max_reconnect_attempts,
             "reconnect_delay": self.reconnect_delay,
             "max_reconnect_delay": self.max_reconnect_delay,
         }
 
 
-@dataclass
+# 每条消息都会创建事件对象，使用slots省去实例__dict__
+@dataclass(slots=True)
 class NetworkEvent:
     """网络事件"""
 
@@ -107,15 +222,133 @@ class NetworkEvent:
             self.timestamp = time.time()
 
 
+class EventRing:
+    """单生产者单消费者事件环 - 网络驱动器到业务层分发器的事件通道
+
+    兼容asyncio.Queue的put/get接口。生产者线程通过put_threadsafe直接追加
+    （deque的append/popleft在GIL下是原子的），只有在没有待执行的唤醒时才
+    call_soon_threadsafe一次，突发流量下多个事件共享一次跨线程唤醒；
+    消费者通过get_batch一次取出一批事件。
+    maxsize>0时为有界队列：满时拒绝新到的MESSAGE事件并计入dropped，投递方法返回False，
+    网络驱动器据此不发送ACK，由对端缓存重发；
+    CONNECT/DISCONNECT等生命周期事件总是入队，否则业务层的连接状态会永久错误。
+    """
+
+    __slots__ = ("_items", "_maxsize", "_waiter", "_wakeup_pending", "dropped")
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._items: deque = deque()
+        self._maxsize = maxsize
+        self._waiter: Optional[asyncio.Future] = None
+        self._wakeup_pending = False
+        self.dropped = 0
+
+    def _append(self, item: NetworkEvent) -> bool:
+        """追加事件，被丢弃时返回False（只在生产者一侧追加，不与消费者竞争删除）"""
+        if (
+            self._maxsize > 0
+            and len(self._items) >= self._maxsize
+            and item.event_type is EventType.MESSAGE
+        ):
+            self.dropped += 1
+            return False
+        self._items.append(item)
+        return True
+
+    def _wakeup(self) -> None:
+        self._wakeup_pending = False
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def put_nowait(self, item: NetworkEvent) -> bool:
+        """投递事件，返回是否入队"""
+        if not self._append(item):
+            return False
+        self._wakeup()
+        return True
+
+    async def put(self, item: NetworkEvent) -> bool:
+        return self.put_nowait(item)
+
+    def put_threadsafe(
+        self, item: NetworkEvent, loop: asyncio.AbstractEventLoop
+    ) -> bool:
+        """从其他线程投递事件，返回是否入队；消费者所在循环loop只在需要时被唤醒一次"""
+        if not self._append(item):
+            return False
+        if not self._wakeup_pending:
+            self._wakeup_pending = True
+            loop.call_soon_threadsafe(self._wakeup)
+        return True
+
+    def get_nowait(self) -> Any:
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise asyncio.QueueEmpty from None
+
+    async def get(self) -> Any:
+        while not self._items:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiter = waiter
+            try:
+                await waiter
+            finally:
+                if self._waiter is waiter:
+                    self._waiter = None
+        return self._items.popleft()
+
+    async def get_batch(self, max_items: int) -> List[Any]:
+        """等待至少一个事件，然后一次取出最多max_items个"""
+        items = self._items
+        while not items:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiter = waiter
+            try:
+                await waiter
+            finally:
+                if self._waiter is waiter:
+                    self._waiter = None
+        batch = [items.popleft()]
+        while items and len(batch) < max_items:
+            batch.append(items.popleft())
+        return batch
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+
+def _resolve_future(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.set_result(None)
+
+
 class ClientNetworkDriver:
-    """客户端网络驱动器 - 纯I/O层，负责WebSocket连接管理"""
+    """客户端网络驱动器 - 纯I/O层，负责WebSocket连接管理
+
+    默认在独立工作线程的事件循环中运行连接；use_worker_thread=False时直接运行在
+    调用start()的事件循环中，省去跨线程调度。
+    """
 
     MAX_CONCURRENT_CONNECTIONS = 100
 
-    def __init__(self, custom_logger: Optional[Any] = None):
+    def __init__(
+        self, custom_logger: Optional[Any] = None, use_worker_thread: bool = True
+    ):
+        self.use_worker_thread = use_worker_thread
         # 连接管理
         self.connections: Dict[str, ConnectionConfig] = {}
         self.active_connections: Dict[str, websockets.WebSocketServerProtocol] = {}
+        # 握手时服务端确认使用msgpack线格式的连接，双向都以msgpack二进制帧收发
+        self.msgpack_connections: Set[str] = set()
+        # ACK的msg_id：驱动器实例随机前缀 + 单调计数，避免每条ACK生成uuid4
+        self._ack_builder = AckBuilder("client_timestamp")
         self.connection_states: Dict[str, str] = {}
 
         self._log_queue: Optional[queue.Queue[LogMessage]] = None
@@ -136,23 +369,23 @@ class ClientNetworkDriver:
         self.worker_thread: Optional[threading.Thread] = None
         self.running = False
 
+        # 跨线程发送批次：调用方事件循环 -> 本轮待发送的消息，每轮只跨线程调度一次
+        self._send_batches: Dict[
+            asyncio.AbstractEventLoop,
+            List[Tuple[str, Dict[str, Any], Optional[Union[bytes, str]], asyncio.Future]],
+        ] = {}
+
         # 连接任务管理
         self.connection_tasks: Dict[str, asyncio.Task] = {}
 
         # 统计信息
-        self.stats = {
-            "total_connections": 0,
-            "current_connections": 0,
-            "messages_received": 0,
-            "messages_sent": 0,
-            "bytes_received": 0,
-            "bytes_sent": 0,
-            "reconnect_attempts": 0,
-        }
+        self.stats = DriverStats()
 
         # 优雅关闭支持
         self._shutdown_event = asyncio.Event()
         self._worker_loop_task: Optional[asyncio.Task] = None
+        # _manage_connections在工作线程中等待的Future，stop()跨线程唤醒
+        self._manager_waiter: Optional[asyncio.Future] = None
 
         # 消息缓存支持
         self.message_cache: Optional[MessageCache] = None
@@ -264,22 +497,35 @@ class ClientNetworkDriver:
         return True
 
     def _create_connection_task(self, connection_uuid: str) -> None:
+        # 跨线程调度时，投递与执行之间可能已有其他connect()创建了任务
+        existing = self.connection_tasks.get(connection_uuid)
+        if existing is not None and not existing.done():
+            return
+
         task = asyncio.create_task(self._connection_loop(connection_uuid))
         self.connection_tasks[connection_uuid] = task
+        task.add_done_callback(
+            functools.partial(self._on_connection_task_done, connection_uuid)
+        )
 
-        def task_done_callback(fut):
-            if fut.exception():
-                logger.error(f"❌ 连接任务 {connection_uuid} 异常: {fut.exception()}")
-                import traceback
-
-                logger.error(f"连接任务错误详情: {traceback.format_exc()}")
+    def _on_connection_task_done(
+        self, connection_uuid: str, fut: asyncio.Future
+    ) -> None:
+        """连接任务结束回调"""
+        # 取消（如stop()时）属于预期结束，不记录异常
+        if not fut.cancelled():
+            exc = fut.exception()
+            if exc is not None:
+                # 由logging按需格式化异常的traceback
+                logger.error(
+                    f"❌ 连接任务 {connection_uuid} 异常: {exc}", exc_info=exc
+                )
             else:
                 logger.info(f"✅ 连接任务 {connection_uuid} 正常结束")
 
-            if connection_uuid in self.connection_tasks:
-                del self.connection_tasks[connection_uuid]
-
-        task.add_done_callback(task_done_callback)
+        # 只移除自己的登记，避免误删之后新建的任务
+        if self.connection_tasks.get(connection_uuid) is fut:
+            del self.connection_tasks[connection_uuid]
 
     async def disconnect(self, connection_uuid: str) -> bool:
         """断开指定连接"""
@@ -310,7 +556,8 @@ class ClientNetworkDriver:
                 except Exception as e:
                     logger.debug(f"Error closing websocket {connection_uuid}: {e}")
                 finally:
-                    del self.active_connections[connection_uuid]
+                    # 被取消的连接循环可能已先行移除（同一事件循环运行时）
+                    self.active_connections.pop(connection_uuid, None)
                     logger.info(
                         f"Removed connection {connection_uuid} from active connections"
                     )
@@ -380,35 +627,20 @@ class ClientNetworkDriver:
                     "ping_timeout": config.ping_timeout,
                     "close_timeout": config.close_timeout,
                     "max_size": config.max_size,
+                    "compression": config.compression,
                     "additional_headers": config.get_headers(),
                 }
+                if config.max_queue is not None:
+                    ws_kwargs["max_queue"] = config.max_queue
+                if config.write_limit is not None:
+                    ws_kwargs["write_limit"] = config.write_limit
 
                 logger.info(f"🔌 开始连接 {connection_uuid} 到 {config.url}")
                 logger.info(f"📋 连接参数: {ws_kwargs}")
-                logger.info(f"📋 Headers: {config.get_headers()}")
 
                 # 添加SSL配置
                 if config.ssl_enabled:
-                    import ssl
-
-                    ssl_context = ssl.create_default_context()
-
-                    if not config.ssl_verify:
-                        ssl_context.check_hostname = False
-                        ssl_context.verify_mode = ssl.CERT_NONE
-
-                    if config.ssl_ca_certs:
-                        ssl_context.load_verify_locations(config.ssl_ca_certs)
-
-                    if config.ssl_certfile and config.ssl_keyfile:
-                        ssl_context.load_cert_chain(
-                            config.ssl_certfile, keyfile=config.ssl_keyfile
-                        )
-
-                    if not config.ssl_check_hostname:
-                        ssl_context.check_hostname = False
-
-                    ws_kwargs["ssl"] = ssl_context
+                    ws_kwargs["ssl"] = config.get_ssl_context()
 
                 logger.info(f"🚀 正在创建WebSocket连接到: {config.url}")
                 websocket_connect = websockets.connect(config.url, **ws_kwargs)
@@ -416,14 +648,19 @@ class ClientNetworkDriver:
 
                 async with websocket_connect as websocket:
                     logger.info("🤝 WebSocket握手成功，连接已建立")
+                    self._tune_socket(websocket)
+                    if self._negotiated_msgpack(config, websocket):
+                        self.msgpack_connections.add(connection_uuid)
+                    else:
+                        self.msgpack_connections.discard(connection_uuid)
                     self.active_connections[connection_uuid] = websocket
                     self.connection_states[connection_uuid] = "connected"
                     reconnect_attempts = 0
                     reconnect_delay = config.reconnect_delay
 
                     # 更新统计
-                    self.stats["total_connections"] += 1
-                    self.stats["current_connections"] += 1
+                    self.stats.total_connections += 1
+                    self.stats.current_connections += 1
 
                     logger.info(f"Connection {connection_uuid} established")
 
@@ -434,12 +671,24 @@ class ClientNetworkDriver:
 
                     await self._retry_cached_messages(connection_uuid)
 
-                    # 消息接收循环
-                    async for message in websocket:
-                        if not self.running or connection_uuid not in self.connections:
+                    # 消息接收循环：websockets支持recv(decode=False)时文本帧也以UTF-8 bytes返回，
+                    # 直接交给orjson解析，省去str解码以及统计字节数时的重新编码
+                    if self._accepts_kwarg(type(websocket), "recv", "decode"):
+                        recv = functools.partial(websocket.recv, decode=False)
+                    else:
+                        recv = websocket.recv
+                    # 热循环中使用局部引用，省去每条消息的属性查找
+                    connections = self.connections
+                    handle_message = self._handle_message
+                    while True:
+                        try:
+                            message = await recv()
+                        except ConnectionClosedOK:
+                            break
+                        if not self.running or connection_uuid not in connections:
                             break
 
-                        await self._handle_message(connection_uuid, message)
+                        await handle_message(connection_uuid, message)
 
             except ConnectionClosedError as e:
                 if self.running:
@@ -467,7 +716,7 @@ class ClientNetworkDriver:
                     )
                     # 不记录详细连接信息以减少日志噪音
 
-                self.stats["reconnect_attempts"] += 1
+                self.stats.reconnect_attempts += 1
 
                 consecutive_failures += 1
                 logger.info(f"📉 连续失败次数: {consecutive_failures}")
@@ -498,10 +747,10 @@ class ClientNetworkDriver:
                 logger.debug(f"🧹 开始清理连接 {connection_uuid} 的状态")
                 if connection_uuid in self.active_connections:
                     del self.active_connections[connection_uuid]
-                self.stats["current_connections"] -= 1
+                self.stats.current_connections -= 1
                 self.connection_states[connection_uuid] = "disconnected"
                 logger.debug(
-                    f"📊 连接状态已更新为: disconnected, 当前连接数: {self.stats['current_connections']}"
+                    f"📊 连接状态已更新为: disconnected, 当前连接数: {self.stats.current_connections}"
                 )
 
             # 重连逻辑 - 检查是否收到关闭信号
@@ -517,14 +766,8 @@ class ClientNetworkDriver:
                     f"🔄 {connection_uuid} 将在 {reconnect_delay}s 后进行第 {reconnect_attempts} 次重连"
                 )
 
-                # 使用wait_for来支持关闭中断
-                try:
-                    logger.info(f"⏳ 等待 {reconnect_delay}s 后重连...")
-                    await asyncio.wait_for(asyncio.sleep(reconnect_delay), timeout=30.0)
-                    logger.info("✅ 重连等待完成")
-                except asyncio.TimeoutError:
-                    logger.info("⏰ 重连等待超时，继续重连逻辑")
-                    pass
+                # 关闭时stop()会在工作循环中取消连接任务，直接中断这里的等待
+                await asyncio.sleep(reconnect_delay)
 
                 # 检查关闭状态
                 if self._shutdown_event.is_set():
@@ -541,71 +784,103 @@ class ClientNetworkDriver:
                     logger.info(f"🗑️ 连接 {connection_uuid} 已被移除，停止重连")
                 break
 
+    @staticmethod
+    def _tune_socket(websocket: Any) -> None:
+        """关闭Nagle算法，避免小消息帧被合并延迟发送"""
+        try:
+            sock = websocket.transport.get_extra_info("socket")
+            if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError) as e:
+            logger.debug(f"设置TCP_NODELAY失败: {e}")
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _accepts_kwarg(connection_type: type, method: str, kwarg: str) -> bool:
+        """连接对象的方法是否支持某个关键字参数（用于兼容不同版本的websockets）"""
+        try:
+            signature = inspect.signature(getattr(connection_type, method))
+            return kwarg in signature.parameters
+        except (AttributeError, TypeError, ValueError):
+            return False
+
     async def _handle_message(self, connection_uuid: str, message: Any) -> None:
         """处理接收到的消息"""
         try:
             # 更新统计
-            self.stats["messages_received"] += 1
-            if isinstance(message, str):
-                self.stats["bytes_received"] += len(message.encode("utf-8"))
-
-            logger.info(
-                f"📨 收到来自 {connection_uuid} 的消息: {type(message).__name__}"
-            )
+            # recv(decode=False)下文本帧与二进制帧都是bytes，优先判断
+            is_bytes = isinstance(message, bytes)
+            self.stats.messages_received += 1
+            if is_bytes:
+                self.stats.bytes_received += len(message)
+            elif isinstance(message, str):
+                self.stats.bytes_received += json_utils.utf8_len(message)
+
+            # 逐条消息的日志只在DEBUG级别输出，避免热路径上的字符串格式化
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug(
+                    f"📨 收到来自 {connection_uuid} 的消息: {type(message).__name__}"
+                )
 
-            if isinstance(message, str):
+            if is_bytes or isinstance(message, str):
+                # orjson直接解析UTF-8 bytes，无需先解码为str
                 try:
-                    data = json.loads(message)
-                    logger.info(
-                        f"✅ JSON解析成功: {list(data.keys()) if isinstance(data, dict) else 'N/A'}"
-                    )
-                except json.JSONDecodeError as e:
+                    if is_bytes and connection_uuid in self.msgpack_connections:
+                        data = json_utils.unpackb(message)
+                    else:
+                        data = json_utils.loads(message)
+                except json_utils.JSONDecodeError as e:
                     logger.info(f"⚠️ JSON解析失败: {e}")
+                    if is_bytes:
+                        message = message.decode("utf-8", "replace")
                     data = {"raw_message": message}
             elif isinstance(message, dict):
                 data = message
             else:
                 data = {"data": str(message)}
 
-            if data.get("type") == "sys_ack":
-                acked_msg_id = data.get("meta", {}).get("acked_msg_id")
+            msg_type = data.get("type")
+            if msg_type == "sys_ack":
+                meta = data.get("meta")
+                acked_msg_id = meta.get("acked_msg_id") if meta else None
                 if acked_msg_id:
-                    logger.info(f"📬 收到ACK确认: acked_msg_id={acked_msg_id}")
+                    if debug:
+                        logger.debug(f"📬 收到ACK确认: acked_msg_id={acked_msg_id}")
                     if self.message_cache and self.message_cache.enabled:
                         removed = self.message_cache.mark_acked(acked_msg_id)
-                        if removed:
-                            logger.info(f"💾 已从缓存移除消息: {acked_msg_id}")
-            else:
-                msg_id = data.get("msg_id")
-                if msg_id:
-                    logger.info(f"📬 发送ACK确认: msg_id={msg_id}")
-                    await self._send_ack(connection_uuid, msg_id)
+                        if removed and debug:
+                            logger.debug(f"💾 已从缓存移除消息: {acked_msg_id}")
 
             # 发送消息事件到业务层
-            msg_type = data.get("type") if isinstance(data, dict) else "unknown"
-            logger.info(f"🚀 发送消息事件到业务层: type={msg_type}")
-            await self._send_event(EventType.MESSAGE, connection_uuid, data)
+            if debug:
+                logger.debug(f"🚀 发送消息事件到业务层: type={msg_type}")
+            accepted = await self._send_event(EventType.MESSAGE, connection_uuid, data)
+
+            # 事件入队后才确认；未入队的消息不发送ACK，留在对端缓存中等待重发
+            if msg_type != "sys_ack":
+                msg_id = data.get("msg_id")
+                if msg_id:
+                    if accepted:
+                        if debug:
+                            logger.debug(f"📬 发送ACK确认: msg_id={msg_id}")
+                        await self._send_ack(connection_uuid, msg_id)
+                    elif debug:
+                        logger.debug(f"⚠️ 消息事件未入队，不发送ACK: msg_id={msg_id}")
 
         except Exception as e:
-            logger.info(f"❌ 处理 {connection_uuid} 消息时出错: {e}")
             logger.error(f"Message handling error from {connection_uuid}: {e}")
 
     async def _send_ack(self, connection_uuid: str, msg_id: str) -> None:
         """发送消息确认"""
         try:
-            ack_message = {
-                "ver": 1,
-                "msg_id": str(uuid.uuid4()),
-                "type": "sys_ack",
-                "meta": {
-                    "uuid": connection_uuid,
-                    "acked_msg_id": msg_id,
-                    "timestamp": time.time(),
-                },
-                "payload": {"status": "received", "client_timestamp": time.time()},
-            }
-
-            await self._send_raw_message(connection_uuid, ack_message)
+            now = time.time()
+            if connection_uuid in self.msgpack_connections:
+                ack_message = self._ack_builder.build(connection_uuid, msg_id, now)
+                await self._send_raw_message(connection_uuid, ack_message)
+            else:
+                encoded = self._ack_builder.encode_json(connection_uuid, msg_id, now)
+                await self._send_raw_message(connection_uuid, ACK_STUB, encoded)
 
         except Exception as e:
             logger.error(f"Error sending ACK to {connection_uuid}: {e}")
@@ -648,9 +923,16 @@ class ClientNetworkDriver:
         logger.info(f"💾 消息缓存已设置: enabled={message_cache.enabled}")
 
     async def _send_raw_message(
-        self, connection_uuid: str, message: Dict[str, Any]
+        self,
+        connection_uuid: str,
+        message: Dict[str, Any],
+        encoded: Optional[Union[bytes, str]] = None,
     ) -> bool:
-        """发送原始消息到指定连接"""
+        """发送原始消息到指定连接
+
+        encoded为业务层预先序列化好的帧载荷（通常为orjson输出的UTF-8 bytes），
+        提供时直接发送，message仅用于日志与失败缓存。帧类型由连接的binary_frames决定。
+        """
         if connection_uuid not in self.active_connections:
             logger.info(f"⚠️ 连接 {connection_uuid} 不活跃，无法发送消息")
 
@@ -664,21 +946,43 @@ class ClientNetworkDriver:
         websocket = self.active_connections[connection_uuid]
 
         try:
-            message_str = json.dumps(message)
-            message_size = len(message_str.encode("utf-8"))
-            logger.info(
-                f"📤 向 {connection_uuid} 发送消息: type={message.get('type', 'unknown')}, size={message_size}字节"
-            )
+            msgpack_wire = connection_uuid in self.msgpack_connections
+            if msgpack_wire:
+                # 预序列化的载荷是JSON，msgpack连接需重新编码
+                payload = json_utils.packb(message)
+            elif encoded is not None:
+                payload = encoded
+            else:
+                payload = json_utils.dumps_bytes(message)
+            if isinstance(payload, str):
+                message_size = json_utils.utf8_len(payload)
+            else:
+                message_size = len(payload)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug(
+                    f"📤 向 {connection_uuid} 发送消息: type={message.get('type', 'unknown')}, size={message_size}字节"
+                )
 
-            await websocket.send(message_str)
+            config = self.connections.get(connection_uuid)
+            binary = msgpack_wire or (config is not None and config.binary_frames)
+            if binary or isinstance(payload, str):
+                # 二进制帧直接发送UTF-8字节（对端无需做文本帧的UTF-8校验），str按文本帧原样发送
+                await websocket.send(payload)
+            elif self._accepts_kwarg(type(websocket), "send", "text"):
+                # 文本帧：直接发送已编码的UTF-8字节，省去decode/encode往返
+                await websocket.send(payload, text=True)
+            else:
+                await websocket.send(payload.decode("utf-8"))
 
             # 更新统计
-            self.stats["messages_sent"] += 1
-            self.stats["bytes_sent"] += message_size
+            self.stats.messages_sent += 1
+            self.stats.bytes_sent += message_size
 
-            logger.info(
-                f"✅ 消息发送成功: 总计发送 {self.stats['messages_sent']} 条消息"
-            )
+            if debug:
+                logger.debug(
+                    f"✅ 消息发送成功: 总计发送 {self.stats.messages_sent} 条消息"
+                )
 
             return True
 
@@ -703,21 +1007,141 @@ class ClientNetworkDriver:
                     logger.info(f"💾 消息已缓存（发送失败）: {msg_id}")
             return False
 
-    async def send_message(self, connection_uuid: str, message: Dict[str, Any]) -> bool:
-        """发送消息到指定连接（业务层接口）"""
+    @staticmethod
+    def _negotiated_msgpack(config: ConnectionConfig, websocket: Any) -> bool:
+        """检查服务端是否在握手响应中确认了msgpack线格式"""
+        if config.wire_format != "msgpack" or not json_utils.HAS_MSGPACK:
+            return False
+        response = getattr(websocket, "response", None)
+        if response is not None:
+            headers = response.headers
+        else:
+            # 旧版websockets
+            headers = getattr(websocket, "response_headers", None) or {}
+        return headers.get(json_utils.WIRE_FORMAT_HEADER) == "msgpack"
+
+    async def send_message(
+        self,
+        connection_uuid: str,
+        message: Dict[str, Any],
+        encoded: Optional[Union[bytes, str]] = None,
+    ) -> bool:
+        """发送消息到指定连接（业务层接口），encoded为可选的预序列化帧载荷"""
         # 如果我们在不同的循环中，必须调度到工作循环
-        if (
-            self.main_loop
-            and self.main_loop.is_running()
-            and self.main_loop != asyncio.get_running_loop()
-        ):
-            # 使用 run_coroutine_threadsafe 调度并通过 wrap_future 等待结果
-            future = asyncio.run_coroutine_threadsafe(
-                self._send_raw_message(connection_uuid, message), self.main_loop
+        loop = asyncio.get_running_loop()
+        if self.main_loop and self.main_loop.is_running() and self.main_loop != loop:
+            # 同一轮事件循环内的发送合并为一批，只做一次跨线程调度
+            future = loop.create_future()
+            batch = self._send_batches.get(loop)
+            if batch is None:
+                batch = self._send_batches[loop] = []
+                loop.call_soon(self._flush_send_batch, loop)
+            batch.append((connection_uuid, message, encoded, future))
+            return await future
+
+        return await self._send_raw_message(connection_uuid, message, encoded)
+
+    def _flush_send_batch(self, loop: asyncio.AbstractEventLoop) -> None:
+        """将调用方事件循环中积攒的发送批次一次性调度到工作循环"""
+        batch = self._send_batches.pop(loop, None)
+        if not batch:
+            return
+
+        def deliver(results: List[Any]) -> None:
+            for item, result in zip(batch, results):
+                future = item[3]
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+        def on_done(cf) -> None:
+            try:
+                results = cf.result()
+            except BaseException as e:
+                results = [e] * len(batch)
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(deliver, results)
+
+        try:
+            cf = asyncio.run_coroutine_threadsafe(
+                self._send_many(
+                    [(uuid_, msg, enc) for uuid_, msg, enc, _ in batch]
+                ),
+                self.main_loop,
             )
-            return await asyncio.wrap_future(future)
+        except RuntimeError as e:
+            deliver([e] * len(batch))
+            return
+        cf.add_done_callback(on_done)
+
+    async def _send_many(
+        self, items: List[Tuple[str, Dict[str, Any], Optional[Union[bytes, str]]]]
+    ) -> List[Any]:
+        """在工作循环中发送一批消息，逐条返回结果（异常作为结果返回）
+
+        按连接分组：同一连接的消息按顺序依次发送，不同连接的分组并发发送，
+        某个连接写出受阻时不会拖慢其他连接。
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, (connection_uuid, _, _) in enumerate(items):
+            groups.setdefault(connection_uuid, []).append(index)
+
+        results: List[Any] = [None] * len(items)
+        if len(groups) == 1:
+            await self._send_group(items, next(iter(groups.values())), results)
+        else:
+            await asyncio.gather(
+                *(self._send_group(items, indexes, results) for indexes in groups.values()),
+                return_exceptions=True,
+            )
+        return results
+
+    async def _send_group(
+        self,
+        items: List[Tuple[str, Dict[str, Any], Optional[Union[bytes, str]]]],
+        indexes: List[int],
+        results: List[Any],
+    ) -> None:
+        """依次发送同一连接的消息，结果写回results的对应位置
 
-        return await self._send_raw_message(connection_uuid, message)
+        有多条消息时，发送期间开启该连接的TCP_CORK，由内核把连续的小帧合并成
+        尽量少的TCP报文段；本组发送完立即关闭，不等待批次中的其他连接。
+        """
+        corked = None
+        if len(indexes) > 1:
+            websocket = self.active_connections.get(items[indexes[0]][0])
+            if websocket is not None and self._set_cork(websocket, True):
+                corked = websocket
+
+        try:
+            for index in indexes:
+                connection_uuid, message, encoded = items[index]
+                try:
+                    results[index] = await self._send_raw_message(
+                        connection_uuid, message, encoded
+                    )
+                except Exception as e:
+                    results[index] = e
+        finally:
+            if corked is not None:
+                self._set_cork(corked, False)
+
+    @staticmethod
+    def _set_cork(websocket: Any, enabled: bool) -> bool:
+        """开关连接socket的TCP_CORK（仅Linux），返回是否设置成功"""
+        if not hasattr(socket, "TCP_CORK"):
+            return False
+        try:
+            sock = websocket.transport.get_extra_info("socket")
+            if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+                return False
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1 if enabled else 0)
+            return True
+        except (AttributeError, OSError):
+            return False
 
     async def _send_event(
         self,
@@ -725,17 +1149,17 @@ class ClientNetworkDriver:
         connection_uuid: str,
         payload: Optional[Dict[str, Any]] = None,
         error: Optional[str] = None,
-    ) -> None:
-        """发送事件到业务层"""
-        if not self.event_queue:
+    ) -> bool:
+        """发送事件到业务层，返回事件是否已入队"""
+        if self.event_queue is None:
             logger.warning("Event queue not available, event dropped")
-            return
+            return False
 
         try:
             config = self.connections.get(connection_uuid)
             if not config:
                 logger.warning(f"No config for connection {connection_uuid}")
-                return
+                return False
 
             event = NetworkEvent(
                 event_type=event_type,
@@ -748,28 +1172,42 @@ class ClientNetworkDriver:
             # 直接发送事件到队列
             # 注意：这是跨线程操作！我们必须使用 queue_loop 的 call_soon_threadsafe
             if self.queue_loop and self.queue_loop != asyncio.get_running_loop():
-                logger.debug(f"Cross-thread dispatch to loop {id(self.queue_loop)}")
+                put_threadsafe = getattr(self.event_queue, "put_threadsafe", None)
+                if put_threadsafe is not None:
+                    return put_threadsafe(event, self.queue_loop)
                 self.queue_loop.call_soon_threadsafe(self.event_queue.put_nowait, event)
-            else:
-                # 如果我们在同一个循环中（或者没有捕获 loop），可以直接 put
-                logger.debug("Same-loop dispatch")
-                # 注意：put 是协程，会等待队列空闲。但在同一个Loop中是安全的。
-                await self.event_queue.put(event)
+                return True
+
+            # 如果我们在同一个循环中（或者没有捕获 loop），可以直接 put
+            # 注意：put 是协程，会等待队列空闲。但在同一个Loop中是安全的。
+            # asyncio.Queue.put()返回None，视为已入队
+            return await self.event_queue.put(event) is not False
 
         except Exception as e:
             logger.error(f"Error sending event to business layer: {e}")
+            return False
 
     def get_connection_count(self) -> int:
         """获取当前连接数"""
         return len(self.active_connections)
 
-    def get_connection_list(self) -> Set[str]:
-        """获取所有连接UUID"""
-        return set(self.connections.keys())
+    def get_connection_list(self) -> AbstractSet[str]:
+        """获取所有连接UUID
+
+        工作线程模式下连接表由工作线程修改，返回副本；单事件循环模式下返回实时视图。
+        """
+        if self.use_worker_thread:
+            return set(self.connections)
+        return self.connections.keys()
 
-    def get_active_connections(self) -> Set[str]:
-        """获取活跃连接UUID"""
-        return set(self.active_connections.keys())
+    def get_active_connections(self) -> AbstractSet[str]:
+        """获取活跃连接UUID
+
+        工作线程模式下连接表由工作线程修改，返回副本；单事件循环模式下返回实时视图。
+        """
+        if self.use_worker_thread:
+            return set(self.active_connections)
+        return self.active_connections.keys()
 
     def get_connection_state(self, connection_uuid: str) -> Optional[str]:
         """获取连接状态"""
@@ -781,10 +1219,12 @@ class ClientNetworkDriver:
 
     def get_stats(self) -> Dict[str, Any]:
         """获取统计信息"""
-        return self.stats.copy()
+        return self.stats.to_dict()
 
-    def _worker_loop_run(self, event_queue: asyncio.Queue) -> None:
-        """工作线程中运行的事件循环"""
+    def _worker_loop_run(
+        self, event_queue: asyncio.Queue, started: Optional[asyncio.Future] = None
+    ) -> None:
+        """工作线程中运行的事件循环，循环开始运行后通过started通知调用方"""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
 
@@ -808,6 +1248,11 @@ class ClientNetworkDriver:
             self.main_loop = loop
             self.running = True
 
+            if started is not None:
+                loop.call_soon(
+                    started.get_loop().call_soon_threadsafe, _resolve_future, started
+                )
+
             # 运行连接管理循环
             loop.run_until_complete(self._manage_connections())
 
@@ -845,12 +1290,23 @@ class ClientNetworkDriver:
                 loop.close()
 
     async def _manage_connections(self) -> None:
-        """管理所有连接"""
-        while self.running:
-            try:
-                await asyncio.sleep(0.1)  # 避免CPU占用过高
-            except asyncio.CancelledError:
-                break
+        """管理所有连接 - 挂起工作线程循环直到stop()唤醒，无需轮询"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._manager_waiter = waiter
+        try:
+            # 在登记之后再检查running，避免错过登记之前发生的stop()
+            if self.running:
+                await waiter
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._manager_waiter = None
+
+    def _wake_manager(self) -> None:
+        """唤醒_manage_connections（必须在工作线程循环中调用）"""
+        waiter = self._manager_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
 
     def set_event_queue(self, event_queue: asyncio.Queue) -> None:
         """设置事件队列"""
@@ -873,23 +1329,39 @@ class ClientNetworkDriver:
 
         self._shutdown_event.clear()
 
+        if event_queue is not None:
+            self.event_queue = event_queue
+
+        if self.event_queue is None:
+            raise ValueError("Event queue is required")
+
+        if not self.use_worker_thread:
+            # 单事件循环模式：连接任务直接运行在当前循环中
+            self.main_loop = asyncio.get_running_loop()
+            self.running = True
+            self._worker_loop_task = asyncio.create_task(self._manage_connections())
+            logger.info("Client network driver started (current loop)")
+            return
+
+        # 日志队列仅用于把工作线程中的日志转交给调用方线程
         self._init_log_queue()
 
         if self._log_processor:
             await self._log_processor.start()
 
-        if event_queue:
-            self.event_queue = event_queue
-
-        if not self.event_queue:
-            raise ValueError("Event queue is required")
-
+        started = asyncio.get_running_loop().create_future()
         self.worker_thread = threading.Thread(
-            target=self._worker_loop_run, args=(self.event_queue,), daemon=True
+            target=self._worker_loop_run,
+            args=(self.event_queue, started),
+            daemon=True,
         )
         self.worker_thread.start()
 
-        await asyncio.sleep(0.5)
+        # 等待工作线程的事件循环真正开始运行，而不是固定睡眠
+        try:
+            await asyncio.wait_for(started, timeout=5.0)
+        except asyncio.TimeoutError:
+            logger.warning("Worker loop did not start within 5s")
 
         logger.info("Client network driver started")
 
@@ -946,32 +1418,40 @@ class ClientNetworkDriver:
             await self._log_processor.stop()
             self._log_processor = None
 
-        if self.main_loop and self.main_loop.is_running():
+        if not self.use_worker_thread:
+            await self._cleanup_worker_tasks()
+            self._wake_manager()
+            if self._worker_loop_task is not None:
+                try:
+                    await asyncio.wait_for(self._worker_loop_task, timeout=3.0)
+                except (asyncio.CancelledError, asyncio.TimeoutError):
+                    pass
+                self._worker_loop_task = None
+        elif self.main_loop and self.main_loop.is_running():
             try:
                 cleanup_future = asyncio.run_coroutine_threadsafe(
                     self._cleanup_worker_tasks(), self.main_loop
                 )
-                cleanup_future.result(timeout=3.0)
+                # 异步等待工作线程中的清理（并发取消所有连接任务），不阻塞当前事件循环
+                await asyncio.wait_for(asyncio.wrap_future(cleanup_future), timeout=3.0)
             except Exception as e:
                 logger.warning(f"Error during worker cleanup dispatch: {e}")
 
+            try:
+                self.main_loop.call_soon_threadsafe(self._wake_manager)
+            except RuntimeError:
+                # 工作线程循环已关闭
+                pass
+
         if self.worker_thread and self.worker_thread.is_alive():
             try:
-                self.worker_thread.join(timeout=3.0)
+                await asyncio.to_thread(self.worker_thread.join, 3.0)
                 if self.worker_thread.is_alive():
                     logger.warning("Worker thread did not stop gracefully")
             except Exception as e:
                 logger.error(f"Error joining worker thread: {e}")
 
-        self.stats = {
-            "total_connections": 0,
-            "current_connections": 0,
-            "messages_received": 0,
-            "messages_sent": 0,
-            "bytes_received": 0,
-            "bytes_sent": 0,
-            "reconnect_attempts": 0,
-        }
+        self.stats.reset()
 
         self.main_loop = None
         self.worker_thread = None
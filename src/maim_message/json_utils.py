@@ -0,0 +1,73 @@
+"""
+JSON编解码工具 - 优先使用orjson，未安装时回退到标准库json
+
+另提供可选的msgpack编解码（需安装msgpack），用于协商了msgpack线格式的连接。
+"""
+
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - 取决于运行环境
+    orjson = None
+    HAS_ORJSON = False
+
+try:
+    import msgpack
+
+    HAS_MSGPACK = True
+except ImportError:  # pragma: no cover - 取决于运行环境
+    msgpack = None
+    HAS_MSGPACK = False
+
+# 线格式协商使用的header
+WIRE_FORMAT_HEADER = "x-wire-format"
+WIRE_FORMATS = ("json", "msgpack")
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，统一捕获即可
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """序列化为UTF-8编码的bytes"""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_for_wire(wire_format: str, obj: Any) -> Optional[bytes]:
+    """按连接配置的线格式预先序列化：JSON返回UTF-8字节，msgpack由驱动器按连接编码，返回None"""
+    return dumps_bytes(obj) if wire_format == "json" else None
+
+
+def utf8_len(text: str) -> int:
+    """计算字符串的UTF-8字节长度，纯ASCII时无需编码"""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def loads(data: Any) -> Any:
+    """反序列化，支持str/bytes/bytearray/memoryview"""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    try:
+        return json.loads(data)
+    except UnicodeDecodeError as e:
+        raise JSONDecodeError(str(e), "", 0) from e
+
+
+def packb(obj: Any) -> bytes:
+    """序列化为msgpack字节"""
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def unpackb(data: Any) -> Any:
+    """反序列化msgpack字节，失败时与loads一样抛出JSONDecodeError便于统一处理"""
+    try:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    except Exception as e:
+        raise JSONDecodeError(str(e), "", 0) from e
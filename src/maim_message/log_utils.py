@@ -12,6 +12,12 @@ DEFAULT_HANDLER_NAME = "maim_message_default_handler"
 _logger = None
 
 
+def is_debug_enabled(logger) -> bool:
+    """判断logger是否启用DEBUG级别（自定义logger不支持判断时视为启用）"""
+    is_enabled_for = getattr(logger, "isEnabledFor", None)
+    return is_enabled_for(logging.DEBUG) if is_enabled_for else True
+
+
 def setup_logger(
     name: str = "maim_message",
     format_str: str = DEFAULT_FORMAT,
@@ -3,14 +3,41 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import time
 import uuid
-from typing import Any, Callable, Dict, Optional
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Iterator, Optional
 
-from .client_base import WebSocketClientBase
-from .client_ws_connection import ConnectionConfig, NetworkEvent
+from . import json_utils
+from .client_base import ClientStats, WebSocketClientBase
+from .client_ws_connection import ConnectionConfig, EventRing, NetworkEvent
 from .message import APIMessageBase
-from .ws_config import MultiClientConfig, ConnectionEntry
+from .ws_config import MultiClientConfig, ConnectionEntry, normalize_custom_type
+
+
+# register_connection kwargs 中传递给 ConnectionConfig 的参数及其默认值
+_DEFAULT_CONN_KWARGS: Dict[str, Any] = {
+    "headers": None,
+    "ping_interval": 20,
+    "ping_timeout": 10,
+    "close_timeout": 10,
+    "max_size": 104_857_600,
+    "compression": "deflate",
+    "max_queue": None,
+    "write_limit": None,
+    "binary_frames": False,
+    "wire_format": "json",
+    "max_reconnect_attempts": 5,
+    "reconnect_delay": 1.0,
+    # SSL配置
+    "ssl_enabled": False,
+    "ssl_verify": True,
+    "ssl_ca_certs": None,
+    "ssl_certfile": None,
+    "ssl_keyfile": None,
+    "ssl_check_hostname": True,
+}
 
 
 class ConnectionInfo:
@@ -22,11 +49,61 @@ class ConnectionInfo:
         self.api_key = api_key
         self.platform = platform
         self.kwargs = kwargs
+        # 注册时合并一次默认值，每次连接直接展开构建ConnectionConfig
+        self.config_kwargs: Dict[str, Any] = {
+            **_DEFAULT_CONN_KWARGS,
+            **{k: v for k, v in kwargs.items() if k in _DEFAULT_CONN_KWARGS},
+        }
         self.connection_uuid: Optional[str] = None
         self.connected = False
         self.last_error: Optional[str] = None
 
 
+class ConnectionsView(Mapping):
+    """连接信息的只读实时视图 - 不复制连接表，访问时才生成单个连接的信息字典
+
+    成员判断与len()不产生任何分配；需要快照时使用dict(view)。
+    """
+
+    __slots__ = ("_client", "_names")
+
+    def __init__(self, client: "WebSocketMultiClient", names: Dict[str, Any]):
+        self._client = client
+        self._names = names
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        if name not in self._names:
+            raise KeyError(name)
+        conn_info = self._client.named_connections[name]
+        return {
+            "url": conn_info.url,
+            "api_key": conn_info.api_key,
+            "platform": conn_info.platform,
+            "connection_uuid": conn_info.connection_uuid,
+            "connected": conn_info.connected,
+        }
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class MultiClientStats(ClientStats):
+    """多连接客户端统计，额外记录连接数量"""
+
+    __slots__ = ("connections_registered", "connections_active")
+
+    def reset(self) -> None:
+        super().reset()
+        self.connections_registered = 0
+        self.connections_active = 0
+
+
 class WebSocketMultiClient(WebSocketClientBase):
     """WebSocket 多连接客户端 - 专门用于多连接场景
 
@@ -39,6 +116,8 @@ class WebSocketMultiClient(WebSocketClientBase):
     - 支持MultiClientConfig配置类进行批量配置管理
     """
 
+    stats_class = MultiClientStats
+
     def __init__(self, config: Optional[MultiClientConfig] = None):
         self.multi_config = config or MultiClientConfig()
         self.multi_config.ensure_defaults()
@@ -46,21 +125,21 @@ class WebSocketMultiClient(WebSocketClientBase):
         super().__init__(None)
 
         self.logger = self.multi_config.get_logger()
+        # 与配置对象共享自定义处理器dict，使配置中预先注册的处理器生效
+        self.custom_handlers = self.multi_config.custom_handlers
 
         self.network_driver.logger = self.logger
+        self.network_driver.use_worker_thread = self.multi_config.use_worker_thread
+        self.event_queue = EventRing(maxsize=self.multi_config.event_queue_max_size)
 
         self.named_connections: Dict[str, ConnectionInfo] = {}
         self.uuid_to_name: Dict[str, str] = {}
+        # 已连接的连接名称索引（有序），由连接/断连事件维护，避免全量扫描
+        self._active_names: Dict[str, None] = {}
 
         self._connected_count = 0
-
-        self.stats.update(
-            {
-                "connections_registered": 0,
-                "connections_active": 0,
-                "connection_names": [],
-            }
-        )
+        # 连接UUID序号，保证同一时刻重复连接也不会生成相同UUID
+        self._uuid_counter = itertools.count()
 
     def register_connection(
         self, name: str, url: str, api_key: str, platform: str = "default", **kwargs
@@ -79,11 +158,12 @@ class WebSocketMultiClient(WebSocketClientBase):
         """
         if name in self.named_connections:
             self.logger.warning(f"连接名称 '{name}' 已存在，将被覆盖")
+            self._active_names.pop(name, None)
 
         # 创建连接信息
         connection_info = ConnectionInfo(name, url, api_key, platform, **kwargs)
         self.named_connections[name] = connection_info
-        self.stats["connections_registered"] = len(self.named_connections)
+        self.stats.connections_registered = len(self.named_connections)
 
         if self.multi_config:
             conn_entry = ConnectionEntry(
@@ -149,8 +229,9 @@ class WebSocketMultiClient(WebSocketClientBase):
         if connection_info.connection_uuid in self.uuid_to_name:
             del self.uuid_to_name[connection_info.connection_uuid]
 
+        self._active_names.pop(name, None)
         del self.named_connections[name]
-        self.stats["connections_registered"] = len(self.named_connections)
+        self.stats.connections_registered = len(self.named_connections)
 
         if self.multi_config and name in self.multi_config.connections:
             del self.multi_config.connections[name]
@@ -189,21 +270,26 @@ class WebSocketMultiClient(WebSocketClientBase):
 
         self.logger.info("Multi client started")
 
+    def get_connections(self, active_only: bool = False) -> ConnectionsView:
+        """获取连接信息的实时视图
+
+        Args:
+            active_only: 是否仅包含已连接的连接
+
+        Returns:
+            ConnectionsView: 连接名称到连接信息的只读映射
+        """
+        return ConnectionsView(
+            self, self._active_names if active_only else self.named_connections
+        )
+
+    def get_active_connections(self) -> ConnectionsView:
         """获取活跃连接的信息
 
         Returns:
-            Dict[str, Dict[str, Any]]: 连接名称到连接信息的映射（仅包含已连接的）
+            ConnectionsView: 连接名称到连接信息的映射（仅包含已连接的）
         """
-        active = {}
-        for name, conn_info in self.named_connections.items():
-            if conn_info.connected:
-                active[name] = {
-                    "url": conn_info.url,
-                    "api_key": conn_info.api_key,
-                    "platform": conn_info.platform,
-                    "connection_uuid": conn_info.connection_uuid,
-                }
-        return active
+        return self.get_connections(active_only=True)
 
     def register_custom_handler(
         self, message_type: str, handler: Callable[[Dict[str, Any]], None]
@@ -212,16 +298,17 @@ class WebSocketMultiClient(WebSocketClientBase):
         # 注册到配置对象
         self.multi_config.register_custom_handler(message_type, handler)
 
-        # 同时更新基类的处理器
-        super().register_custom_handler(message_type, handler)
+        # 基类与配置通常共享同一个dict，仅在配置的dict被替换后才需要再更新基类
+        if self.custom_handlers is not self.multi_config.custom_handlers:
+            super().register_custom_handler(message_type, handler)
 
     def unregister_custom_handler(self, message_type: str) -> None:
         """注销自定义消息处理器"""
         # 从配置对象中注销
         self.multi_config.unregister_custom_handler(message_type)
 
-        # 同时更新基类的处理器
-        super().unregister_custom_handler(message_type)
+        if self.custom_handlers is not self.multi_config.custom_handlers:
+            super().unregister_custom_handler(message_type)
 
     async def _handle_connect_event(self, event: NetworkEvent) -> None:
         """处理连接事件"""
@@ -234,9 +321,10 @@ class WebSocketMultiClient(WebSocketClientBase):
             connection_info.connection_uuid = connection_uuid
             connection_info.connected = True
             connection_info.last_error = None
+            self._active_names[connection_name] = None
             self._connected_count += 1
-            self.stats["successful_connects"] += 1
-            self.stats["connections_active"] = self._connected_count
+            self.stats.successful_connects += 1
+            self.stats.connections_active = self._connected_count
 
             self.logger.info(f"连接 '{connection_name}' 已建立 ({connection_uuid})")
 
@@ -249,8 +337,9 @@ class WebSocketMultiClient(WebSocketClientBase):
             connection_info = self.named_connections[connection_name]
             connection_info.connected = False
             connection_info.last_error = event.error
+            self._active_names.pop(connection_name, None)
             self._connected_count -= 1
-            self.stats["connections_active"] = max(0, self._connected_count)
+            self.stats.connections_active = max(0, self._connected_count)
 
             self.logger.info(
                 f"连接 '{connection_name}' 已断开 ({connection_uuid}): {event.error}"
@@ -264,7 +353,9 @@ class WebSocketMultiClient(WebSocketClientBase):
                 from .message import APIMessageBase
 
                 message = APIMessageBase.from_dict(message_data)
-                await self.multi_config.on_message(message, payload.get("meta", {}))
+                result = self.multi_config.on_message(message, payload.get("meta", {}))
+                if asyncio.iscoroutine(result):
+                    await result
 
     async def connect(self, name: Optional[str] = None) -> Dict[str, bool]:
         """连接指定的连接
@@ -298,7 +389,9 @@ class WebSocketMultiClient(WebSocketClientBase):
                 continue
 
             # 生成连接UUID
-            connection_uuid = f"multi_{conn_name}_{int(time.time() * 1000)}"
+            connection_uuid = (
+                f"multi_{conn_name}_{time.time_ns()}_{next(self._uuid_counter)}"
+            )
             conn_info.connection_uuid = connection_uuid
 
             # 创建连接配置
@@ -307,36 +400,21 @@ class WebSocketMultiClient(WebSocketClientBase):
                 api_key=conn_info.api_key,
                 platform=conn_info.platform,
                 connection_uuid=connection_uuid,
-                headers=conn_info.kwargs.get("headers", {}),
-                ping_interval=conn_info.kwargs.get("ping_interval", 20),
-                ping_timeout=conn_info.kwargs.get("ping_timeout", 10),
-                close_timeout=conn_info.kwargs.get("close_timeout", 10),
-                max_size=conn_info.kwargs.get("max_size", 104_857_600),
-                max_reconnect_attempts=conn_info.kwargs.get(
-                    "max_reconnect_attempts", 5
-                ),
-                reconnect_delay=conn_info.kwargs.get("reconnect_delay", 1.0),
-                # SSL配置
-                ssl_enabled=conn_info.kwargs.get("ssl_enabled", False),
-                ssl_verify=conn_info.kwargs.get("ssl_verify", True),
-                ssl_ca_certs=conn_info.kwargs.get("ssl_ca_certs"),
-                ssl_certfile=conn_info.kwargs.get("ssl_certfile"),
-                ssl_keyfile=conn_info.kwargs.get("ssl_keyfile"),
-                ssl_check_hostname=conn_info.kwargs.get("ssl_check_hostname", True),
+                **conn_info.config_kwargs,
             )
 
             # 建立UUID到名称的映射
             self.uuid_to_name[connection_uuid] = conn_name
 
             # 添加并启动连接
-            self.stats["connect_attempts"] += 1
+            self.stats.connect_attempts += 1
             success = await self.network_driver.add_connection(connection_config)
             if success:
                 await self.network_driver.connect(connection_uuid)
                 results[conn_name] = True
             else:
                 results[conn_name] = False
-                self.stats["failed_connects"] += 1
+                self.stats.failed_connects += 1
 
         return results
 
@@ -398,23 +476,28 @@ class WebSocketMultiClient(WebSocketClientBase):
             self.logger.warning(f"连接 '{connection_name}' 未建立")
             return False
 
+        now = time.time()
         message_package = {
             "ver": 1,
-            "msg_id": f"msg_{uuid.uuid4().hex[:12]}_{int(time.time())}",
+            "msg_id": f"msg_{uuid.uuid4().hex[:12]}_{int(now)}",
             "type": "sys_std",
             "meta": {
                 "sender_user": conn_info.api_key,
                 "platform": conn_info.platform,
-                "timestamp": time.time(),
+                "timestamp": now,
             },
             "payload": message.to_dict(),
         }
 
         success = await self.network_driver.send_message(
-            conn_info.connection_uuid, message_package
+            conn_info.connection_uuid,
+            message_package,
+            json_utils.dumps_for_wire(
+                conn_info.config_kwargs["wire_format"], message_package
+            ),
         )
         if success:
-            self.stats["messages_sent"] += 1
+            self.stats.messages_sent += 1
         else:
             self.logger.error(f"发送消息到连接 '{connection_name}' 失败")
 
@@ -442,26 +525,30 @@ class WebSocketMultiClient(WebSocketClientBase):
             self.logger.warning(f"连接 '{connection_name}' 未建立")
             return False
 
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
 
+        now = time.time()
         message_package = {
             "ver": 1,
-            "msg_id": f"custom_{uuid.uuid4().hex[:12]}_{int(time.time())}",
+            "msg_id": f"custom_{uuid.uuid4().hex[:12]}_{int(now)}",
             "type": message_type,
             "meta": {
                 "sender_user": conn_info.api_key,
                 "platform": conn_info.platform,
-                "timestamp": time.time(),
+                "timestamp": now,
             },
             "payload": payload,
         }
 
         success = await self.network_driver.send_message(
-            conn_info.connection_uuid, message_package
+            conn_info.connection_uuid,
+            message_package,
+            json_utils.dumps_for_wire(
+                conn_info.config_kwargs["wire_format"], message_package
+            ),
         )
         if success:
-            self.stats["messages_sent"] += 1
+            self.stats.messages_sent += 1
         else:
             self.logger.error(f"发送自定义消息到连接 '{connection_name}' 失败")
 
@@ -531,7 +618,7 @@ class WebSocketMultiClient(WebSocketClientBase):
         """获取统计信息"""
         network_stats = self.network_driver.get_stats()
         return {
-            **self.stats,
+            **self.stats.to_dict(),
             "network": network_stats,
             "connections_registered": len(self.named_connections),
             "connections_active": self._connected_count,
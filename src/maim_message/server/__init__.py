@@ -6,7 +6,7 @@ with the maim_message library.
 """
 
 # Core server classes
-from ..server_ws_api import WebSocketServer
+from ..server_ws_api import WebSocketServer, BroadcastResult
 
 # Import from the new message module (API-Server Version)
 from ..message import (
@@ -42,6 +42,7 @@ from ..ws_config import (
 __all__ = [
     # Core Server
     "WebSocketServer",
+    "BroadcastResult",
 
     # Core Message Classes (API-Server Version)
     "APIMessageBase",          # 主要消息类
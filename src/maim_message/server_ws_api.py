@@ -3,13 +3,34 @@
 from __future__ import annotations
 
 import asyncio
+import itertools
 import time
 import uuid
-from typing import Any, Callable, Dict, Optional, Set
+from collections import defaultdict
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from .server_ws_connection import ServerNetworkDriver, EventType, NetworkEvent
+from . import json_utils
+from .log_utils import is_debug_enabled
 from .message import APIMessageBase, BaseMessageInfo, Seg, MessageDim
-from .ws_config import ServerConfig, AuthResult
+from .ws_config import ServerConfig, AuthResult, config_field_names
+
+
+class BroadcastResult(NamedTuple):
+    """广播结果：成功连接数 / 目标连接总数"""
+
+    success_count: int
+    total: int
 
 
 class WebSocketServer:
@@ -18,6 +39,8 @@ class WebSocketServer:
     def __init__(self, config: Optional[ServerConfig] = None):
         # 使用配置或创建默认配置
         self.config = config or ServerConfig()
+        # 可更新的配置项集合，update_config时直接做集合查找
+        self._config_keys = config_field_names(self.config)
 
         # 验证和初始化配置
         if not self.config.validate():
@@ -38,29 +61,58 @@ class WebSocketServer:
             ssl_ca_certs=self.config.ssl_ca_certs,
             ssl_verify=self.config.ssl_verify,
             max_message_size=self.config.max_message_size,
+            compression=self.config.compression,
             custom_logger=self.config.custom_logger,
+            outbound_queue_size=self.config.outbound_queue_size,
         )
 
-        # 业务状态管理 - 三级映射表 Map<UserID, Map<Platform, Set<UUID>>>
-        self.user_connections: Dict[
-            str, Set[str]
-        ] = {}  # user_id -> set of connection_uuids
-        self.platform_connections: Dict[
-            str, Set[str]
-        ] = {}  # platform -> set of connection_uuids
+        # 业务状态管理 - 扁平索引 (user_id, platform) -> Set<UUID>，
+        # 以及用于枚举用户平台的 user_id -> Set<platform>
+        self.conns_by_user_platform: DefaultDict[Tuple[str, str], Set[str]] = (
+            defaultdict(set)
+        )
+        self.platforms_by_user: DefaultDict[str, Set[str]] = defaultdict(set)
+        # platform -> set of connection_uuids
+        self.platform_connections: DefaultDict[str, Set[str]] = defaultdict(set)
         self.connection_users: Dict[str, str] = {}  # connection_uuid -> user_id
         self.connection_metadata: Dict[
             str, Dict[str, Any]
         ] = {}  # connection_uuid -> metadata
+        # 连接认证时解析出的 api_key -> user_id，发送消息时直接查表，免去每次调用提取回调
+        self.api_key_users: Dict[str, str] = {}
+        self._api_key_refs: Dict[str, int] = {}  # api_key -> 活跃连接数
 
         # 消息去重机制
         self._processed_messages: Dict[str, float] = {}  # msg_id -> timestamp
         self._message_history_ttl = 3600  # 1小时过期
 
-        # 跨线程事件队列
-        self.event_queue: asyncio.Queue = asyncio.Queue()
+        # 下发消息的msg_id：实例随机前缀 + 单调计数，无需每条消息生成uuid4和读取时钟
+        self._msg_id_prefix = f"{uuid.uuid4().hex[:12]}_"
+        self._msg_ids = itertools.count(1)
+
+        # 跨线程事件队列，配置了容量时分发器处理不及时会对网络层形成背压
+        self.event_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=self.config.event_queue_max_size
+        )
         self.running = False
         self.dispatcher_task: Optional[asyncio.Task] = None
+        # 定期清理已完成handler任务和过期消息记录的协程
+        self._maintenance_task: Optional[asyncio.Task] = None
+        # 网络驱动器的服务器循环协程
+        self._driver_task: Optional[asyncio.Task] = None
+
+        # 事件类型 -> 处理方法，初始化时绑定一次，避免分发时的if/elif链
+        self._event_handlers: Dict[EventType, Callable[[NetworkEvent], Any]] = {
+            EventType.CONNECT: self._handle_connect_event,
+            EventType.DISCONNECT: self._handle_disconnect_event,
+            EventType.MESSAGE: self._handle_message_event,
+        }
+        # 消息类型 -> 处理方法（custom_*前缀消息单独路由到自定义处理器）
+        self._message_type_handlers: Dict[
+            str, Callable[[NetworkEvent, Dict[str, Any]], Any]
+        ] = {
+            "sys_std": self._handle_standard_message,
+        }
 
         # 统计信息
         self.stats = {
@@ -69,8 +121,6 @@ class WebSocketServer:
             "failed_auths": 0,
             "messages_processed": 0,
             "custom_messages_processed": 0,
-            "current_users": 0,
-            "current_connections": 0,
             "active_handler_tasks": 0,
             "duplicate_messages_ignored": 0,
         }
@@ -81,13 +131,18 @@ class WebSocketServer:
 
     def update_config(self, **kwargs) -> None:
         """更新配置"""
+        changed = False
         for key, value in kwargs.items():
-            if hasattr(self.config, key):
+            if key in self._config_keys:
                 setattr(self.config, key, value)
+                changed = True
                 self.logger.info(f"服务端配置更新: {key} = {value}")
             else:
                 self.logger.warning(f"无效的配置项: {key}")
 
+        if not changed:
+            return
+
         # 重新验证配置
         if not self.config.validate():
             raise ValueError("更新后的配置验证失败")
@@ -103,6 +158,12 @@ class WebSocketServer:
         """注销自定义消息处理器"""
         self.config.unregister_custom_handler(message_type)
 
+    def get_custom_handler(
+        self, message_type: str
+    ) -> Optional[Callable[[Dict[str, Any], Dict[str, Any]], Any]]:
+        """按完整消息类型查找自定义处理器（一次字典查找，无需遍历处理器表）"""
+        return self.config.custom_handlers.get(message_type)
+
     async def _cleanup_completed_tasks(self) -> None:
         """清理已完成的handler任务"""
         completed_tasks = {task for task in self.active_handler_tasks if task.done()}
@@ -117,7 +178,10 @@ class WebSocketServer:
                 self.logger.error(f"Handler task异常: {e}")
 
     async def _create_handler_task(self, coro, description: str = "handler") -> None:
-        """创建并管理handler任务"""
+        """创建并管理handler任务（同步回调在调用时已执行完毕，直接返回）"""
+        if not asyncio.iscoroutine(coro):
+            return
+
         self.task_counter += 1
         task_id = self.task_counter
 
@@ -175,7 +239,7 @@ class WebSocketServer:
 
     async def _handle_connect_event(self, event: NetworkEvent) -> None:
         """处理连接事件"""
-        metadata = event.metadata.to_dict()
+        metadata = event.metadata_dict
         connection_uuid = event.metadata.uuid
         platform = event.metadata.platform
 
@@ -195,65 +259,61 @@ class WebSocketServer:
         # 认证通过，注册连接 - 使用转换后的user_id
         user_id = auth_result.user_id
 
-        # 更新三级映射表 Map<UserID, Map<Platform, Set<UUID>>>
-        if user_id not in self.user_connections:
-            self.user_connections[user_id] = {}
-        if platform not in self.user_connections[user_id]:
-            self.user_connections[user_id][platform] = set()
-        self.user_connections[user_id][platform].add(connection_uuid)
+        # 更新用户-平台索引
+        self.conns_by_user_platform[(user_id, platform)].add(connection_uuid)
+        self.platforms_by_user[user_id].add(platform)
 
         # 平台索引映射
-        if platform not in self.platform_connections:
-            self.platform_connections[platform] = set()
         self.platform_connections[platform].add(connection_uuid)
 
         # 反向映射
         self.connection_users[connection_uuid] = user_id
         self.connection_metadata[connection_uuid] = metadata
 
-        # 更新统计
-        self.stats["current_users"] = len(self.user_connections)
-        self.stats["current_connections"] = len(self.connection_users)
+        api_key = event.metadata.api_key
+        self.api_key_users[api_key] = user_id
+        self._api_key_refs[api_key] = self._api_key_refs.get(api_key, 0) + 1
 
         self.logger.info(f"用户 {user_id} 从 {platform} 平台连接 ({connection_uuid})")
 
     async def _handle_disconnect_event(self, event: NetworkEvent) -> None:
         """处理断连事件"""
         connection_uuid = event.metadata.uuid
-        user_id = self.connection_users.get(connection_uuid)
+        # 直接弹出反向映射，一次查找完成判断与清理
+        user_id = self.connection_users.pop(connection_uuid, None)
 
         if user_id:
-            # 从三级映射表中移除
-            if user_id in self.user_connections:
-                metadata = self.connection_metadata.get(connection_uuid, {})
-                platform = metadata.get("platform", event.metadata.platform)
-
-                # 从用户->平台->连接映射中移除
-                if platform in self.user_connections[user_id]:
-                    self.user_connections[user_id][platform].discard(connection_uuid)
-                    if not self.user_connections[user_id][platform]:
-                        del self.user_connections[user_id][platform]
-
-                # 如果用户没有任何平台连接了，删除用户
-                if not self.user_connections[user_id]:
-                    del self.user_connections[user_id]
+            # 从用户-平台索引中移除，集合为空时删除键
+            metadata = self.connection_metadata.pop(connection_uuid, None) or {}
+            platform = metadata.get("platform", event.metadata.platform)
+            key = (user_id, platform)
+            conns = self.conns_by_user_platform.get(key)
+            if conns is not None:
+                conns.discard(connection_uuid)
+                if not conns:
+                    del self.conns_by_user_platform[key]
+                    platforms = self.platforms_by_user.get(user_id)
+                    if platforms is not None:
+                        platforms.discard(platform)
+                        # 如果用户没有任何平台连接了，删除用户
+                        if not platforms:
+                            del self.platforms_by_user[user_id]
 
             # 从平台索引中移除
-            if event.metadata.platform in self.platform_connections:
-                self.platform_connections[event.metadata.platform].discard(
-                    connection_uuid
-                )
-                if not self.platform_connections[event.metadata.platform]:
+            platform_conns = self.platform_connections.get(event.metadata.platform)
+            if platform_conns is not None:
+                platform_conns.discard(connection_uuid)
+                if not platform_conns:
                     del self.platform_connections[event.metadata.platform]
 
-            # 清理反向映射
-            del self.connection_users[connection_uuid]
-            if connection_uuid in self.connection_metadata:
-                del self.connection_metadata[connection_uuid]
-
-            # 更新统计
-            self.stats["current_users"] = len(self.user_connections)
-            self.stats["current_connections"] = len(self.connection_users)
+            # 该api_key的最后一个连接断开时失效缓存
+            api_key = event.metadata.api_key
+            refs = self._api_key_refs.get(api_key, 0) - 1
+            if refs > 0:
+                self._api_key_refs[api_key] = refs
+            else:
+                self._api_key_refs.pop(api_key, None)
+                self.api_key_users.pop(api_key, None)
 
             self.logger.info(f"用户 {user_id} 断开连接 ({connection_uuid})")
 
@@ -277,14 +337,15 @@ class WebSocketServer:
             if msg_id:
                 self._processed_messages[msg_id] = time.time()
 
-            # 处理标准消息
-            if message_type == "sys_std":
-                await self._handle_standard_message(event, message_data)
+            # 处理标准消息等已知类型
+            type_handler = self._message_type_handlers.get(message_type)
+            if type_handler is not None:
+                await type_handler(event, message_data)
             # 处理自定义消息
-            elif message_type.startswith("custom_"):
+            elif message_type[:7] == "custom_":
                 await self._handle_custom_message(event, message_type, message_data)
             # 忽略系统消息
-            elif message_type.startswith("sys_"):
+            elif message_type[:4] == "sys_":
                 self.logger.debug(f"忽略系统消息: {message_type}")
             else:
                 self.logger.warning(f"未知消息类型: {message_type}")
@@ -306,11 +367,12 @@ class WebSocketServer:
                 server_message = APIMessageBase.from_dict(payload)
             else:
                 # 包装成标准格式
+                now = time.time()
                 server_message = APIMessageBase(
                     message_info=BaseMessageInfo(
                         platform=event.metadata.platform,
-                        message_id=str(time.time()),
-                        time=time.time(),
+                        message_id=str(now),
+                        time=now,
                     ),
                     message_segment=Seg(type="text", data=str(payload)),
                     message_dim=MessageDim(
@@ -321,7 +383,7 @@ class WebSocketServer:
             # 异步调用消息处理器
             try:
                 await self._create_handler_task(
-                    self.config.on_message(server_message, event.metadata.to_dict()),
+                    self.config.on_message(server_message, event.metadata_dict),
                     f"标准消息处理器-{event.metadata.platform}",
                 )
             except Exception as e:
@@ -340,7 +402,7 @@ class WebSocketServer:
         if handler:
             try:
                 # 传递连接元数据给处理器
-                metadata = event.metadata.to_dict()
+                metadata = event.metadata_dict
                 await self._create_handler_task(
                     handler(message_data, metadata), f"自定义消息处理器-{message_type}"
                 )
@@ -356,39 +418,19 @@ class WebSocketServer:
             f"🔍 Event queue: {self.event_queue}, Running: {self.running}"
         )
 
-        while self.running:
+        while True:
             try:
-                self.logger.debug(
-                    f"⏳ Waiting for event from queue (current size: {self.event_queue.qsize()})"
-                )
-
                 queue_size = self.event_queue.qsize()
                 if queue_size > 100:
                     self.logger.warning(f"事件队列积压严重: {queue_size}")
 
-                event = await asyncio.wait_for(self.event_queue.get(), timeout=1.0)
-
-                self.logger.debug(
-                    f"📨 Received event: {event.event_type.value} for {event.uuid}"
-                )
+                # stop()放入None作为退出信号，此前入队的事件会先处理完
+                event = await self.event_queue.get()
+                if event is None:
+                    break
 
-                # 分发事件
-                if event.event_type == EventType.CONNECT:
-                    self.logger.debug(f"🔗 Processing CONNECT event for {event.uuid}")
-                    await self._handle_connect_event(event)
-                elif event.event_type == EventType.DISCONNECT:
-                    self.logger.debug(
-                        f"🔌 Processing DISCONNECT event for {event.uuid}"
-                    )
-                    await self._handle_disconnect_event(event)
-                elif event.event_type == EventType.MESSAGE:
-                    self.logger.debug(f"💬 Processing MESSAGE event for {event.uuid}")
-                    await self._handle_message_event(event)
+                await self._dispatch_event(event)
 
-            except asyncio.TimeoutError:
-                await self._cleanup_completed_tasks()
-                self._cleanup_old_messages()
-                continue
             except Exception as e:
                 self.logger.error(f"❌ Dispatcher error: {e}")
                 import traceback
@@ -397,6 +439,33 @@ class WebSocketServer:
 
         self.logger.info("Event dispatcher stopped")
 
+    async def _maintenance_loop(self) -> None:
+        """定期清理已完成的handler任务和过期的消息记录"""
+        while self.running:
+            await asyncio.sleep(1.0)
+            try:
+                await self._cleanup_completed_tasks()
+                self._cleanup_old_messages()
+            except Exception as e:
+                self.logger.error(f"❌ 定期清理错误: {e}")
+
+    async def _dispatch_event(self, event: NetworkEvent) -> None:
+        """分发单个事件到对应的处理方法"""
+        if is_debug_enabled(self.logger):
+            self.logger.debug(
+                f"📨 Processing {event.event_type.value} event for {event.uuid}"
+            )
+        handler = self._event_handlers.get(event.event_type)
+        if handler is not None:
+            await handler(event)
+
+    async def _inline_dispatch(self, event: NetworkEvent) -> None:
+        """内联分发入口（由网络驱动器直接调用），异常不影响连接的接收循环"""
+        try:
+            await self._dispatch_event(event)
+        except Exception as e:
+            self.logger.error(f"❌ Dispatcher error: {e}")
+
     def _cleanup_old_messages(self) -> None:
         now = time.time()
         expired = [
@@ -422,6 +491,49 @@ class WebSocketServer:
         if expired:
             self.logger.debug(f"已清理 {len(expired)} 条过期消息记录")
 
+    def _build_message_package(
+        self,
+        message_type: str,
+        payload: Dict[str, Any],
+        meta: Dict[str, Any],
+        id_prefix: str = "msg_",
+    ) -> Dict[str, Any]:
+        """构造下发消息包，meta中统一补充发送方和时间戳"""
+        return {
+            "ver": 1,
+            "msg_id": f"{id_prefix}{self._msg_id_prefix}{next(self._msg_ids)}",
+            "type": message_type,
+            "meta": {"sender_user": "server", **meta, "timestamp": time.time()},
+            "payload": payload,
+        }
+
+    async def _send_to_connections(
+        self, connection_uuids: Iterable[str], message_package: Dict[str, Any]
+    ) -> Tuple[Dict[str, bool], int]:
+        """并发发送同一消息包到多个连接，返回连接UUID到发送结果的映射及成功数"""
+        uuids = tuple(connection_uuids)
+        if not uuids:
+            return {}, 0
+        # 只序列化一次，所有JSON连接复用同一份字节；多个目标时文本帧连接也共用同一份解码结果
+        encoded = json_utils.dumps_bytes(message_package)
+        encoded_text = encoded.decode("utf-8") if len(uuids) > 1 else None
+        send = self.network_driver.send_message
+        outcomes = await asyncio.gather(
+            *(
+                send(conn_uuid, message_package, encoded, encoded_text)
+                for conn_uuid in uuids
+            ),
+            return_exceptions=True,
+        )
+        # 发送异常视为失败；生成结果的同时计数，调用方无需再遍历求和
+        results = {}
+        success_count = 0
+        for conn_uuid, outcome in zip(uuids, outcomes):
+            ok = outcome is True
+            results[conn_uuid] = ok
+            success_count += ok
+        return results, success_count
+
     async def send_message(self, message: APIMessageBase) -> Dict[str, bool]:
         """发送标准消息
 
@@ -432,73 +544,68 @@ class WebSocketServer:
             Dict[str, bool]: 连接UUID到发送结果的映射
         """
         results = {}
-        self.logger.info("🚀 WebSocketServer 开始发送消息")
+        # 逐条发送的过程日志只在DEBUG级别输出，避免热路径上的字符串格式化
+        debug = is_debug_enabled(self.logger)
 
         # 从消息中获取路由信息
         api_key = message.get_api_key()
         platform = message.get_platform()
-        self.logger.info(f"📨 消息路由信息: api_key={api_key}, platform={platform}")
-
-        # 使用 extract_user 回调获取用户ID
-        try:
-            self.logger.info("🔍 开始从消息元数据提取用户ID")
-            # 构造完整的metadata，包含消息的路由信息
-            message_metadata = {
-                "api_key": api_key,
-                "platform": platform,
-                "message_type": "outgoing",
-                "timestamp": time.time(),
-            }
-            target_user = await self.config.on_auth_extract_user(message_metadata)
-            self.logger.info(f"✅ 成功提取用户ID: {target_user} (从消息)")
-        except Exception as e:
-            self.logger.error(f"❌ 无法从消息元数据提取用户ID: {e}", exc_info=True)
+        if debug:
+            self.logger.debug(f"📨 消息路由信息: api_key={api_key}, platform={platform}")
+        if not api_key or not platform:
+            self.logger.warning(
+                f"❌ 消息缺少路由信息，无法发送: api_key={api_key}, platform={platform}"
+            )
             return results
 
-        # 使用三级映射表获取目标用户的连接
-        if target_user not in self.user_connections:
+        # 优先使用连接认证时缓存的用户ID，未命中时再调用 extract_user 回调
+        target_user = self.api_key_users.get(api_key)
+        if target_user is None:
+            try:
+                # 构造完整的metadata，包含消息的路由信息
+                message_metadata = {
+                    "api_key": api_key,
+                    "platform": platform,
+                    "message_type": "outgoing",
+                    "timestamp": time.time(),
+                }
+                target_user = await self.config.on_auth_extract_user(message_metadata)
+                if debug:
+                    self.logger.debug(f"✅ 成功提取用户ID: {target_user} (从消息)")
+            except Exception as e:
+                self.logger.error(
+                    f"❌ 无法从消息元数据提取用户ID: {e}", exc_info=True
+                )
+                return results
+
+        # 使用用户-平台索引获取目标用户的连接
+        if target_user not in self.platforms_by_user:
             self.logger.warning(f"❌ 用户 {target_user} 没有连接")
-            self.logger.info(f"📋 可用的用户: {list(self.user_connections.keys())}")
+            if debug:
+                self.logger.debug(f"📋 可用的用户: {list(self.platforms_by_user)}")
             return results
 
-        self.logger.info(f"✅ 找到用户 {target_user}，在 {platform} 平台获取其连接")
-
-        # 获取用户在指定平台的所有连接
-        user_platform_connections = self.user_connections[target_user]
-
-        # 记录当前连接状态
-        self.logger.info(
-            f"📊 当前连接状态: 已注册用户={len(self.user_connections)}, 用户连接映射={list(self.user_connections.keys())}"
+        # 获取目标平台的连接快照
+        target_connections = tuple(
+            self.conns_by_user_platform.get((target_user, platform), ())
         )
-
-        # 获取目标平台的连接
-        if platform not in user_platform_connections:
+        if not target_connections:
             self.logger.warning(f"用户 {target_user} 在平台 {platform} 没有连接")
             return results
-        target_connections = user_platform_connections[platform]
 
-        message_package = {
-            "ver": 1,
-            "msg_id": f"msg_{uuid.uuid4().hex[:12]}_{int(time.time())}",
-            "type": "sys_std",
-            "meta": {
-                "sender_user": "server",
-                "target_user": target_user,
-                "platform": platform,
-                "timestamp": time.time(),
-            },
-            "payload": message.to_dict(),
-        }
+        message_package = self._build_message_package(
+            "sys_std",
+            message.to_dict(),
+            {"target_user": target_user, "platform": platform},
+        )
 
-        # 发送到所有目标连接
-        for connection_uuid in target_connections:
-            success = await self.network_driver.send_message(
-                connection_uuid, message_package
-            )
-            results[connection_uuid] = success
+        # 并发发送到所有目标连接
+        results, success_count = await self._send_to_connections(
+            target_connections, message_package
+        )
 
         self.logger.info(
-            f"发送消息给用户 {target_user}: {sum(results.values())}/{len(results)} 连接成功"
+            f"发送消息给用户 {target_user}: {success_count}/{len(results)} 连接成功"
         )
 
         return results
@@ -512,57 +619,99 @@ class WebSocketServer:
         connection_uuid: Optional[str] = None,
     ) -> Dict[str, bool]:
         """发送自定义消息"""
-        results = {}
-
-        # 构造消息包
-        message_package = {
-            "ver": 1,
-            "msg_id": f"custom_{uuid.uuid4().hex[:12]}_{int(time.time())}",
-            "type": message_type,
-            "meta": {
-                "sender_user": "server",
-                "target_user": target_user,
-                "platform": target_platform,
-                "timestamp": time.time(),
-            },
-            "payload": payload,
-        }
-
-        # 确定目标连接
-        target_connections = set()
+        # 确定目标连接，在任何await之前取快照，避免发送期间连接变动影响遍历
+        target_connections: Tuple[str, ...] = ()
 
         if connection_uuid:
             # 发送到指定连接
-            target_connections.add(connection_uuid)
+            target_connections = (connection_uuid,)
         elif target_user:
-            # 发送到指定用户的所有连接
-            user_connections = self.user_connections.get(target_user, set())
+            # 发送到指定用户的所有连接（可按平台过滤）
             if target_platform:
-                # 过滤平台
-                platform_connections = self.platform_connections.get(
-                    target_platform, set()
+                target_connections = tuple(
+                    self.get_platform_connections(target_user, target_platform)
                 )
-                target_connections = user_connections & platform_connections
             else:
-                target_connections = user_connections
+                target_connections = tuple(self.get_user_connections(target_user))
 
-        # 发送消息
-        for conn_uuid in target_connections:
-            success = await self.network_driver.send_message(conn_uuid, message_package)
-            results[conn_uuid] = success
+        # 没有目标连接时不必构造消息包
+        if not target_connections:
+            return {}
 
+        # 构造消息包
+        message_package = self._build_message_package(
+            message_type,
+            payload,
+            {"target_user": target_user, "platform": target_platform},
+            id_prefix="custom_",
+        )
+
+        # 并发发送消息
+        results, _ = await self._send_to_connections(
+            target_connections, message_package
+        )
         return results
 
+    async def broadcast_message(
+        self, message: APIMessageBase, platform: Optional[str] = None
+    ) -> BroadcastResult:
+        """广播标准消息到所有已认证连接
+
+        Args:
+            message: 标准消息对象
+            platform: 仅广播到指定平台的连接（可选）
+
+        Returns:
+            BroadcastResult: 成功连接数和目标连接总数
+        """
+        # 取目标连接快照：已认证连接，或直接使用平台索引，无需逐个检查元数据
+        if platform is None:
+            target_connections = tuple(self.connection_users)
+        else:
+            target_connections = tuple(self.platform_connections.get(platform, ()))
+        total = len(target_connections)
+        if not total:
+            self.logger.info("广播消息: 没有可发送的连接")
+            return BroadcastResult(0, 0)
+
+        message_package = self._build_message_package(
+            "sys_std", message.to_dict(), {"broadcast": True, "platform": platform}
+        )
+
+        results, success_count = await self._send_to_connections(
+            target_connections, message_package
+        )
+
+        self.logger.info(f"广播消息: {success_count}/{total} 连接成功")
+        return BroadcastResult(success_count, total)
+
+    @property
+    def user_connections(self) -> Dict[str, Dict[str, Set[str]]]:
+        """user_id -> platform -> 连接UUID集合的嵌套视图
+
+        只读快照：每次访问按索引重新构建，修改返回值不会影响服务端的连接状态。
+        连接的增删由连接/断开事件维护，查询请使用get_user_connections等方法。
+        """
+        index = self.conns_by_user_platform
+        return {
+            user_id: {
+                platform: set(index.get((user_id, platform), ()))
+                for platform in platforms
+            }
+            for user_id, platforms in self.platforms_by_user.items()
+        }
+
     def get_user_connections(self, user_id: str) -> Set[str]:
-        """获取用户的所有连接"""
-        return self.user_connections.get(user_id, set())
+        """获取用户在所有平台的连接"""
+        index = self.conns_by_user_platform
+        platforms = self.platforms_by_user.get(user_id, ())
+        return set().union(
+            *(index.get((user_id, platform), ()) for platform in platforms)
+        )
 
     def get_platform_connections(self, user_id: str, platform: str) -> Set[str]:
         """获取指定用户在指定平台的所有连接"""
-        if user_id not in self.user_connections:
-            return set()
-        user_platform_connections = self.user_connections[user_id]
-        return user_platform_connections.get(platform, set())
+        return self.conns_by_user_platform.get((user_id, platform), set())
 
     def get_connection_info(self, connection_uuid: str) -> Optional[Dict[str, str]]:
         """获取连接对应的用户和平台信息"""
@@ -577,19 +726,29 @@ class WebSocketServer:
 
     def get_user_count(self) -> int:
         """获取当前用户数"""
-        return len(self.user_connections)
+        return len(self.platforms_by_user)
 
     def get_connection_count(self) -> int:
         """获取当前连接数"""
         return len(self.connection_users)
 
     def get_stats(self) -> Dict[str, Any]:
-        """获取统计信息"""
+        """获取统计信息，当前用户数和连接数在读取时根据索引计算"""
         network_stats = self.network_driver.get_stats()
-        return {**self.stats, "network": network_stats}
+        return {
+            **self.stats,
+            "current_users": len(self.platforms_by_user),
+            "current_connections": len(self.connection_users),
+            "event_queue_size": self.event_queue.qsize(),
+            "network": network_stats,
+        }
 
     async def start(self) -> None:
-        """启动服务端"""
+        """启动服务端
+
+        Raises:
+            RuntimeError: 网络驱动器未能开始监听（已清理本次启动创建的协程和缓存）
+        """
         if self.running:
             self.logger.warning("Server already running")
             return
@@ -612,18 +771,30 @@ class WebSocketServer:
                 f"Message cache initialized: TTL={self.config.message_cache_ttl}s, max_size={self.config.message_cache_max_size}"
             )
 
+        # 内联分发时事件不入队，分发器空闲等待退出信号
+        self.network_driver.event_callback = (
+            self._inline_dispatch if self.config.inline_dispatch else None
+        )
+
         # 启动事件分发器
         self.dispatcher_task = asyncio.create_task(self._dispatcher_loop())
+        self._maintenance_task = asyncio.create_task(self._maintenance_loop())
 
         # 并行启动网络驱动器
-        asyncio.create_task(self.network_driver.start(self.event_queue))
+        self._driver_task = asyncio.create_task(self.network_driver.start(self.event_queue))
 
         self.logger.info(
             f"WebSocket server starting on {self.network_driver.host}:{self.network_driver.port}"
         )
 
-        # 等待网络驱动器启动
-        await asyncio.sleep(1)
+        # 等待网络驱动器完成端口绑定
+        if not await self.network_driver.wait_ready(timeout=10.0):
+            self.logger.error("❌ WebSocket server failed to start listening")
+            await self.stop()
+            raise RuntimeError(
+                f"WebSocket server failed to listen on "
+                f"{self.network_driver.host}:{self.network_driver.port}"
+            )
 
         self.logger.info("WebSocket server started successfully")
 
@@ -635,18 +806,42 @@ class WebSocketServer:
         self.logger.info("Stopping WebSocket server...")
         self.running = False
 
-        # 1. 停止事件分发器协程
+        # 1. 停止事件分发器协程：放入退出信号，处理完已入队事件后自然退出，超时才取消
         if self.dispatcher_task and not self.dispatcher_task.done():
-            self.dispatcher_task.cancel()
             try:
-                await asyncio.wait_for(self.dispatcher_task, timeout=2.0)
-            except (asyncio.CancelledError, asyncio.TimeoutError):
-                pass
+                self.event_queue.put_nowait(None)
+                await asyncio.wait_for(asyncio.shield(self.dispatcher_task), timeout=2.0)
+            except (asyncio.QueueFull, asyncio.TimeoutError):
+                self.dispatcher_task.cancel()
+                try:
+                    await self.dispatcher_task
+                except asyncio.CancelledError:
+                    pass
         self.dispatcher_task = None
 
+        if self._maintenance_task and not self._maintenance_task.done():
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+        self._maintenance_task = None
+
         # 2. 停止网络驱动器（这会清理所有连接协程）
         await self.network_driver.stop()
 
+        # 服务器循环在驱动器停止后自行退出；启动失败或卡在绑定阶段时取消
+        if self._driver_task:
+            if not self._driver_task.done():
+                await asyncio.wait({self._driver_task}, timeout=1.0)
+            if not self._driver_task.done():
+                self._driver_task.cancel()
+                try:
+                    await self._driver_task
+                except asyncio.CancelledError:
+                    pass
+            self._driver_task = None
+
         # 3. 取消并等待所有handler任务完成
         if self.active_handler_tasks:
             self.logger.info(
@@ -679,9 +874,12 @@ class WebSocketServer:
                 break
 
         # 4. 清理所有状态和映射
-        self.user_connections.clear()
+        self.conns_by_user_platform.clear()
+        self.platforms_by_user.clear()
         self.platform_connections.clear()
         self.connection_users.clear()
+        self.api_key_users.clear()
+        self._api_key_refs.clear()
         if hasattr(self, "custom_handlers"):
             self.custom_handlers.clear()
 
@@ -699,8 +897,8 @@ class WebSocketServer:
             "network_driver_running": False,
             "event_queue_size": 0,
             "active_connections": 0,
-            "registered_users": len(self.user_connections),
-            "custom_handlers": len(getattr(self, "custom_handlers", {})),
+            "registered_users": len(self.platforms_by_user),
+            "custom_handlers": len(self.config.custom_handlers),
         }
 
         # 检查事件分发器状态
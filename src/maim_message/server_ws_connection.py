@@ -3,14 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import sys
 import threading
 import time
 import uuid
-from dataclasses import dataclass, asdict
-from typing import Any, Dict, Optional, Set
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, KeysView, Optional, Set
 from enum import Enum
 
 import uvicorn
@@ -18,9 +17,20 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 
 from .message_cache import MessageCache
+from . import json_utils
+from .ack_utils import ACK_STUB, AckBuilder
 
 logger = logging.getLogger(__name__)
 
+# 发送协程每次唤醒最多连续写出的消息数
+_WRITER_BATCH_SIZE = 32
+
+
+class _OutboundQueue(asyncio.Queue):
+    """连接发送队列，连接清理后标记为关闭，不再由发送协程消费"""
+
+    closed = False
+
 
 class EventType(Enum):
     """事件类型"""
@@ -40,24 +50,43 @@ class ConnectionMetadata:
     headers: Dict[str, str]
     client_ip: Optional[str] = None
     connected_at: float = 0.0
+    # to_dict()结果缓存，任意字段被重新赋值时失效
+    _dict_cache: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if self.connected_at == 0.0:
             self.connected_at = time.time()
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+
     def to_dict(self) -> Dict[str, Any]:
-        result = asdict(self)
-        # 清理headers中的敏感信息
-        if "authorization" in result["headers"]:
-            result["headers"] = {
-                k: v
-                for k, v in result["headers"].items()
-                if k.lower() != "authorization"
+        cached = self._dict_cache
+        if cached is None:
+            cached = {
+                "uuid": self.uuid,
+                "api_key": self.api_key,
+                "platform": self.platform,
+                # 清理headers中的敏感信息
+                "headers": {
+                    k: v
+                    for k, v in self.headers.items()
+                    if k.lower() != "authorization"
+                },
+                "client_ip": self.client_ip,
+                "connected_at": self.connected_at,
             }
-        return result
+            self._dict_cache = cached
+        # 每次返回独立副本，避免处理器修改影响缓存
+        return {**cached, "headers": cached["headers"].copy()}
 
 
-@dataclass
+# 每条消息都会创建事件对象，使用slots省去实例__dict__
+@dataclass(slots=True)
 class NetworkEvent:
     """网络事件"""
 
@@ -66,11 +95,22 @@ class NetworkEvent:
     metadata: ConnectionMetadata
     payload: Optional[Dict[str, Any]] = None
     timestamp: float = 0.0
+    # metadata_dict的缓存，同一事件的多个处理方法共用一份副本
+    _metadata_dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if self.timestamp == 0.0:
             self.timestamp = time.time()
 
+    @property
+    def metadata_dict(self) -> Dict[str, Any]:
+        """连接元数据的字典形式，每个事件只构造一次"""
+        if self._metadata_dict is None:
+            self._metadata_dict = self.metadata.to_dict()
+        return self._metadata_dict
+
 
 class ServerNetworkDriver:
     """服务端网络驱动器 - 线I/O层，负责WebSocket连接管理"""
@@ -86,7 +126,9 @@ class ServerNetworkDriver:
         ssl_ca_certs: str = None,
         ssl_verify: bool = False,
         max_message_size: int = 104_857_600,
+        compression: Optional[str] = "deflate",
         custom_logger: Optional[Any] = None,
+        outbound_queue_size: int = 0,
     ):
         self.host = host
         self.port = port
@@ -102,6 +144,12 @@ class ServerNetworkDriver:
         # WebSocket消息大小限制
         self.max_message_size = max_message_size
 
+        # WebSocket压缩配置（None表示禁用permessage-deflate）
+        self.compression = compression
+
+        # 每连接发送队列容量，大于0时由独立的发送协程串行写出，0表示直接发送
+        self.outbound_queue_size = outbound_queue_size
+
         print(
             f"[ServerNetworkDriver DEBUG] custom_logger type: {type(custom_logger)}, value: {custom_logger}",
             file=sys.stderr,
@@ -122,9 +170,24 @@ class ServerNetworkDriver:
         # 连接管理
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_metadata: Dict[str, ConnectionMetadata] = {}
+        # 使用二进制帧通信的连接，回复时沿用二进制帧
+        self.binary_connections: Set[str] = set()
+        # 握手时协商使用msgpack线格式的连接，双向都以msgpack二进制帧收发
+        self.msgpack_connections: Set[str] = set()
+        # ACK的msg_id：驱动器实例随机前缀 + 单调计数，避免每条ACK生成uuid4
+        self._ack_builder = AckBuilder("server_timestamp")
+        # 每连接发送队列及其发送协程（仅outbound_queue_size > 0时使用）
+        self._out_queues: Dict[str, _OutboundQueue] = {}
+        self._writer_tasks: Dict[str, asyncio.Task] = {}
 
         # 跨线程通信
         self.event_queue: Optional[asyncio.Queue] = None
+        # 队列已满时在后台等待入队的断开事件
+        self._pending_event_puts: Set[asyncio.Task] = set()
+        # 设置后事件直接交给该回调处理，不经过事件队列（内联分发）
+        self.event_callback: Optional[
+            Callable[[NetworkEvent], Awaitable[None]]
+        ] = None
         self.main_loop: Optional[asyncio.AbstractEventLoop] = None
         self.worker_thread: Optional[threading.Thread] = None
         self.running = False
@@ -145,6 +208,8 @@ class ServerNetworkDriver:
 
         # 优雅关闭支持
         self._shutdown_event = asyncio.Event()
+        # 服务器完成监听端口绑定（或启动失败退出）时置位，供业务层等待启动完成
+        self._ready = asyncio.Event()
         self._server_task: Optional[asyncio.Task] = None
         self._uvicorn_server: Optional[uvicorn.Server] = None
 
@@ -210,22 +275,36 @@ class ServerNetworkDriver:
         query_platform: str = None,
     ) -> None:
         """处理WebSocket连接的完整生命周期"""
-        # 1. 接受连接
-        await websocket.accept()
-        logger.info("[DEBUG] Connection accepted in _handle_connection")
+        # 1. 接受连接，客户端请求msgpack线格式且本端支持时在握手响应中确认
+        use_msgpack = (
+            json_utils.HAS_MSGPACK
+            and websocket.headers.get(json_utils.WIRE_FORMAT_HEADER) == "msgpack"
+        )
+        if use_msgpack:
+            await websocket.accept(
+                headers=[(json_utils.WIRE_FORMAT_HEADER.encode(), b"msgpack")]
+            )
+        else:
+            await websocket.accept()
 
         # 2. 提取连接元数据
         metadata = self._extract_metadata(
             websocket, query_api_key=query_api_key, query_platform=query_platform
         )
         connection_uuid = metadata.uuid
-        logger.info(f"[DEBUG] Connection UUID: {connection_uuid}")
-
         logger.info(f"New connection from {metadata.client_ip}: {connection_uuid}")
 
         # 3. 存储连接
         self.active_connections[connection_uuid] = websocket
         self.connection_metadata[connection_uuid] = metadata
+        if use_msgpack:
+            self.msgpack_connections.add(connection_uuid)
+        if self.outbound_queue_size > 0:
+            queue = _OutboundQueue(maxsize=self.outbound_queue_size)
+            self._out_queues[connection_uuid] = queue
+            self._writer_tasks[connection_uuid] = asyncio.create_task(
+                self._writer_loop(connection_uuid, queue)
+            )
 
         # 4. 更新统计
         self.stats["total_connections"] += 1
@@ -241,10 +320,15 @@ class ServerNetworkDriver:
             # 6. 消息处理循环 - 优雅处理服务器关闭
             while self.running and not self._shutdown_event.is_set():
                 try:
-                    # 接收文本消息，带超时以避免无限等待
-                    message = await asyncio.wait_for(
-                        websocket.receive_text(), timeout=1.0
-                    )
+                    # 接收文本或二进制消息，带超时以避免无限等待
+                    raw = await asyncio.wait_for(websocket.receive(), timeout=1.0)
+                    if raw["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(raw.get("code", 1000))
+
+                    message = raw.get("text")
+                    if message is None:
+                        message = raw.get("bytes")
+                        self.binary_connections.add(connection_uuid)
                     await self._handle_message(connection_uuid, message)
                 except asyncio.TimeoutError:
                     # 超时是正常的，继续循环检查running状态
@@ -305,13 +389,21 @@ class ServerNetworkDriver:
             # 更新统计
             self.stats["messages_received"] += 1
             if isinstance(message, str):
-                self.stats["bytes_received"] += len(message.encode("utf-8"))
+                self.stats["bytes_received"] += json_utils.utf8_len(message)
+            elif isinstance(message, bytes):
+                self.stats["bytes_received"] += len(message)
 
             # 解析JSON消息
-            if isinstance(message, str):
+            if isinstance(message, (str, bytes)):
                 try:
-                    data = json.loads(message)
-                except json.JSONDecodeError:
+                    if (
+                        isinstance(message, bytes)
+                        and connection_uuid in self.msgpack_connections
+                    ):
+                        data = json_utils.unpackb(message)
+                    else:
+                        data = json_utils.loads(message)
+                except json_utils.JSONDecodeError:
                     # 如果不是JSON，包装成JSON
                     data = {"raw_message": message}
             else:
@@ -331,19 +423,13 @@ class ServerNetworkDriver:
     async def _send_ack(self, connection_uuid: str, msg_id: str) -> None:
         """发送消息确认"""
         try:
-            ack_message = {
-                "ver": 1,
-                "msg_id": str(uuid.uuid4()),
-                "type": "sys_ack",
-                "meta": {
-                    "uuid": connection_uuid,
-                    "acked_msg_id": msg_id,
-                    "timestamp": time.time(),
-                },
-                "payload": {"status": "received", "server_timestamp": time.time()},
-            }
-
-            await self._send_raw_message(connection_uuid, ack_message)
+            now = time.time()
+            if connection_uuid in self.msgpack_connections:
+                ack_message = self._ack_builder.build(connection_uuid, msg_id, now)
+                await self._send_raw_message(connection_uuid, ack_message)
+            else:
+                encoded = self._ack_builder.encode_json(connection_uuid, msg_id, now)
+                await self._send_raw_message(connection_uuid, ACK_STUB, encoded)
 
             # 从缓存中移除已确认的消息
             if self.message_cache and self.message_cache.enabled:
@@ -387,10 +473,6 @@ class ServerNetworkDriver:
                     )
                     return
 
-            logger.debug(
-                f"✅ Found metadata for {connection_uuid}: api_key={metadata.api_key}, platform={metadata.platform}"
-            )
-
             event = NetworkEvent(
                 event_type=event_type,
                 uuid=connection_uuid,
@@ -398,31 +480,21 @@ class ServerNetworkDriver:
                 payload=payload,
             )
 
-            logger.debug(
-                f"🚀 Created NetworkEvent {event_type.value} for {connection_uuid}"
-            )
-
-            # 直接发送事件到队列（同一线程）
-            if self.event_queue:
-                logger.info(
-                    f"[DEBUG] Putting event to queue: {event_type.value} for {connection_uuid}"
-                )
-                print(
-                    f"[DEBUG] Putting event to queue: {event_type.value} for {connection_uuid}",
-                    file=sys.stderr,
-                    flush=True,
-                )
-                await self.event_queue.put(event)
-                queue_size = self.event_queue.qsize()
-                logger.info(f"[DEBUG] Event put successfully, queue size: {queue_size}")
-                print(
-                    f"[DEBUG] Event put successfully, queue size: {queue_size}",
-                    file=sys.stderr,
-                    flush=True,
-                )
+            # 逐事件的日志只在DEBUG级别输出，避免热路径上的字符串格式化
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
-                    f"✅ Event {event_type.value} for {connection_uuid} sent successfully"
+                    f"🚀 Created NetworkEvent {event_type.value} for {connection_uuid}"
                 )
+
+            # 内联分发：与业务层同一事件循环，直接调用处理方法
+            if self.event_callback is not None:
+                await self.event_callback(event)
+            # 直接发送事件到队列（同一线程）
+            elif self.event_queue:
+                if event_type == EventType.DISCONNECT:
+                    self._put_event_nowait(event)
+                else:
+                    await self.event_queue.put(event)
             else:
                 logger.warning(
                     f"⚠️ Event queue is None, dropping event {event_type.value} for {connection_uuid}"
@@ -436,6 +508,19 @@ class ServerNetworkDriver:
 
             logger.error(f"   Traceback: {traceback.format_exc()}")
 
+    def _put_event_nowait(self, event: NetworkEvent) -> None:
+        """不等待地投递事件
+
+        断开事件可能由分发器自身触发（如认证失败后断开连接），有界队列已满时
+        若在此等待，唯一的消费者会等待自己而死锁；改为在后台任务中入队。
+        """
+        try:
+            self.event_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            task = asyncio.create_task(self.event_queue.put(event))
+            self._pending_event_puts.add(task)
+            task.add_done_callback(self._pending_event_puts.discard)
+
     async def _cleanup_connection(self, connection_uuid: str) -> None:
         """清理连接资源"""
         try:
@@ -468,9 +553,14 @@ class ServerNetworkDriver:
                         f"Error sending disconnect event {connection_uuid}: {event_error}"
                     )
 
+            # 停止发送协程，未发出的消息转入缓存
+            self._stop_writer(connection_uuid)
+
             # 清理元数据
             if connection_uuid in self.connection_metadata:
                 del self.connection_metadata[connection_uuid]
+            self.binary_connections.discard(connection_uuid)
+            self.msgpack_connections.discard(connection_uuid)
 
             # 安全地更新统计
             if self.stats.get("current_connections", 0) > 0:
@@ -482,6 +572,60 @@ class ServerNetworkDriver:
                 f"Debug: connection cleanup {connection_uuid} error: {type(e).__name__}: {str(e)}"
             )
 
+    async def _writer_loop(self, connection_uuid: str, queue: _OutboundQueue) -> None:
+        """连接的发送协程：按入队顺序写出消息，每次唤醒尽量取出一批"""
+        send = self._send_raw_message
+        batch = []
+        sent = 0
+        try:
+            while True:
+                batch = [await queue.get()]
+                sent = 0
+                while len(batch) < _WRITER_BATCH_SIZE:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                for message, encoded, encoded_text in batch:
+                    # 发送失败时_send_raw_message会缓存消息并清理连接
+                    await send(connection_uuid, message, encoded, encoded_text)
+                    sent += 1
+                if queue.closed:
+                    return
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # 被取消时已取出但未确认发出的消息转入缓存（正在发送的一条可能重复，由msg_id去重）
+            for message, _, _ in batch[sent:]:
+                self._cache_unsent(connection_uuid, message)
+
+    def _stop_writer(self, connection_uuid: str) -> None:
+        """停止连接的发送协程，队列中未发出的消息转入缓存"""
+        task = self._writer_tasks.pop(connection_uuid, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+        queue = self._out_queues.pop(connection_uuid, None)
+        if queue is not None:
+            queue.closed = True
+            self._drain_out_queue(connection_uuid, queue)
+
+    def _drain_out_queue(self, connection_uuid: str, queue: _OutboundQueue) -> None:
+        """取出已关闭队列中的消息转入缓存，同时唤醒等待入队的发送方"""
+        while True:
+            try:
+                message = queue.get_nowait()[0]
+            except asyncio.QueueEmpty:
+                return
+            self._cache_unsent(connection_uuid, message)
+
+    def _cache_unsent(self, connection_uuid: str, message: Dict[str, Any]) -> None:
+        """未能发出的消息转入缓存，等待重连后重发"""
+        if self.message_cache and self.message_cache.enabled:
+            msg_id = message.get("msg_id", "")
+            if msg_id:
+                self.message_cache.add(msg_id, message, connection_uuid)
+
     async def _retry_cached_messages(self, connection_uuid: str) -> None:
         """重发指定连接的缓存消息"""
         if not self.message_cache or not self.message_cache.enabled:
@@ -504,50 +648,87 @@ class ServerNetworkDriver:
                 logger.debug(f"Retry error: {cached.message_id}, {e}")
 
     async def _send_raw_message(
-        self, connection_uuid: str, message: Dict[str, Any]
+        self,
+        connection_uuid: str,
+        message: Dict[str, Any],
+        encoded: Optional[bytes] = None,
+        encoded_text: Optional[str] = None,
     ) -> bool:
-        """发送原始消息到指定连接"""
+        """发送原始消息到指定连接
+
+        encoded为预先序列化好的JSON UTF-8字节（如广播时只序列化一次），提供时JSON连接直接复用，
+        encoded_text为其解码后的字符串，提供时文本帧连接不再逐个解码；msgpack连接仍按message重新编码。
+        """
         if connection_uuid not in self.active_connections:
             logger.warning(f"Connection {connection_uuid} not found")
-
-            if self.message_cache and self.message_cache.enabled:
-                msg_id = message.get("msg_id", "")
-                if msg_id:
-                    self.message_cache.add(msg_id, message, connection_uuid)
+            self._cache_unsent(connection_uuid, message)
             return False
 
         websocket = self.active_connections[connection_uuid]
 
         try:
-            message_str = json.dumps(message)
-            await websocket.send_text(message_str)
+            # 只序列化一次为UTF-8字节，文本帧再解码，避免序列化为str后重复编码统计字节数
+            if connection_uuid in self.msgpack_connections:
+                message_bytes = json_utils.packb(message)
+                await websocket.send_bytes(message_bytes)
+            else:
+                message_bytes = (
+                    encoded if encoded is not None else json_utils.dumps_bytes(message)
+                )
+                if connection_uuid in self.binary_connections:
+                    await websocket.send_bytes(message_bytes)
+                else:
+                    await websocket.send_text(
+                        encoded_text
+                        if encoded_text is not None
+                        else message_bytes.decode("utf-8")
+                    )
 
             # 更新统计
             self.stats["messages_sent"] += 1
-            self.stats["bytes_sent"] += len(message_str.encode("utf-8"))
+            self.stats["bytes_sent"] += len(message_bytes)
 
             return True
 
         except Exception as e:
             logger.error(f"Error sending message to {connection_uuid}: {e}")
-
-            if self.message_cache and self.message_cache.enabled:
-                msg_id = message.get("msg_id", "")
-                if msg_id:
-                    self.message_cache.add(msg_id, message, connection_uuid)
-
+            self._cache_unsent(connection_uuid, message)
             await self._cleanup_connection(connection_uuid)
             return False
 
-    async def send_message(self, connection_uuid: str, message: Dict[str, Any]) -> bool:
-        """发送消息到指定连接（业务层接口）"""
-        return await self._send_raw_message(connection_uuid, message)
+    async def send_message(
+        self,
+        connection_uuid: str,
+        message: Dict[str, Any],
+        encoded: Optional[bytes] = None,
+        encoded_text: Optional[str] = None,
+    ) -> bool:
+        """发送消息到指定连接（业务层接口）
+
+        encoded为可选的预序列化JSON字节，encoded_text为其解码后的字符串（多连接共用时传入）。
+        启用发送队列时消息入队即返回True，队列满时等待发送协程腾出空间；
+        等待期间连接被清理则消息转入缓存并返回False。
+        """
+        queue = self._out_queues.get(connection_uuid)
+        if queue is None:
+            return await self._send_raw_message(
+                connection_uuid, message, encoded, encoded_text
+            )
+        await queue.put((message, encoded, encoded_text))
+        if queue.closed:
+            # 发送协程已停止，刚入队的消息不会再被发出
+            self._drain_out_queue(connection_uuid, queue)
+            return False
+        return True
 
     async def broadcast_message(
         self, message: Dict[str, Any], filter_func: Optional[callable] = None
     ) -> Dict[str, bool]:
         """广播消息到所有连接"""
         results = {}
+        # 所有JSON连接共用同一份序列化结果，文本帧连接共用同一份解码结果
+        encoded = json_utils.dumps_bytes(message)
+        encoded_text = encoded.decode("utf-8")
 
         for connection_uuid, websocket in list(self.active_connections.items()):
             if filter_func:
@@ -555,7 +736,9 @@ class ServerNetworkDriver:
                 if not filter_func(metadata):
                     continue
 
-            success = await self._send_raw_message(connection_uuid, message)
+            success = await self.send_message(
+                connection_uuid, message, encoded, encoded_text
+            )
             results[connection_uuid] = success
 
         return results
@@ -585,9 +768,9 @@ class ServerNetworkDriver:
         """获取当前连接数"""
         return len(self.active_connections)
 
-    def get_connection_list(self) -> Set[str]:
-        """获取所有连接UUID"""
-        return set(self.active_connections.keys())
+    def get_connection_list(self) -> KeysView[str]:
+        """获取所有连接UUID（实时视图，需要快照时请用set()复制）"""
+        return self.active_connections.keys()
 
     def get_connection_metadata(
         self, connection_uuid: str
@@ -601,6 +784,8 @@ class ServerNetworkDriver:
 
     async def _server_loop_run(self, event_queue: asyncio.Queue) -> None:
         """在主事件循环中运行服务器"""
+        # 持有本次启动的就绪事件，stop()重置后不会误触发下一次启动的等待者
+        ready = self._ready
         try:
             # 设置事件队列引用
             self.event_queue = event_queue
@@ -612,6 +797,7 @@ class ServerNetworkDriver:
                 "port": self.port,
                 "log_level": "warning",  # 减少uvicorn日志
                 "ws_max_size": self.max_message_size,
+                "ws_per_message_deflate": self.compression is not None,
             }
 
             # 添加SSL配置
@@ -650,7 +836,17 @@ class ServerNetworkDriver:
             self.running = True
 
             # 创建服务器任务但不直接await，这样可以控制关闭
-            self._server_task = asyncio.create_task(self._uvicorn_server.serve())
+            self._server_task = asyncio.create_task(self._serve(self._uvicorn_server))
+
+            # uvicorn未提供启动完成事件，轮询started标志直到绑定完成或服务器任务退出
+            while not self._uvicorn_server.started and not self._server_task.done():
+                await asyncio.sleep(0.01)
+            ready.set()
+
+            if not self._uvicorn_server.started:
+                # 服务器任务在启动阶段就已退出（如端口被占用），取出其异常
+                await self._server_task
+                return
 
             # 等待关闭信号
             await self._shutdown_event.wait()
@@ -673,8 +869,33 @@ class ServerNetworkDriver:
             logger.error(f"Traceback: {traceback.format_exc()}")
         finally:
             self.running = False
+            # 启动阶段被取消时uvicorn服务器任务可能仍在运行
+            if self._server_task and not self._server_task.done():
+                self._server_task.cancel()
             self._uvicorn_server = None
             self._server_task = None
+            # 启动失败时也要唤醒等待者
+            ready.set()
+
+    @staticmethod
+    async def _serve(server: uvicorn.Server) -> None:
+        """运行uvicorn服务器
+
+        uvicorn启动失败时会调用sys.exit()，这里转换为普通异常，避免终止整个进程
+        """
+        try:
+            await server.serve()
+        except SystemExit as e:
+            raise RuntimeError(f"uvicorn exited during startup (code {e.code})") from None
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """等待服务器开始监听，返回是否启动成功"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        server = self._uvicorn_server
+        return server is not None and server.started
 
     async def start(self, event_queue: asyncio.Queue) -> None:
         """启动网络驱动器"""
@@ -705,6 +926,10 @@ class ServerNetworkDriver:
     async def stop(self) -> None:
         """停止网络驱动器 - 完全清理所有协程"""
         if not self.running:
+            # 启动失败时服务器循环已自行退出，仍需重置就绪事件并停止消息缓存
+            self._ready = asyncio.Event()
+            if self.message_cache:
+                await self.message_cache.stop()
             return
 
         logger.info("Stopping network driver...")
@@ -752,6 +977,15 @@ class ServerNetworkDriver:
                 except Exception:
                     pass
 
+        # 停止所有发送协程
+        for connection_uuid in list(self._writer_tasks):
+            self._stop_writer(connection_uuid)
+
+        # 取消仍在等待入队的断开事件
+        for task in list(self._pending_event_puts):
+            task.cancel()
+        self._pending_event_puts.clear()
+
         # 4. 请求uvicorn服务器优雅退出
         if self._uvicorn_server:
             self._uvicorn_server.should_exit = True
@@ -776,6 +1010,7 @@ class ServerNetworkDriver:
         self.event_queue = None
         self.main_loop = None
         self._shutdown_event = asyncio.Event()
+        self._ready = asyncio.Event()
 
         # 7. 重置统计信息
         self.stats = {
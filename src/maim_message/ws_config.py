@@ -3,14 +3,76 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Callable, Dict, Optional, Set
-from dataclasses import dataclass, field
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Mapping, NamedTuple, Optional
+from dataclasses import dataclass, field, fields
 from abc import ABC, abstractmethod
 
 from .message import APIMessageBase
+from . import json_utils
 
 logger = logging.getLogger(__name__)
 
+# 自定义消息类型的统一前缀
+CUSTOM_PREFIX = "custom_"
+_CUSTOM_PREFIX_LEN = len(CUSTOM_PREFIX)
+
+
+def normalize_custom_type(message_type: str) -> str:
+    """补全自定义消息类型的custom_前缀，已带前缀时原样返回"""
+    if message_type[:_CUSTOM_PREFIX_LEN] == CUSTOM_PREFIX:
+        return message_type
+    return CUSTOM_PREFIX + message_type
+
+
+def config_field_names(config: Any) -> FrozenSet[str]:
+    """可通过update_*config更新的配置项：构造参数对应的字段，不含内部缓存字段"""
+    return frozenset(f.name for f in fields(config) if f.init)
+
+
+def websocket_scheme(url: str) -> Optional[str]:
+    """解析WebSocket URL的协议，返回"ws"或"wss"，不是WebSocket URL时返回None"""
+    if url[:6] == "wss://":
+        return "wss"
+    if url[:5] == "ws://":
+        return "ws"
+    return None
+
+
+# 默认回调在模块级定义一次，get_default_*只返回已有函数（需要读取配置的用partial绑定），
+# 不必每次调用都重新创建闭包
+async def _default_auth(metadata: Dict[str, Any]) -> bool:
+    """默认认证：总是通过，无需API Key验证"""
+    logger.info("默认认证通过：无需API Key验证")
+    return True
+
+
+async def _default_extract_user(metadata: Dict[str, Any]) -> str:
+    """默认用户标识提取：所有用户都使用默认用户标识"""
+    logger.debug("默认用户标识提取：使用系统默认用户")
+    return "sys_default"
+
+
+async def _default_server_message_handler(
+    config: ServerConfig, message: APIMessageBase, metadata: Dict[str, Any]
+) -> None:
+    """服务端默认消息处理器：记录消息"""
+    # 日志级别不输出INFO时跳过消息内容的格式化
+    if config.enable_message_log and logger.isEnabledFor(logging.INFO):
+        logger.info(
+            f"收到消息: {message.message_segment.data} "
+            f"from {message.get_api_key()}"
+        )
+
+
+async def _default_client_message_handler(
+    config: Any, message: APIMessageBase, metadata: Dict[str, Any]
+) -> None:
+    """客户端默认消息处理器：记录消息"""
+    if config.enable_message_log and logger.isEnabledFor(logging.INFO):
+        logger.info(f"收到消息: {message.message_segment.data}")
+
 
 class ConfigValidator(ABC):
     """配置验证器基类"""
@@ -21,11 +83,16 @@ class ConfigValidator(ABC):
         pass
 
     @abstractmethod
-    def get_missing_fields(self) -> Set[str]:
+    def get_missing_fields(self) -> FrozenSet[str]:
         """获取缺失的必填字段"""
         pass
 
 
+# 各配置的必填字段（值为空即视为缺失）
+_SERVER_REQUIRED_FIELDS = ()
+_CLIENT_REQUIRED_FIELDS = ("url", "api_key")
+
+
 @dataclass
 class ServerConfig(ConfigValidator):
     """WebSocket服务端配置类"""
@@ -45,6 +112,18 @@ class ServerConfig(ConfigValidator):
     # WebSocket消息大小配置
     max_message_size: int = 104_857_600
 
+    # WebSocket压缩配置（"deflate"启用permessage-deflate，None禁用，小消息场景建议禁用）
+    compression: Optional[str] = "deflate"
+
+    # 内联分发：网络驱动器直接调用事件处理方法，不经过事件队列
+    inline_dispatch: bool = False
+
+    # 每连接发送队列容量：大于0时每个连接由独立协程按序写出消息，0表示直接发送
+    outbound_queue_size: int = 0
+
+    # 事件队列容量：大于0时分发器处理不及时网络层入队会等待（背压），0表示不限制
+    event_queue_max_size: int = 0
+
     # 回调函数配置
     on_auth: Optional[Callable[[Dict[str, Any]], bool]] = None
     on_auth_extract_user: Optional[Callable[[Dict[str, Any]], str]] = None
@@ -71,6 +150,11 @@ class ServerConfig(ConfigValidator):
     message_cache_max_size: int = 1000
     message_cache_cleanup_interval: float = 60.0
 
+    # get_default_message_handler()首次调用后缓存的默认处理器
+    _default_message_handler: Optional[Callable] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def validate(self) -> bool:
         """验证配置是否有效"""
         missing = self.get_missing_fields()
@@ -79,14 +163,13 @@ class ServerConfig(ConfigValidator):
             return False
         return True
 
-    def get_missing_fields(self) -> Set[str]:
+    def get_missing_fields(self) -> FrozenSet[str]:
         """获取缺失的必填字段"""
-        missing = set()
-
         # 现在所有回调都有默认值，所以没有必填字段
-        # 如果需要，可以根据业务需求添加必填字段验证
-
-        return missing
+        # 如果需要，可以在_SERVER_REQUIRED_FIELDS中添加必填字段
+        return frozenset(
+            name for name in _SERVER_REQUIRED_FIELDS if not getattr(self, name)
+        )
 
     def get_logger(self):
         """获取配置的logger，如果设置了custom_logger则使用它，否则使用默认logger"""
@@ -99,43 +182,30 @@ class ServerConfig(ConfigValidator):
 
     def get_default_auth_handler(self) -> Callable[[Dict[str, Any]], bool]:
         """获取默认认证处理器"""
-
-        async def default_auth(metadata: Dict[str, Any]) -> bool:
-            """默认认证：总是通过，无需API Key验证"""
-            logger.info("默认认证通过：无需API Key验证")
-            return True
-
-        return default_auth
+        return _default_auth
 
     def get_default_user_extractor(self) -> Callable[[Dict[str, Any]], str]:
         """获取默认用户标识提取器"""
-
-        async def default_extract_user(metadata: Dict[str, Any]) -> str:
-            """默认用户标识提取：所有用户都使用默认用户标识"""
-            logger.debug("默认用户标识提取：使用系统默认用户")
-            return "sys_default"
-
-        return default_extract_user
+        return _default_extract_user
 
     def get_default_message_handler(
         self,
     ) -> Callable[[APIMessageBase, Dict[str, Any]], None]:
         """获取默认消息处理器"""
-
-        async def default_message_handler(
-            message: APIMessageBase, metadata: Dict[str, Any]
-        ) -> None:
-            """默认消息处理器：记录消息"""
-            if self.enable_message_log:
-                logger.info(
-                    f"收到消息: {message.message_segment.data} "
-                    f"from {message.get_api_key()}"
-                )
-
-        return default_message_handler
+        if self._default_message_handler is None:
+            self._default_message_handler = partial(_default_server_message_handler, self)
+        return self._default_message_handler
 
     def ensure_defaults(self) -> None:
         """确保所有必填的回调都有默认值"""
+        # 重复设置配置时回调通常已齐全，一次判断即可返回
+        if (
+            self.on_auth is not None
+            and self.on_auth_extract_user is not None
+            and self.on_message is not None
+        ):
+            return
+
         if self.on_auth is None:
             self.on_auth = self.get_default_auth_handler()
             logger.info("使用默认认证处理器")
@@ -152,18 +222,25 @@ class ServerConfig(ConfigValidator):
         self, message_type: str, handler: Callable[[Dict[str, Any]], None]
     ) -> None:
         """注册自定义消息处理器"""
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
         self.custom_handlers[message_type] = handler
         logger.info(f"注册自定义处理器: {message_type}")
 
     def unregister_custom_handler(self, message_type: str) -> None:
         """注销自定义消息处理器"""
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
         self.custom_handlers.pop(message_type, None)
         logger.info(f"注销自定义处理器: {message_type}")
 
+    @property
+    def handlers_view(self) -> Mapping[str, Callable[[Dict[str, Any]], None]]:
+        """自定义处理器的只读视图，修改请使用register/unregister_custom_handler"""
+        return MappingProxyType(self.custom_handlers)
+
+
+# ClientConfig.validate()依赖的字段，修改时使缓存的验证结果失效
+_CLIENT_VALIDATED_FIELDS = frozenset({"url", "api_key", "wire_format"})
+
 
 @dataclass
 class ClientConfig(ConfigValidator):
@@ -197,6 +274,25 @@ class ClientConfig(ConfigValidator):
     # 消息大小配置
     max_size: int = 104_857_600
 
+    # 接收帧缓冲队列长度与发送缓冲高水位（字节），None使用websockets默认值
+    max_queue: Optional[int] = None
+    write_limit: Optional[int] = None
+
+    # WebSocket压缩配置（"deflate"启用permessage-deflate，None禁用，小消息场景建议禁用）
+    compression: Optional[str] = "deflate"
+
+    # 使用二进制帧发送JSON（需要服务端支持二进制帧，服务端会以相同帧类型回复）
+    binary_frames: bool = False
+
+    # 线格式："json"或"msgpack"（需双方安装msgpack，服务端未确认时自动回退为JSON）
+    wire_format: str = "json"
+
+    # 网络驱动器是否运行在独立工作线程中；False时直接运行在调用start()的事件循环中
+    use_worker_thread: bool = True
+
+    # 事件队列容量：大于0时业务层处理跟不上会拒收新到的消息事件（不确认，由服务端缓存重发），0表示不限制
+    event_queue_max_size: int = 10000
+
     # 回调函数配置
     on_message: Optional[Callable[[APIMessageBase, Dict[str, Any]], None]] = None
 
@@ -224,6 +320,29 @@ class ClientConfig(ConfigValidator):
     # HTTP Headers
     headers: Dict[str, str] = field(default_factory=dict)
 
+    # 上次validate()是否通过，相关字段修改后重置
+    _validated: bool = field(default=False, init=False, repr=False, compare=False)
+
+    # get_default_message_handler()首次调用后缓存的默认处理器
+    _default_message_handler: Optional[Callable] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # url的协议（"ws"/"wss"/None），构造和修改url时计算，validate()无需重新解析
+    _url_scheme: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_url_scheme", websocket_scheme(self.url or ""))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in _CLIENT_VALIDATED_FIELDS:
+            object.__setattr__(self, "_validated", False)
+            if name == "url":
+                object.__setattr__(self, "_url_scheme", websocket_scheme(value or ""))
+
     def get_logger(self):
         """获取配置的logger，如果设置了custom_logger则使用它，否则使用默认logger"""
         if self.custom_logger is not None:
@@ -234,43 +353,43 @@ class ClientConfig(ConfigValidator):
         return logging.getLogger(__name__)
 
     def validate(self) -> bool:
-        """验证配置是否有效"""
+        """验证配置是否有效（通过后缓存结果，直到相关字段被修改）"""
+        if self._validated:
+            return True
+
         missing = self.get_missing_fields()
         if missing:
             logger.error(f"客户端配置缺失必填字段: {missing}")
             return False
 
         # 验证URL格式
-        if not (self.url.startswith("ws://") or self.url.startswith("wss://")):
+        if self._url_scheme is None:
             logger.error("客户端配置错误: URL必须以ws://或wss://开头")
             return False
 
+        if self.wire_format not in json_utils.WIRE_FORMATS:
+            logger.error(f"客户端配置错误: 不支持的线格式 {self.wire_format}")
+            return False
+        if self.wire_format == "msgpack" and not json_utils.HAS_MSGPACK:
+            logger.error("客户端配置错误: 使用msgpack线格式需要安装msgpack")
+            return False
+
+        self._validated = True
         return True
 
-    def get_missing_fields(self) -> Set[str]:
+    def get_missing_fields(self) -> FrozenSet[str]:
         """获取缺失的必填字段"""
-        missing = set()
-
-        if not self.url:
-            missing.add("url")
-        if not self.api_key:
-            missing.add("api_key")
-
-        return missing
+        return frozenset(
+            name for name in _CLIENT_REQUIRED_FIELDS if not getattr(self, name)
+        )
 
     def get_default_message_handler(
         self,
     ) -> Callable[[APIMessageBase, Dict[str, Any]], None]:
         """获取默认消息处理器"""
-
-        async def default_message_handler(
-            message: APIMessageBase, metadata: Dict[str, Any]
-        ) -> None:
-            """默认消息处理器：记录消息"""
-            if self.enable_message_log:
-                logger.info(f"收到消息: {message.message_segment.data}")
-
-        return default_message_handler
+        if self._default_message_handler is None:
+            self._default_message_handler = partial(_default_client_message_handler, self)
+        return self._default_message_handler
 
     def ensure_defaults(self) -> None:
         """确保所有必填的回调都有默认值"""
@@ -279,30 +398,31 @@ class ClientConfig(ConfigValidator):
             logger.info("使用默认消息处理器")
 
         # 设置默认headers
-        default_headers = {"x-apikey": self.api_key, "x-platform": self.platform}
-        for key, value in default_headers.items():
-            if key not in self.headers:
-                self.headers[key] = value
+        self.headers.setdefault("x-apikey", self.api_key)
+        self.headers.setdefault("x-platform", self.platform)
 
     def register_custom_handler(
         self, message_type: str, handler: Callable[[Dict[str, Any]], None]
     ) -> None:
         """注册自定义消息处理器"""
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
         self.custom_handlers[message_type] = handler
         logger.info(f"注册自定义处理器: {message_type}")
 
     def unregister_custom_handler(self, message_type: str) -> None:
         """注销自定义消息处理器"""
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
         self.custom_handlers.pop(message_type, None)
         logger.info(f"注销自定义处理器: {message_type}")
 
+    @property
+    def handlers_view(self) -> Mapping[str, Callable[[Dict[str, Any]], None]]:
+        """自定义处理器的只读视图，修改请使用register/unregister_custom_handler"""
+        return MappingProxyType(self.custom_handlers)
 
-@dataclass
-class AuthResult:
+
+# 每次连接认证都会创建，使用NamedTuple构造和属性访问更轻量
+class AuthResult(NamedTuple):
     """认证结果"""
 
     success: bool
@@ -316,7 +436,9 @@ class ConfigManager:
     def __init__(self):
         self._server_config: Optional[ServerConfig] = None
         self._client_config: Optional[ClientConfig] = None
-        self._config_validators: Dict[str, ConfigValidator] = {}
+        # 可更新的配置项集合，设置配置时计算一次，更新时直接做集合查找
+        self._server_config_keys: FrozenSet[str] = frozenset()
+        self._client_config_keys: FrozenSet[str] = frozenset()
 
     def set_server_config(self, config: ServerConfig) -> None:
         """设置服务端配置"""
@@ -324,7 +446,7 @@ class ConfigManager:
             raise ValueError("服务端配置验证失败")
         config.ensure_defaults()
         self._server_config = config
-        self._config_validators["server"] = config
+        self._server_config_keys = config_field_names(config)
         logger.info("服务端配置已设置")
 
     def set_client_config(self, config: ClientConfig) -> None:
@@ -333,7 +455,7 @@ class ConfigManager:
             raise ValueError("客户端配置验证失败")
         config.ensure_defaults()
         self._client_config = config
-        self._config_validators["client"] = config
+        self._client_config_keys = config_field_names(config)
         logger.info("客户端配置已设置")
 
     def get_server_config(self) -> Optional[ServerConfig]:
@@ -349,13 +471,20 @@ class ConfigManager:
         if self._server_config is None:
             raise ValueError("服务端配置未设置")
 
+        updated = []
         for key, value in kwargs.items():
-            if hasattr(self._server_config, key):
+            if key in self._server_config_keys:
                 setattr(self._server_config, key, value)
-                logger.info(f"服务端配置更新: {key} = {value}")
+                updated.append(key)
             else:
                 logger.warning(f"无效的服务端配置项: {key}")
 
+        if not updated:
+            return
+        # 汇总为一条日志，不逐项输出；INFO未开启时不拼接字符串
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"服务端配置更新: {', '.join(updated)}")
+
         # 重新验证配置
         if not self._server_config.validate():
             raise ValueError("更新后的服务端配置验证失败")
@@ -365,13 +494,20 @@ class ConfigManager:
         if self._client_config is None:
             raise ValueError("客户端配置未设置")
 
+        updated = []
         for key, value in kwargs.items():
-            if hasattr(self._client_config, key):
+            if key in self._client_config_keys:
                 setattr(self._client_config, key, value)
-                logger.info(f"客户端配置更新: {key} = {value}")
+                updated.append(key)
             else:
                 logger.warning(f"无效的客户端配置项: {key}")
 
+        if not updated:
+            return
+        # 汇总为一条日志，不逐项输出；INFO未开启时不拼接字符串
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"客户端配置更新: {', '.join(updated)}")
+
         # 重新验证配置
         if not self._client_config.validate():
             raise ValueError("更新后的客户端配置验证失败")
@@ -379,7 +515,13 @@ class ConfigManager:
     def validate_all_configs(self) -> bool:
         """验证所有配置"""
         all_valid = True
-        for name, config in self._config_validators.items():
+        # 只有服务端和客户端两项，直接引用已设置的配置，无需额外的注册表
+        for name, config in (
+            ("server", self._server_config),
+            ("client", self._client_config),
+        ):
+            if config is None:
+                continue
             if not config.validate():
                 logger.error(f"{name}配置验证失败")
                 all_valid = False
@@ -410,6 +552,10 @@ def create_server_config(**kwargs) -> ServerConfig:
         ssl_keyfile: SSL私钥文件路径 (ssl_enabled=True时必填)
         ssl_ca_certs: CA证书文件路径 (可选)
         ssl_verify: 是否验证客户端证书 (默认: False)
+        compression: WebSocket压缩方式，None表示禁用 (默认: "deflate")
+        inline_dispatch: 是否跳过事件队列直接分发事件 (默认: False)
+        outbound_queue_size: 每连接发送队列容量，0表示不使用队列直接发送 (默认: 0)
+        event_queue_max_size: 事件队列容量，队列满时网络层等待分发器处理，0表示不限制 (默认: 0)
 
         # 重要的回调配置
         on_auth: API Key认证回调函数 (签名为: async def(metadata: Dict[str, Any]) -> bool)
@@ -457,6 +603,13 @@ def create_client_config(url: str, api_key: str, **kwargs) -> ClientConfig:
         ssl_certfile: 客户端证书文件路径 (可选)
         ssl_keyfile: 客户端私钥文件路径 (可选)
         ssl_check_hostname: 是否检查主机名 (默认: True)
+        compression: WebSocket压缩方式，None表示禁用 (默认: "deflate")
+        max_queue: 接收帧缓冲队列长度，None使用websockets默认值 (默认: None)
+        write_limit: 发送缓冲高水位（字节），None使用websockets默认值 (默认: None)
+        binary_frames: 是否使用二进制帧发送JSON (默认: False)
+        wire_format: 线格式，"json"或"msgpack"，后者需安装msgpack (默认: "json")
+        use_worker_thread: 网络驱动器是否运行在独立工作线程中 (默认: True)
+        event_queue_max_size: 事件队列容量，队列满时拒收新消息且不确认，0表示不限制 (默认: 10000)
 
         # 重要的回调配置
         on_message: 消息处理回调函数 (签名为: async def(message: APIMessageBase, metadata: Dict[str, Any]) -> None)
@@ -498,7 +651,7 @@ def create_client_config(url: str, api_key: str, **kwargs) -> ClientConfig:
         )
     """
     # 自动检测SSL
-    if url.startswith("wss://"):
+    if websocket_scheme(url) == "wss":
         kwargs["ssl_enabled"] = True
 
     return ClientConfig(url=url, api_key=api_key, **kwargs)
@@ -536,15 +689,11 @@ def create_ssl_server_config(
             on_auth_extract_user=lambda metadata: metadata["api_key"]
         )
     """
-    kwargs.update(
-        {
-            "host": host,
-            "port": port,
-            "ssl_enabled": True,
-            "ssl_certfile": ssl_certfile,
-            "ssl_keyfile": ssl_keyfile,
-        }
-    )
+    kwargs["host"] = host
+    kwargs["port"] = port
+    kwargs["ssl_enabled"] = True
+    kwargs["ssl_certfile"] = ssl_certfile
+    kwargs["ssl_keyfile"] = ssl_keyfile
     return create_server_config(**kwargs)
 
 
@@ -606,7 +755,8 @@ def create_ssl_client_config(
     if url is None:
         url = f"wss://{host}:{port}{path}"
 
-    kwargs.update({"ssl_enabled": True, "ssl_ca_certs": ssl_ca_certs})
+    kwargs["ssl_enabled"] = True
+    kwargs["ssl_ca_certs"] = ssl_ca_certs
 
     if api_key is not None:
         return create_client_config(url, api_key, **kwargs)
@@ -635,6 +785,19 @@ class ConnectionEntry:
     max_reconnect_attempts: int = 5
     reconnect_delay: float = 2.0
 
+    # WebSocket压缩配置（None表示禁用）
+    compression: Optional[str] = "deflate"
+
+    # 接收帧缓冲队列长度与发送缓冲高水位（字节），None使用websockets默认值
+    max_queue: Optional[int] = None
+    write_limit: Optional[int] = None
+
+    # 使用二进制帧发送JSON
+    binary_frames: bool = False
+
+    # 线格式："json"或"msgpack"
+    wire_format: str = "json"
+
     # 其他配置
     headers: Dict[str, str] = field(default_factory=dict)
 
@@ -649,6 +812,11 @@ class ConnectionEntry:
             "ssl_check_hostname": self.ssl_check_hostname,
             "max_reconnect_attempts": self.max_reconnect_attempts,
             "reconnect_delay": self.reconnect_delay,
+            "compression": self.compression,
+            "max_queue": self.max_queue,
+            "write_limit": self.write_limit,
+            "binary_frames": self.binary_frames,
+            "wire_format": self.wire_format,
             "headers": self.headers,
         }
 
@@ -670,6 +838,12 @@ class MultiClientConfig(ConfigValidator):
     auto_connect_on_start: bool = False
     connect_timeout: float = 10.0
 
+    # 网络驱动器是否运行在独立工作线程中；False时直接运行在调用start()的事件循环中
+    use_worker_thread: bool = True
+
+    # 事件队列容量：大于0时业务层处理跟不上会拒收新到的消息事件（不确认，由服务端缓存重发），0表示不限制
+    event_queue_max_size: int = 10000
+
     # 统计信息配置
     enable_stats: bool = True
     stats_callback: Optional[Callable[[Dict[str, Any]], None]] = None
@@ -680,6 +854,11 @@ class MultiClientConfig(ConfigValidator):
     enable_message_log: bool = True
     custom_logger: Optional[Any] = field(default=None)
 
+    # get_default_message_handler()首次调用后缓存的默认处理器
+    _default_message_handler: Optional[Callable] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     def get_logger(self):
         """获取配置的logger，如果设置了custom_logger则使用它，否则使用默认logger"""
         if self.custom_logger is not None:
@@ -704,15 +883,15 @@ class MultiClientConfig(ConfigValidator):
                 logger.error(f"连接 '{name}' 的API密钥不能为空")
                 return False
             # 验证URL格式
-            if not (conn.url.startswith("ws://") or conn.url.startswith("wss://")):
+            if websocket_scheme(conn.url) is None:
                 logger.error(f"连接 '{name}' 的URL格式错误，必须以ws://或wss://开头")
                 return False
 
         return True
 
-    def get_missing_fields(self) -> Set[str]:
+    def get_missing_fields(self) -> FrozenSet[str]:
         """获取缺失的必填字段"""
-        return set()  # 多连接配置没有全局必填字段
+        return frozenset()  # 多连接配置没有全局必填字段
 
     def register_connection(
         self, name: str, url: str, api_key: str, platform: str = "default", **kwargs
@@ -760,18 +939,21 @@ class MultiClientConfig(ConfigValidator):
         self, message_type: str, handler: Callable[[Dict[str, Any]], None]
     ) -> None:
         """注册自定义消息处理器"""
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
         self.custom_handlers[message_type] = handler
         logger.info(f"注册自定义处理器: {message_type}")
 
     def unregister_custom_handler(self, message_type: str) -> None:
         """注销自定义消息处理器"""
-        if not message_type.startswith("custom_"):
-            message_type = f"custom_{message_type}"
+        message_type = normalize_custom_type(message_type)
         self.custom_handlers.pop(message_type, None)
         logger.info(f"注销自定义处理器: {message_type}")
 
+    @property
+    def handlers_view(self) -> Mapping[str, Callable[[Dict[str, Any]], None]]:
+        """自定义处理器的只读视图，修改请使用register/unregister_custom_handler"""
+        return MappingProxyType(self.custom_handlers)
+
     def ensure_defaults(self) -> None:
         """确保所有必填的回调都有默认值"""
         if self.on_message is None:
@@ -782,15 +964,9 @@ class MultiClientConfig(ConfigValidator):
         self,
     ) -> Callable[[APIMessageBase, Dict[str, Any]], None]:
         """获取默认消息处理器"""
-
-        async def default_message_handler(
-            message: APIMessageBase, metadata: Dict[str, Any]
-        ) -> None:
-            """默认消息处理器：记录消息"""
-            if self.enable_message_log:
-                logger.info(f"收到消息: {message.message_segment.data}")
-
-        return default_message_handler
+        if self._default_message_handler is None:
+            self._default_message_handler = partial(_default_client_message_handler, self)
+        return self._default_message_handler
 
     def register_ssl_connection(
         self,
@@ -802,12 +978,10 @@ class MultiClientConfig(ConfigValidator):
         **kwargs,
     ) -> None:
         """注册SSL连接配置的便捷方法"""
-        if url.startswith("wss://"):
-            ssl_kwargs = {"ssl_enabled": True, "ssl_ca_certs": ssl_ca_certs, **kwargs}
-        else:
-            # 自动转换为wss协议
-            url = url.replace("ws://", "wss://")
-            ssl_kwargs = {"ssl_enabled": True, "ssl_ca_certs": ssl_ca_certs, **kwargs}
+        # 自动转换为wss协议（只替换开头的协议部分）
+        if websocket_scheme(url) == "ws":
+            url = "wss://" + url[5:]
+        ssl_kwargs = {"ssl_enabled": True, "ssl_ca_certs": ssl_ca_certs, **kwargs}
 
         self.register_connection(name, url, api_key, platform, **ssl_kwargs)
         logger.info(f"注册SSL连接配置: {name} -> {url}")
@@ -834,6 +1008,7 @@ def create_multi_client_config(**kwargs) -> MultiClientConfig:
     Args:
         auto_connect_on_start: 启动时是否自动连接所有注册的连接 (默认: False)
         connect_timeout: 连接超时时间 (默认: 10.0)
+        event_queue_max_size: 事件队列容量，队列满时拒收新消息且不确认，0表示不限制 (默认: 10000)
         enable_stats: 是否启用统计信息 (默认: True)
         stats_callback: 统计信息回调函数
         log_level: 日志级别 (默认: "INFO")
@@ -0,0 +1,124 @@
+"""
+广播结果测试
+
+测试场景：
+1. 两个客户端分别从不同平台连接到服务端
+2. 服务端广播到全部连接 / 指定平台 / 不存在的平台
+3. 验证BroadcastResult的成功数与目标总数，以及客户端实际收到的消息
+"""
+
+import asyncio
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from maim_message.client import create_client_config, WebSocketClient
+from maim_message.server import create_server_config, WebSocketServer
+from maim_message.api_message_base import (
+    APIMessageBase,
+    BaseMessageInfo,
+    Seg,
+    MessageDim,
+)
+
+PORT = 18186
+PLATFORMS = ("platform_a", "platform_b")
+
+
+def build_message(text: str) -> APIMessageBase:
+    return APIMessageBase(
+        message_info=BaseMessageInfo(
+            platform="server",
+            message_id=f"broadcast_{int(time.time() * 1000)}",
+            time=time.time(),
+        ),
+        message_segment=Seg(type="text", data=text),
+        message_dim=MessageDim(api_key="server", platform="server"),
+    )
+
+
+async def run_broadcast_result_test() -> bool:
+    print("=" * 70)
+    print("🧪 广播结果测试")
+    print("=" * 70)
+
+    async def auth_handler(metadata):
+        return True
+
+    async def extract_user_handler(metadata):
+        return metadata.get("api_key", "default")
+
+    server = WebSocketServer(
+        create_server_config(
+            host="127.0.0.1",
+            port=PORT,
+            on_auth=auth_handler,
+            on_auth_extract_user=extract_user_handler,
+        )
+    )
+
+    received = {platform: [] for platform in PLATFORMS}
+    clients = []
+    for platform in PLATFORMS:
+
+        async def on_message(message, metadata, platform=platform):
+            received[platform].append(message.message_segment.data)
+
+        clients.append(
+            WebSocketClient(
+                create_client_config(
+                    url=f"ws://127.0.0.1:{PORT}/ws",
+                    api_key=f"user_{platform}",
+                    platform=platform,
+                    on_message=on_message,
+                )
+            )
+        )
+
+    passed = False
+    try:
+        await server.start()
+        for client in clients:
+            await client.start()
+            if not await client.connect():
+                print("❌ 客户端连接失败")
+                return False
+        await asyncio.sleep(0.3)
+
+        result_all = await server.broadcast_message(build_message("全部"))
+        result_a = await server.broadcast_message(
+            build_message("仅A"), platform="platform_a"
+        )
+        result_none = await server.broadcast_message(
+            build_message("无目标"), platform="platform_missing"
+        )
+        await asyncio.sleep(0.5)
+
+        print(f"📤 广播全部: {result_all}")
+        print(f"📤 广播platform_a: {result_a}")
+        print(f"📤 广播不存在的平台: {result_none}")
+        print(f"📥 客户端收到: {received}")
+
+        passed = (
+            tuple(result_all) == (2, 2)
+            and tuple(result_a) == (1, 1)
+            and tuple(result_none) == (0, 0)
+            and received["platform_a"] == ["全部", "仅A"]
+            and received["platform_b"] == ["全部"]
+        )
+    except Exception as e:
+        print(f"\n❌ 测试过程中发生错误: {type(e).__name__}: {e}")
+    finally:
+        for client in clients:
+            await client.stop()
+        await server.stop()
+        print("\n✅ 清理完成")
+
+    print("\n" + ("✅ 测试通过" if passed else "❌ 测试失败"))
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_broadcast_result_test()) else 1)
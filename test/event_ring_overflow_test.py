@@ -0,0 +1,136 @@
+"""
+客户端事件环溢出测试
+
+测试场景：
+1. 有界事件环已满时继续投递消息事件：新到的消息事件被丢弃并计入dropped
+2. 已满时投递连接/断开事件：生命周期事件总是入队，不会被丢弃
+3. 生产者线程通过put_threadsafe投递，消费者get_batch按批取出且保持顺序
+4. 网络驱动器只对已入队的消息发送ACK：被拒收的消息不确认，留给服务端缓存重发
+"""
+
+import asyncio
+import json
+import threading
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from maim_message.client_ws_connection import (
+    ClientNetworkDriver,
+    ConnectionConfig,
+    EventRing,
+    EventType,
+    NetworkEvent,
+)
+
+
+def make_event(event_type: EventType, index: int = 0) -> NetworkEvent:
+    return NetworkEvent(
+        event_type=event_type,
+        connection_uuid="event_ring_test",
+        config=None,
+        payload={"index": index},
+    )
+
+
+async def run_overflow_case() -> bool:
+    print("🧪 事件环已满时的丢弃策略")
+    ring = EventRing(maxsize=3)
+    accepted = [ring.put_nowait(make_event(EventType.CONNECT))]
+    for i in range(5):
+        accepted.append(ring.put_nowait(make_event(EventType.MESSAGE, i)))
+    accepted.append(ring.put_nowait(make_event(EventType.DISCONNECT)))
+
+    batch = await ring.get_batch(10)
+    kinds = [(event.event_type.value, event.payload["index"]) for event in batch]
+    print(f"   取出事件: {kinds}")
+    print(f"   丢弃数: {ring.dropped}")
+    print(f"   入队结果: {accepted}")
+
+    return (
+        ring.dropped == 3
+        and accepted == [True, True, True, False, False, False, True]
+        and kinds == [("connect", 0), ("message", 0), ("message", 1), ("disconnect", 0)]
+    )
+
+
+async def run_threadsafe_case() -> bool:
+    print("🧪 跨线程投递与批量取出")
+    ring = EventRing(maxsize=0)
+    loop = asyncio.get_running_loop()
+    total = 200
+
+    def producer():
+        for i in range(total):
+            ring.put_threadsafe(make_event(EventType.MESSAGE, i), loop)
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+
+    indexes = []
+    batches = 0
+    while len(indexes) < total:
+        batch = await asyncio.wait_for(ring.get_batch(64), timeout=5.0)
+        batches += 1
+        indexes.extend(event.payload["index"] for event in batch)
+    thread.join()
+
+    print(f"   共取出 {len(indexes)} 个事件，分 {batches} 批")
+    return indexes == list(range(total)) and ring.dropped == 0
+
+
+async def run_ack_case() -> bool:
+    print("🧪 被拒收的消息不发送ACK")
+    connection_uuid = "event_ring_ack_test"
+    driver = ClientNetworkDriver(use_worker_thread=False)
+    driver.connections[connection_uuid] = ConnectionConfig(
+        url="ws://127.0.0.1:1/ws",
+        api_key="event_ring_test",
+        platform="test",
+        connection_uuid=connection_uuid,
+    )
+    ring = EventRing(maxsize=2)
+    driver.set_event_queue(ring)
+
+    acked = []
+
+    async def record_ack(uuid_: str, msg_id: str) -> None:
+        acked.append(msg_id)
+
+    driver._send_ack = record_ack
+
+    msg_ids = [f"msg_{i}" for i in range(4)]
+    for msg_id in msg_ids:
+        frame = json.dumps({"ver": 1, "msg_id": msg_id, "type": "custom_test", "payload": {}})
+        await driver._handle_message(connection_uuid, frame.encode("utf-8"))
+
+    queued = [event.payload["msg_id"] for event in await ring.get_batch(10)]
+    print(f"   入队消息: {queued}")
+    print(f"   已ACK消息: {acked}")
+    print(f"   丢弃数: {ring.dropped}")
+
+    return queued == msg_ids[:2] and acked == msg_ids[:2] and ring.dropped == 2
+
+
+async def run_event_ring_test() -> bool:
+    print("=" * 70)
+    print("🧪 客户端事件环测试")
+    print("=" * 70)
+
+    results = {
+        "溢出丢弃策略": await run_overflow_case(),
+        "跨线程批量取出": await run_threadsafe_case(),
+        "拒收消息不ACK": await run_ack_case(),
+    }
+
+    print("\n" + "=" * 70)
+    print("📊 测试结果")
+    print("=" * 70)
+    for name, passed in results.items():
+        print(f"{'✅' if passed else '❌'} {name}")
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_event_ring_test()) else 1)
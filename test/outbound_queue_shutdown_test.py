@@ -0,0 +1,142 @@
+"""
+发送队列关闭测试
+
+测试场景：
+1. 服务端启用每连接发送队列（outbound_queue_size），连接写出被阻塞
+2. 发送方填满队列后继续发送，部分发送方在入队处等待
+3. 服务端断开该连接，验证：
+   - 等待入队的发送方全部返回（不会永久挂起），返回False
+   - 发送协程已取出但未发出的消息、队列中的消息都转入消息缓存，没有丢失
+"""
+
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+from maim_message.client import create_client_config, WebSocketClient
+from maim_message.server import create_server_config, WebSocketServer
+
+PORT = 18183
+QUEUE_SIZE = 2
+TOTAL_MESSAGES = 8
+
+
+class StalledWebSocket:
+    """包装真实连接：写出永远阻塞，模拟对端不读取、发送缓冲区已满"""
+
+    def __init__(self, websocket):
+        self._websocket = websocket
+        self.attempts = 0
+
+    async def send_text(self, data):
+        self.attempts += 1
+        await asyncio.Event().wait()
+
+    async def send_bytes(self, data):
+        self.attempts += 1
+        await asyncio.Event().wait()
+
+    async def close(self, *args, **kwargs):
+        await self._websocket.close(*args, **kwargs)
+
+
+async def run_outbound_queue_shutdown_test() -> bool:
+    print("=" * 70)
+    print("🧪 发送队列关闭测试")
+    print("=" * 70)
+    print(f"📡 服务器: ws://127.0.0.1:{PORT}/ws")
+    print(f"⚙️  outbound_queue_size={QUEUE_SIZE}, 发送消息数={TOTAL_MESSAGES}\n")
+
+    async def auth_handler(metadata):
+        return True
+
+    async def extract_user_handler(metadata):
+        return metadata.get("api_key", "default")
+
+    server = WebSocketServer(
+        create_server_config(
+            host="127.0.0.1",
+            port=PORT,
+            on_auth=auth_handler,
+            on_auth_extract_user=extract_user_handler,
+            outbound_queue_size=QUEUE_SIZE,
+            enable_message_cache=True,
+        )
+    )
+    client = WebSocketClient(
+        create_client_config(
+            url=f"ws://127.0.0.1:{PORT}/ws",
+            api_key="outbound_queue_user",
+            platform="test",
+            auto_reconnect=False,
+        )
+    )
+
+    passed = False
+    try:
+        await server.start()
+        await client.start()
+        if not await client.connect():
+            print("❌ 客户端连接失败")
+            return False
+        await asyncio.sleep(0.5)
+
+        driver = server.network_driver
+        connection_uuid = next(iter(driver.active_connections))
+        stalled = StalledWebSocket(driver.active_connections[connection_uuid])
+        driver.active_connections[connection_uuid] = stalled
+        print(f"✅ 客户端已连接，写出已阻塞: {connection_uuid}")
+
+        # 第1条被发送协程取出并卡在写出，随后QUEUE_SIZE条填满队列，其余在入队处等待
+        msg_ids = [f"outbound_test_{i}" for i in range(TOTAL_MESSAGES)]
+        send_tasks = [
+            asyncio.create_task(
+                driver.send_message(
+                    connection_uuid,
+                    {"msg_id": msg_id, "type": "custom_test", "payload": {"i": i}},
+                )
+            )
+            for i, msg_id in enumerate(msg_ids)
+        ]
+        await asyncio.sleep(0.3)
+        waiting = sum(1 for task in send_tasks if not task.done())
+        print(f"📤 写出尝试 {stalled.attempts} 次，{waiting} 个发送方在入队处等待")
+
+        print("\n🔌 服务端断开连接...")
+        await driver.disconnect_client(connection_uuid, "outbound queue test")
+
+        done, pending = await asyncio.wait(send_tasks, timeout=5.0)
+        results = [task.result() for task in done]
+        for task in pending:
+            task.cancel()
+
+        cached_ids = {
+            cached.message_id
+            for cached in driver.message_cache.get_by_target(connection_uuid)
+        }
+        missing = [msg_id for msg_id in msg_ids if msg_id not in cached_ids]
+
+        print("\n" + "=" * 70)
+        print("📊 测试结果")
+        print("=" * 70)
+        print(f"⏳ 仍挂起的发送方: {len(pending)}")
+        print(f"📤 返回True/False: {results.count(True)}/{results.count(False)}")
+        print(f"💾 已缓存消息: {len(cached_ids)}/{TOTAL_MESSAGES}")
+        print(f"📉 丢失消息: {missing}")
+
+        passed = not pending and waiting > 0 and not missing
+    except Exception as e:
+        print(f"\n❌ 测试过程中发生错误: {type(e).__name__}: {e}")
+    finally:
+        await client.stop()
+        await server.stop()
+        print("\n✅ 清理完成")
+
+    print("\n" + ("✅ 测试通过" if passed else "❌ 测试失败"))
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_outbound_queue_shutdown_test()) else 1)
@@ -0,0 +1,197 @@
+"""
+线格式协商测试
+
+测试场景：
+1. 客户端请求msgpack，服务端确认：双方都按msgpack收发，自定义消息双向可达
+2. 客户端请求msgpack，服务端不支持（不回传x-wire-format）：客户端回退为JSON文本帧
+3. 客户端使用默认JSON：服务端不标记为msgpack连接
+"""
+
+import asyncio
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../src"))
+
+import websockets
+
+from maim_message import json_utils
+from maim_message.client import create_client_config, WebSocketClient
+from maim_message.server import create_server_config, WebSocketServer
+
+PORT = 18184
+LEGACY_PORT = 18185
+
+
+async def auth_handler(metadata):
+    return True
+
+
+async def extract_user_handler(metadata):
+    return metadata.get("api_key", "default")
+
+
+async def wait_for(predicate, timeout: float = 3.0) -> bool:
+    """轮询等待条件成立"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            return False
+        await asyncio.sleep(0.05)
+    return True
+
+
+async def run_negotiation_case(wire_format: str) -> bool:
+    """服务端支持msgpack时按客户端请求协商线格式"""
+    expect_msgpack = wire_format == "msgpack"
+    print("=" * 70)
+    print(f"🧪 服务端协商测试: 客户端wire_format={wire_format}")
+    print("=" * 70)
+
+    server = WebSocketServer(
+        create_server_config(
+            host="127.0.0.1",
+            port=PORT,
+            on_auth=auth_handler,
+            on_auth_extract_user=extract_user_handler,
+        )
+    )
+    client = WebSocketClient(
+        create_client_config(
+            url=f"ws://127.0.0.1:{PORT}/ws",
+            api_key=f"wire_{wire_format}_user",
+            platform="test",
+            wire_format=wire_format,
+        )
+    )
+
+    server_received = []
+    client_received = []
+
+    async def on_server_custom(message, metadata):
+        server_received.append(message["payload"])
+
+    async def on_client_custom(payload):
+        client_received.append(payload)
+
+    server.register_custom_handler("wire_ping", on_server_custom)
+    client.register_custom_handler("wire_pong", on_client_custom)
+
+    passed = False
+    try:
+        await server.start()
+        await client.start()
+        if not await client.connect():
+            print("❌ 客户端连接失败")
+            return False
+
+        await client.send_custom_message("wire_ping", {"n": 1, "text": "你好"})
+        await wait_for(lambda: server_received)
+        await server.send_custom_message(
+            "custom_wire_pong", {"n": 2}, target_user=f"wire_{wire_format}_user"
+        )
+        await wait_for(lambda: client_received)
+
+        server_msgpack = len(server.network_driver.msgpack_connections)
+        client_msgpack = len(client.network_driver.msgpack_connections)
+        print(f"📡 服务端msgpack连接数: {server_msgpack}")
+        print(f"📱 客户端msgpack连接数: {client_msgpack}")
+        print(f"📥 服务端收到: {server_received}")
+        print(f"📥 客户端收到: {client_received}")
+
+        expected = 1 if expect_msgpack else 0
+        passed = (
+            server_msgpack == expected
+            and client_msgpack == expected
+            and server_received == [{"n": 1, "text": "你好"}]
+            and client_received == [{"n": 2}]
+        )
+    except Exception as e:
+        print(f"\n❌ 测试过程中发生错误: {type(e).__name__}: {e}")
+    finally:
+        await client.stop()
+        await server.stop()
+
+    print("✅ 通过\n" if passed else "❌ 失败\n")
+    return passed
+
+
+async def run_fallback_case() -> bool:
+    """不支持线格式协商的旧版服务端：客户端回退为JSON"""
+    print("=" * 70)
+    print("🧪 回退测试: 客户端请求msgpack，旧版服务端不确认")
+    print("=" * 70)
+
+    frames = []
+    requested = []
+
+    async def legacy_handler(websocket):
+        requested.append(websocket.request.headers.get(json_utils.WIRE_FORMAT_HEADER))
+        async for frame in websocket:
+            frames.append(frame)
+
+    legacy_server = await websockets.serve(legacy_handler, "127.0.0.1", LEGACY_PORT)
+    client = WebSocketClient(
+        create_client_config(
+            url=f"ws://127.0.0.1:{LEGACY_PORT}/ws",
+            api_key="wire_fallback_user",
+            platform="test",
+            wire_format="msgpack",
+        )
+    )
+
+    passed = False
+    try:
+        await client.start()
+        if not await client.connect():
+            print("❌ 客户端连接失败")
+            return False
+
+        await client.send_custom_message("wire_ping", {"n": 3})
+        await wait_for(lambda: frames)
+
+        client_msgpack = len(client.network_driver.msgpack_connections)
+        decoded = [json.loads(frame) for frame in frames if isinstance(frame, str)]
+        print(f"📨 客户端请求的线格式: {requested}")
+        print(f"📱 客户端msgpack连接数: {client_msgpack}")
+        print(f"📥 旧版服务端收到帧类型: {[type(frame).__name__ for frame in frames]}")
+
+        passed = (
+            requested == ["msgpack"]
+            and client_msgpack == 0
+            and len(decoded) == len(frames) == 1
+            and decoded[0]["payload"] == {"n": 3}
+        )
+    except Exception as e:
+        print(f"\n❌ 测试过程中发生错误: {type(e).__name__}: {e}")
+    finally:
+        await client.stop()
+        legacy_server.close()
+        await legacy_server.wait_closed()
+
+    print("✅ 通过\n" if passed else "❌ 失败\n")
+    return passed
+
+
+async def run_wire_format_test() -> bool:
+    if not json_utils.HAS_MSGPACK:
+        print("⚠️  未安装msgpack，跳过线格式协商测试")
+        return True
+
+    results = {
+        "msgpack协商": await run_negotiation_case("msgpack"),
+        "JSON默认": await run_negotiation_case("json"),
+        "msgpack回退": await run_fallback_case(),
+    }
+
+    print("=" * 70)
+    print("📊 测试结果")
+    print("=" * 70)
+    for name, passed in results.items():
+        print(f"{'✅' if passed else '❌'} {name}")
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_wire_format_test()) else 1)